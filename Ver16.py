@@ -4,7 +4,9 @@ import os
 import re
 import json
 import argparse, sys
+import logging
 import random # 用於隨機延遲
+import uuid
 from datetime import datetime
 import requests # 用於解析 URL 參數
 from selenium import webdriver
@@ -17,42 +19,36 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException, StaleElementReferenceException
 from typing import Optional, Dict, Any, Tuple, Callable, List
-
-
-
-# --- Helper Functions (可以放在類別外部或內部作為靜態方法) ---
-
-
-def parse_number(text: Optional[str]) -> Optional[float]:
-    """從文本中解析數字，處理 K 和 M"""
-    if not text: 
-        return None
-    clean = re.sub(r'[^0-9Kk\.]', '', text)
-    multiplier = 1
-    if clean[-1].lower() == 'k':
-       multiplier = 1_000
-       clean = clean[:-1]           # 去掉 K
-    try:
-       return float(clean) * multiplier
-    except ValueError:
-       return None
-
-def extract_integer(text: Optional[str]) -> Optional[int]:
-    """從文本中提取第一個整數"""
-    if not text: return None
-    m = re.findall(r'\d+', str(text))
-    return int(m[0]) if m else 0
-
-def extract_year_and_count(text: str) -> Optional[Tuple[str, int]]:
-    """從 'YYYY (Count)' 格式的文本中提取年份和數量"""
-    year_match = re.match(r'^(\d{4})', text)
-    count_match = re.search(r'\((\d+)\)', text)
-    if year_match and count_match:
-        year = year_match.group(1)
-        count = int(count_match.group(1))
-        return year, count
-    # 可以添加其他格式的處理邏輯，例如只有年份或只有數量
-    return None
+from csv_schema import FIELDNAMES, SOCIAL_PLATFORMS
+from run_trace import RunTrace
+from browser_profiles import BROWSER_PROFILES, build_chrome_options
+from session_state import SessionState
+from transfer_stats import collect_transfer, drain_log, enable_performance_log, format_bytes
+from browser_watchdog import MemoryWatchdog
+from sharding import parse_shard, select_shard, shard_tag, sort_rows_by_url_order, url_order, write_redirects
+from preflight import preflight_urls
+from http_engine import HttpEngine, covered_stages
+from scrape_profiler import UrlProfiler
+from scrape_metrics import ScrapeMetrics
+from progress_report import ProgressTracker
+from scrape_logging import ScrapeLogging, creator_context, parse_module_levels
+from field_planner import NOT_COLLECTED, ScrapePlan, plan_for_fields
+from anchor_index import DOCUMENT_TOKEN_JS, MARK_DOCUMENT_JS, AnchorIndex
+from layout_cache import VARIANTS as LAYOUT_VARIANTS, LayoutCache
+from wait_ledger import WaitLedger
+from retry_queue import RetryQueue, SkipList, classify_exception, backoff_delay
+from number_parsing import parse_number, extract_year_and_count, extract_paren_count, strip_paren_count
+
+# 各功能的 logger (見 scrape_logging；可用 --log-module-level chat=DEBUG 個別調整)
+log_driver = logging.getLogger("scraper.driver")
+log_element = logging.getLogger("scraper.element")
+log_static = logging.getLogger("scraper.static")
+log_chat = logging.getLogger("scraper.chat")
+log_tiers = logging.getLogger("scraper.tiers")
+log_posts = logging.getLogger("scraper.posts")
+log_links = logging.getLogger("scraper.links")
+log_about = logging.getLogger("scraper.about")
+log_run = logging.getLogger("scraper.run")
 
 # --- 主爬蟲類別 ---
 
@@ -86,15 +82,13 @@ class PatreonScraperRefactored:
         "like_count_element": (By.XPATH, "//span[@data-tag='like-count']"), # 示例
         "comment_count_element": (By.XPATH, ".//a[@data-tag='comment-post-icon']"), # 示例
 
-        # 社群連結 (在特定區域查找)
-        "social_link_area": (By.XPATH, "//div[@data-testid='creator-profile-social-links'] | //section[contains(@aria-label,'Social')] | //body"), # 示例：找到包含社群連結的父容器
-        "social_link": (By.XPATH, ".//a[@href]"), # 在上述區域內查找 a 標籤
-
         # 載入更多按鈕
         "load_more_button": (By.XPATH, "//button[contains(., '查看更多文章') or contains(., 'See more posts')]"), # 示例
 
         # 年齡驗證按鈕
         "age_verification_button": (By.XPATH, "//button[@data-tag='age-verification-button-yes']"), # 示例
+        # Cookie 同意橫幅 (僅部分地區出現)
+        "consent_accept_button": (By.XPATH, "//button[@id='onetrust-accept-btn-handler' or @data-tag='cookie-consent-accept']"),
 
         # "關於"頁面
         "about_link": (By.XPATH, "//li/a[contains(@href, '/about') and (normalize-space(.)='About' or normalize-space(.)='關於')]"),
@@ -143,131 +137,295 @@ class PatreonScraperRefactored:
     }
 
 
-    def __init__(self, output_dir: str = "output_data", headless: bool = True):
+    def __init__(self, output_dir: str = "output_data", headless: bool = True,
+                 memory_limit_mb: Optional[float] = None, trace: Optional[RunTrace] = None,
+                 browser_profile: str = "standard", browser_options: Optional[Dict[str, Any]] = None,
+                 measure_bytes: bool = False, session_state: Optional[SessionState] = None,
+                 engine: str = "selenium", profiler: Optional[UrlProfiler] = None,
+                 logs: Optional[ScrapeLogging] = None, plan: Optional[ScrapePlan] = None,
+                 layout_cache: Optional[LayoutCache] = None, wait_ledger: Optional[WaitLedger] = None):
         """
         初始化爬蟲。
 
         Args:
             output_dir (str): 儲存輸出 CSV 檔案的目錄。
             headless (bool): 是否以無頭模式運行瀏覽器。
+            memory_limit_mb (float): Chrome 行程樹 RSS 門檻 (MB)，超過時在 URL 之間重啟瀏覽器；None 表示不重啟。
+            trace (RunTrace): 執行紀錄；None 表示只在記憶體中計數。
+            browser_profile (str): Chrome 啟動設定，'standard' 或 'lean' (見 browser_profiles)。
+            browser_options (dict): 傳給 build_chrome_options 的其他設定 (disk_cache_dir、disk_cache_size_mb、user_data_dir)。
+            measure_bytes (bool): 是否以 performance log 量測每位創作者的下載量 (見 transfer_stats)。
+            session_state (SessionState): 年齡驗證 / cookie 同意狀態；有效時預先載入新工作階段並略過彈窗等待。
+            engine (str): 'selenium' 或 'http'；http 先從頁面內嵌 JSON 取得可解析的欄位，其餘再由瀏覽器補齊。
+            profiler (UrlProfiler): 若提供，每個 URL 的 scrape_url 都在 profiler 下執行 (見 scrape_profiler)。
+            logs (ScrapeLogging): 日誌設定；提供時每位創作者的記錄帶上 URL，並對 --debug-url 的創作者開啟 DEBUG。
+            plan (ScrapePlan): 要執行的爬取階段 (見 field_planner)；None 表示收集所有欄位。
+            layout_cache (LayoutCache): 每位創作者上次的方案 / 篩選版型，先試它以省去失敗的探測等待。
+            wait_ledger (WaitLedger): 記錄每次元素等待 (見 wait_ledger)；多個批次共用同一個以得到整次執行的排行。
         """
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.output_path = os.path.join(self.output_dir, f'patreon_data_{timestamp}_refactored.csv')
-        print(f"輸出檔案將儲存至: {self.output_path}")
-
-        print("正在初始化 WebDriver...")
-        chrome_options = Options()
-        user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
-        chrome_options.add_argument(f"user-agent={user_agent}")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.page_load_strategy = 'eager'
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080") 
-        chrome_options.add_argument("--start-maximized") # 嘗試最大化視窗
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        # 設置語言偏好，可能影響頁面文本
-        chrome_options.add_experimental_option('prefs', {'intl.accept_languages': 'en,en_US'})
-        if headless:
-            chrome_options.add_argument("--headless=new") 
-            print("啟用新版無頭模式 (--headless=new) 並固定視窗 1920×1080")
-
+        log_driver.info(f"輸出檔案將儲存至: {self.output_path}")
+
+        self.headless = headless
+        self.browser_profile = browser_profile
+        self.trace = trace or RunTrace()
+        self.watchdog = MemoryWatchdog(memory_limit_mb)
+        self.restart_count = 0
+        self.last_failure: Optional[Tuple[str, str]] = None # scrape_url 失敗時的 (類型, 說明)，見 retry_queue
+        self.session_state = session_state or SessionState()
+        self.consent_preloaded = False # 目前工作階段是否已有年齡驗證 / 同意的 cookies
+        self.chat_tab_href: Optional[str] = None # check_chat_tab_exists 找到的 Chats 頁網址
+        self._anchor_index: Optional[Tuple[str, AnchorIndex]] = None # (文件記號, 連結索引)
+        self.http_engine = HttpEngine() if engine == "http" else None
+        self.profiler = profiler
+        self.logs = logs
+        self.plan = plan or ScrapePlan()
+        self.layout_cache = layout_cache
+        self.wait_ledger = wait_ledger or WaitLedger(self.selector_names())
+        self.current_url = "" # scrape_url 正在處理的創作者 (版型快取的鍵)
+
+        log_driver.debug("正在初始化 WebDriver...")
+        self.chrome_options = build_chrome_options(browser_profile, headless, **(browser_options or {})) # 重啟瀏覽器時沿用同一份設定
+        self.measure_bytes = measure_bytes
+        if measure_bytes:
+            enable_performance_log(self.chrome_options)
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            # 增加預設等待時間
-            self.wait = WebDriverWait(self.driver, 15) # 增加到 15 秒
-            print("WebDriver 初始化成功。")
+            self._start_driver()
+            log_driver.info("WebDriver 初始化成功。")
         except Exception as e:
-            print(f"WebDriver 初始化失敗: {e}")
-            print("請確保 Chrome 瀏覽器已安裝，或網路連線正常以下載 ChromeDriver。")
+            log_driver.error(f"WebDriver 初始化失敗: {e}")
+            log_driver.error("請確保 Chrome 瀏覽器已安裝，或網路連線正常以下載 ChromeDriver。")
             raise # 拋出異常，終止程式
 
+    @classmethod
+    def selector_names(cls) -> Dict[Tuple[str, str], str]:
+        """定位器 -> SELECTORS 中的名稱 (等待記帳報告用)"""
+        return {tuple(locator): name for name, locator in cls.SELECTORS.items()}
+
+    def _start_driver(self) -> None:
+        """以 self.chrome_options 啟動新的 WebDriver，並記錄啟動時間與初始記憶體"""
+        start = time.perf_counter()
+        service = Service(ChromeDriverManager().install())
+        self.driver = webdriver.Chrome(service=service, options=self.chrome_options)
+        # 增加預設等待時間
+        self.wait = WebDriverWait(self.driver, 15) # 增加到 15 秒
+        startup_s = time.perf_counter() - start
+        rss_mb = self.watchdog.sample_mb(self.driver)
+        rss_text = f"{rss_mb:.0f} MB" if rss_mb is not None else "N/A"
+        log_driver.info(f"瀏覽器啟動 (profile={self.browser_profile}): {startup_s:.2f} 秒，初始記憶體 {rss_text}")
+        self.trace.event("driver_start", profile=self.browser_profile, startup_s=round(startup_s, 2),
+                         rss_mb=round(rss_mb, 1) if rss_mb is not None else None)
+
+        self.consent_preloaded = False
+        if self.session_state.is_valid():
+            applied = self.session_state.apply(self.driver)
+            self.consent_preloaded = applied > 0
+            log_driver.info(f"已預先載入年齡驗證 / 同意狀態 ({applied} 個 cookies)。")
+            self.trace.event("consent_preloaded", cookies=applied)
+
+    def restart_driver(self, reason: str = "") -> bool:
+        """
+        重啟瀏覽器工作階段，保留 cookies (年齡驗證、語言等) 與啟動參數。
+
+        Returns:
+            bool: 是否成功重啟。
+        """
+        log_driver.info(f"正在重啟 WebDriver ({reason})...")
+        cookies = []
+        origin = "https://www.patreon.com/"
+        try:
+            cookies = self.driver.get_cookies()
+            current = self.driver.current_url
+            if current.startswith("http"):
+                origin = "/".join(current.split("/")[:3]) + "/"
+        except Exception as e:
+            log_driver.warning(f"  讀取 cookies 失敗，重啟後將沒有舊 cookies: {e}")
+
+        try:
+            self.driver.quit()
+        except Exception as e:
+            log_driver.warning(f"  關閉舊 WebDriver 時出錯: {e}")
+
+        try:
+            self._start_driver()
+        except Exception as e:
+            log_driver.error(f"  重啟 WebDriver 失敗: {e}")
+            self.trace.event("driver_restart_failed", reason=reason, error=str(e))
+            raise
+
+        restored = 0
+        if cookies:
+            try:
+                self.driver.get(origin) # cookies 只能加到目前網域
+                for cookie in cookies:
+                    if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                        cookie.pop("sameSite", None) # 非法值會讓 add_cookie 失敗
+                    try:
+                        self.driver.add_cookie(cookie)
+                        restored += 1
+                    except Exception:
+                        continue
+            except Exception as e:
+                log_driver.warning(f"  還原 cookies 時出錯: {e}")
+
+        self.restart_count += 1
+        log_driver.info(f"WebDriver 已重啟，還原 {restored}/{len(cookies)} 個 cookies。")
+        self.trace.event("driver_restart", reason=reason, restart_count=self.restart_count,
+                         cookies_restored=restored, cookies_total=len(cookies))
+        return True
+
+    def check_memory(self, url: str = "") -> Optional[float]:
+        """
+        在兩個 URL 之間取樣 Chrome 記憶體，超過門檻時重啟瀏覽器。
+
+        Returns:
+            float: 取樣到的 RSS (MB)；無法取樣時為 None。
+        """
+        rss_mb = self.watchdog.sample_mb(self.driver)
+        if rss_mb is None:
+            return None
+        self.trace.event("memory_sample", url=url, rss_mb=round(rss_mb, 1),
+                         limit_mb=self.watchdog.limit_mb, peak_mb=round(self.watchdog.peak_mb, 1))
+        if self.watchdog.over_limit(rss_mb):
+            log_driver.info(f"Chrome 記憶體 {rss_mb:.0f} MB 超過門檻 {self.watchdog.limit_mb:.0f} MB。")
+            self.restart_driver(reason=f"rss {rss_mb:.0f}MB > {self.watchdog.limit_mb:.0f}MB")
+            after = self.watchdog.sample_mb(self.driver)
+            if after is not None:
+                self.trace.event("memory_sample", url="", rss_mb=round(after, 1),
+                                 limit_mb=self.watchdog.limit_mb, after_restart=True)
+        return rss_mb
+
     def _find_element(self, locator: Tuple[str, str], parent=None, timeout=10) -> Optional[webdriver.remote.webelement.WebElement]:
         """輔助函數：安全地查找單個元素，使用指定的超時時間"""
         target = parent or self.driver
         wait = WebDriverWait(target, timeout) if timeout != 15 else self.wait # 允許臨時超時
+        start = time.perf_counter()
+        element = None
         try:
-            return wait.until(EC.presence_of_element_located(locator))
+            element = wait.until(EC.presence_of_element_located(locator))
         except TimeoutException:
-            # print(f"查找元素超時: {locator}") # 減少輸出
-            return None
+            pass # 找不到是常見的預期結果，耗時記入 wait_ledger
         except Exception as e:
-            print(f"查找元素時發生錯誤 {locator}: {e}")
-            return None
+            log_element.warning(f"查找元素時發生錯誤 {locator}: {e}")
+        self.wait_ledger.record(locator, timeout, element is not None, time.perf_counter() - start)
+        return element
 
     def _find_elements(self, locator: Tuple[str, str], parent=None) -> List[webdriver.remote.webelement.WebElement]:
         """輔助函數：安全地查找多個元素"""
         target = parent or self.driver
+        start = time.perf_counter()
+        elements = []
         try:
             # 短暫等待至少一個元素出現
             WebDriverWait(target, 5).until(EC.presence_of_element_located(locator))
-            return target.find_elements(locator[0], locator[1])
+            elements = target.find_elements(locator[0], locator[1])
         except TimeoutException:
-             # print(f"查找元素列表超時或未找到: {locator}")
-            return []
+            pass
         except Exception as e:
-            print(f"查找元素列表時發生錯誤 {locator}: {e}")
-            return []
+            log_element.warning(f"查找元素列表時發生錯誤 {locator}: {e}")
+        self.wait_ledger.record(locator, 5, bool(elements), time.perf_counter() - start, action="find_all")
+        return elements
 
     def _click_element(self, locator: Tuple[str, str], timeout=10) -> bool:
         """輔助函數：安全地滾動到元素並點擊"""
         element = self._find_element(locator, timeout=timeout)
         if not element:
-            print(f"無法找到用於點擊的元素: {locator}")
+            log_element.debug(f"無法找到用於點擊的元素: {locator}")
             return False
         try:
             # 滾動到元素並等待可點擊
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", element)
-            clickable_element = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(locator))
+            start = time.perf_counter()
+            try:
+                clickable_element = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(locator))
+            except TimeoutException:
+                self.wait_ledger.record(locator, timeout, False, time.perf_counter() - start, action="clickable")
+                raise
+            self.wait_ledger.record(locator, timeout, True, time.perf_counter() - start, action="clickable")
             clickable_element.click()
-            print(f"成功點擊元素: {locator}")
+            log_element.debug(f"成功點擊元素: {locator}")
             return True
         except ElementClickInterceptedException:
-            print(f"元素 {locator} 被遮擋，嘗試 JS 點擊...")
+            log_element.debug(f"元素 {locator} 被遮擋，嘗試 JS 點擊...")
             try:
                 self.driver.execute_script("arguments[0].click();", element)
-                print(f"成功使用 JS 點擊元素: {locator}")
+                log_element.debug(f"成功使用 JS 點擊元素: {locator}")
                 return True
             except Exception as js_e:
-                print(f"JS 點擊失敗 {locator}: {js_e}")
+                log_element.warning(f"JS 點擊失敗 {locator}: {js_e}")
                 return False
         except StaleElementReferenceException:
-             print(f"元素 {locator} 已過時，點擊失敗。")
+             log_element.warning(f"元素 {locator} 已過時，點擊失敗。")
              return False
         except TimeoutException:
-            print(f"等待元素 {locator} 可點擊超時。")
+            log_element.debug(f"等待元素 {locator} 可點擊超時。")
             return False
         except Exception as e:
-            print(f"點擊元素 {locator} 時發生未知錯誤: {e}")
+            log_element.warning(f"點擊元素 {locator} 時發生未知錯誤: {e}")
             return False
 
+    def _record_stage(self, stage: str, started: float, url: str = "") -> float:
+        """記錄某個爬取階段的耗時 (寫入執行紀錄，供 metrics / 分析使用)"""
+        seconds = time.perf_counter() - started
+        self.trace.event("stage", url=url, stage=stage, seconds=round(seconds, 3))
+        return seconds
+
+    def _timed(self, stage: str, url: str, func: Callable[[], Any]) -> Any:
+        """執行 func() 並記錄階段耗時"""
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            self._record_stage(stage, started, url)
+
     def handle_age_verification(self) -> bool:
-        """處理年齡確認彈窗"""
-        print("檢查年齡驗證彈窗...")
-        # 使用更短的超時，因為彈窗通常很快出現
-        clicked = self._click_element(self.SELECTORS["age_verification_button"], timeout=3)
+        """
+        處理年齡確認彈窗與 cookie 同意橫幅。
+        已載入保存的確認狀態時只做即時檢查 (不等待)；只有真的出現彈窗才重新點擊並更新狀態。
+        """
+        consent_buttons = self.driver.find_elements(*self.SELECTORS["consent_accept_button"])
+        if consent_buttons:
+            try:
+                consent_buttons[0].click()
+                log_static.info("已接受 cookie 同意橫幅。")
+                self.session_state.capture(self.driver)
+            except Exception as e:
+                log_static.warning(f"點擊 cookie 同意按鈕失敗: {e}")
+
+        if self.consent_preloaded:
+            if not self.driver.find_elements(*self.SELECTORS["age_verification_button"]):
+                log_static.debug("已有年齡驗證狀態，略過彈窗檢查。")
+                return False
+            log_static.debug("已保存的年齡驗證狀態未生效，重新處理彈窗...")
+            self.session_state.invalidate()
+            self.trace.event("consent_state_stale")
+            clicked = self._click_element(self.SELECTORS["age_verification_button"], timeout=1)
+        else:
+            log_static.debug("檢查年齡驗證彈窗...")
+            # 使用更短的超時，因為彈窗通常很快出現
+            clicked = self._click_element(self.SELECTORS["age_verification_button"], timeout=3)
+
         if clicked:
-            print("已處理年齡驗證。")
+            log_static.info("已處理年齡驗證。")
             # 等待彈窗消失或頁面穩定
             try:
                 self.wait.until(EC.invisibility_of_element_located(self.SELECTORS["age_verification_button"]))
             except TimeoutException:
                 time.sleep(1) # 保留短暫 sleep 作為備用
+            saved = self.session_state.capture(self.driver)
+            self.consent_preloaded = saved > 0
+            self.trace.event("consent_captured", cookies=saved)
             return True
         else:
-            print("未找到或無法點擊年齡驗證按鈕。")
+            log_static.debug("未找到或無法點擊年齡驗證按鈕。")
             return False
 
     def get_static_content(self) -> Dict[str, Any]:
         """獲取頁面頂部的靜態信息"""
-        print("正在獲取靜態內容...")
+        log_static.debug("正在獲取靜態內容...")
         static_data = {
             'creator_name': '',
             'patron_count': 0,
@@ -279,7 +437,7 @@ class PatreonScraperRefactored:
         name_element = self._find_element(self.SELECTORS["creator_name"])
         if name_element:
             static_data['creator_name'] = name_element.text.strip()
-            print(f"  找到 Creator Name: {static_data['creator_name']}")
+            log_static.debug(f"  找到 Creator Name: {static_data['creator_name']}")
 
         # 獲取 Patrons 數量
         # Patreon 頁面結構可能將數字和文本分開，需要更複雜的定位
@@ -305,26 +463,26 @@ class PatreonScraperRefactored:
                           break
                 if number_text:
                     static_data['patron_count'] = parse_number(number_text) or 0
-                    print(f"  找到 Patron Count: {static_data['patron_count']} (來自文本: {number_text})")
+                    log_static.debug(f"  找到 Patron Count: {static_data['patron_count']} (來自文本: {number_text})")
                 else:
-                     print(f"  找到 Patron 標籤，但未能提取數字。")
+                     log_static.debug(f"  找到 Patron 標籤，但未能提取數字。")
 
         except Exception as e:
-            print(f"  獲取 Patron Count 時出錯: {e}")
+            log_static.warning(f"  獲取 Patron Count 時出錯: {e}")
             static_data['patron_count'] = 0
 
-        print("  嘗試獲取月收入...")
+        log_static.debug("  嘗試獲取月收入...")
         income_element = self._find_element(self.SELECTORS["monthly_income_element"], timeout=2)
         if income_element:
             income_text = income_element.text.strip()
             income_value = parse_number(income_text)
             if income_value is not None:
                 static_data['income_per_month'] = income_value
-                print(f"  找到 Monthly Income: {static_data['income_per_month']} (來自文本: {income_text})")
+                log_static.debug(f"  找到 Monthly Income: {static_data['income_per_month']} (來自文本: {income_text})")
             else:
-                print(f"  找到月收入元素，但無法從文本 '{income_text}' 解析數字。")
+                log_static.warning(f"  找到月收入元素，但無法從文本 '{income_text}' 解析數字。")
         else:
-            print("  未找到公開的月收入信息。")
+            log_static.debug("  未找到公開的月收入信息。")
 
 
         # 獲取 Posts 數量 (邏輯類似 Patron Count)
@@ -358,133 +516,106 @@ class PatreonScraperRefactored:
                 if number_text:
                      parsed_val = parse_number(number_text)
                      static_data['total_posts'] = int(parsed_val) if parsed_val is not None else 0
-                     print(f"  找到 Total Posts: {static_data['total_posts']} (來自文本: {number_text})")
+                     log_static.debug(f"  找到 Total Posts: {static_data['total_posts']} (來自文本: {number_text})")
                 else:
-                     print(f"  找到 Post 標籤，但未能提取數字。")
+                     log_static.debug(f"  找到 Post 標籤，但未能提取數字。")
             else:
-                print(f"  未找到 Total Posts 元素。")
+                log_static.debug(f"  未找到 Total Posts 元素。")
         except Exception as e:
-            print(f"  獲取 Total Posts 時出錯: {e}")
+            log_static.warning(f"  獲取 Total Posts 時出錯: {e}")
 
-        print(f"靜態內容獲取完畢: {static_data}")
+        log_static.info(f"靜態內容獲取完畢: {static_data}")
         return static_data
 
 
     def check_chat_tab_exists(self) -> bool:
         """
-        檢查頁面上是否存在 'Chats' 導航連結/標籤頁。
+        檢查頁面上是否存在 'Chats' 導航連結/標籤頁，並記住其網址 (self.chat_tab_href)
+        供 get_chat_room_details 直接導航。
 
         Returns:
             bool: 如果找到 'Chats' 連結則返回 True，否則返回 False。
         """
-        print("檢查是否存在 'Chats' 導航連結...")
+        log_chat.debug("檢查是否存在 'Chats' 導航連結...")
         chat_link_selector = self.SELECTORS["chat_nav_link"]
 
         # 使用短超時快速檢查元素是否存在，不需要等待它可點擊
         chat_link = self._find_element(chat_link_selector, timeout=3) # 用 3 秒超時
 
         if chat_link:
-            print("  找到 'Chats' 導航連結。")
+            try:
+                self.chat_tab_href = chat_link.get_attribute('href')
+            except StaleElementReferenceException:
+                self.chat_tab_href = None
+            log_chat.debug(f"  找到 'Chats' 導航連結: {self.chat_tab_href}")
             return True
         else:
-            print("  未找到 'Chats' 導航連結。")
+            self.chat_tab_href = None
+            log_chat.debug("  未找到 'Chats' 導航連結。")
             return False
-        
-    def get_chat_room_details(self) -> Dict[str, int]:
+
+    # 一次 script 呼叫統計所有聊天室；列表尚未出現時返回 null (讓 WebDriverWait 繼續輪詢)
+    _CHAT_CENSUS_JS = """
+        const itemXpath = arguments[0], lockXpath = arguments[1];
+        const items = document.evaluate(itemXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        if (items.snapshotLength === 0) return null;
+        let paid = 0;
+        for (let i = 0; i < items.snapshotLength; i++) {
+            if (document.evaluate(lockXpath, items.snapshotItem(i), null, XPathResult.BOOLEAN_TYPE, null).booleanValue) paid++;
+        }
+        return {free: items.snapshotLength - paid, paid: paid};
+    """
+
+    def get_chat_room_details(self, has_chat_tab: Optional[bool] = None) -> Dict[str, int]:
         """
-        點擊 'Chats' 標籤頁 (如果存在)，查找所有聊天室項目，
-        並統計免費和付費（鎖定）聊天室的數量。
+        直接開啟 Chats 頁面，以單次 script 呼叫統計免費和付費（鎖定）聊天室的數量。
+
+        Args:
+            has_chat_tab: check_chat_tab_exists 的結果；None 表示在此檢查。False 時立即返回 0。
 
         Returns:
             Dict[str, int]: 包含 'free_chat_count' 和 'paid_chat_count' 的字典。
         """
-        print("嘗試獲取聊天室詳細信息 (免費/付費數量)...")
-        free_chat_count = 0
-        paid_chat_count = 0
+        log_chat.debug("嘗試獲取聊天室詳細信息 (免費/付費數量)...")
         default_return = {'free_chat_count': 0, 'paid_chat_count': 0}
 
-        chat_nav_selector = self.SELECTORS["chat_nav_link"]
-        chat_item_selector = self.SELECTORS["chat_list_item"]
-        lock_icon_selector = self.SELECTORS["chat_lock_icon"]
-
-        # --- 步驟 1: 檢查並點擊 'Chats' 導航連結 ---
-        chat_link = self._find_element(chat_nav_selector, timeout=3)
-        if not chat_link:
-            print("  未找到 'Chats' 導航連結，無法獲取聊天室詳情。")
+        if has_chat_tab is None:
+            has_chat_tab = self.check_chat_tab_exists()
+        if not has_chat_tab:
+            log_chat.debug("  沒有 'Chats' 標籤頁，略過聊天室統計。")
             return default_return
 
-        print("  找到 'Chats' 連結，嘗試點擊...")
-        if not self._click_element(chat_nav_selector, timeout=5):
-            print("  點擊 'Chats' 導航連結失敗。")
+        # --- 步驟 1: 直接導航到 Chats 頁面 (沒有網址時退回點擊連結) ---
+        if self.chat_tab_href:
+            self.driver.get(self.chat_tab_href)
+        elif not self._click_element(self.SELECTORS["chat_nav_link"], timeout=5):
+            log_chat.warning("  點擊 'Chats' 導航連結失敗。")
             return default_return
-        print("  成功點擊 'Chats' 連結。")
 
-        # --- 步驟 2: 等待聊天室列表項加載 ---
-        print(f"  等待聊天室列表項加載 (使用選擇器: {chat_item_selector})...")
+        # --- 步驟 2: 等待列表出現並一次統計 ---
+        item_xpath = self.SELECTORS["chat_list_item"][1]
+        lock_xpath = self.SELECTORS["chat_lock_icon"][1]
         try:
-            # 等待至少一個聊天室項目出現 (增加等待時間)
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located(chat_item_selector)
+            counts = WebDriverWait(self.driver, 15).until(
+                lambda d: d.execute_script(self._CHAT_CENSUS_JS, item_xpath, lock_xpath)
             )
-            print("  聊天室列表項已初步加載。")
-            # 可以選擇再短暫 sleep 一下確保渲染完成，但最好避免
-            # time.sleep(1)
         except TimeoutException:
-            print("  等待聊天室列表項加載超時，可能沒有聊天室或加載失敗。")
-            # **重要**: 點擊 Chats 後可能需要導航回主頁面，否則後續爬蟲會出錯
-            # self.driver.back() # 考慮是否需要返回
+            log_chat.debug("  等待聊天室列表項加載超時，可能沒有聊天室或加載失敗。")
             return default_return
-
-        # --- 步驟 3: 查找所有聊天室項目並遍歷 ---
-        chat_items = self._find_elements(chat_item_selector)
-        print(f"  找到 {len(chat_items)} 個聊天室列表項。")
-
-        if not chat_items:
-            # self.driver.back() # 同上，考慮返回
+        except Exception as e:
+            log_chat.warning(f"  統計聊天室時發生錯誤: {e}")
             return default_return
 
-        for i, item in enumerate(chat_items):
-            is_locked = False
-            print(f"    處理第 {i+1} 個聊天室...")
-            try:
-                # 檢查內部是否有鎖定圖示
-                lock_icon = self._find_element(lock_icon_selector, parent=item, timeout=0.1) # 快速檢查
-                if lock_icon:
-                    is_locked = True
-                    print("      檢測到鎖定圖示 (付費/鎖定)。")
-                # else:
-                #     print("      未檢測到鎖定圖示 (免費)。")
-
-                # 累加計數器
-                if is_locked:
-                    paid_chat_count += 1
-                else:
-                    free_chat_count += 1
-
-            except StaleElementReferenceException:
-                 print(f"    處理第 {i+1} 個聊天室時元素過時，跳過。")
-                 continue
-            except Exception as e:
-                 print(f"    處理第 {i+1} 個聊天室時發生錯誤: {e}")
-                 continue
-
-        print(f"  聊天室統計完成: 免費={free_chat_count}, 付費={paid_chat_count}")
-
-        # **重要**: 點擊 Chats 標籤後，頁面 URL 或狀態可能已改變。
-        # 如果後續的 self.get_social_values() 等操作需要在原始頁面（例如 Posts 頁）進行，
-        # 你可能需要 在這裡添加程式碼導航回去，例如：
-        # print("  嘗試導航回主頁面...")
-        # self.driver.back()
-        # time.sleep(1) # 等待返回生效
-
+        free_chat_count, paid_chat_count = int(counts['free']), int(counts['paid'])
+        log_chat.info(f"  聊天室統計完成: 免費={free_chat_count}, 付費={paid_chat_count}")
         return {'free_chat_count': free_chat_count, 'paid_chat_count': paid_chat_count}
-    
+
     def _scrape_tier_cards_from_current_view(self) -> List[Dict[str, Any]]:
         """
         [內部輔助方法] 從當前可見的視圖中爬取會員方案卡片。
         處理輪播邏輯，並解析所有可見的卡片。
         """
-        print("  (輔助方法) 正在從當前視圖爬取會員方案...")
+        log_tiers.debug("  (輔助方法) 正在從當前視圖爬取會員方案...")
         discovered_tiers_data = {}  # 字典: {card_id: tier_info_dict}
 
         # --- 獲取選擇器 ---
@@ -495,13 +626,13 @@ class PatreonScraperRefactored:
 
         # 等待至少一張卡片出現，確認方案區塊已加載
         if not self._find_element(card_selector, timeout=10):
-            print("    在當前視圖中未找到任何會員方案卡片，提前返回。")
+            log_tiers.debug("    在當前視圖中未找到任何會員方案卡片，提前返回。")
             return []
 
         # --- 處理輪播 ---
         right_button_exists = self._find_element(carousel_right_selector, timeout=2)
         if right_button_exists:
-            print("    檢測到會員方案輪播。")
+            log_tiers.debug("    檢測到會員方案輪播。")
             max_clicks = 15
             click_count_left, click_count_right = 0, 0
 
@@ -513,7 +644,7 @@ class PatreonScraperRefactored:
                     time.sleep(0.6)
                 else:
                     break
-            print("    應已到達最左端。")
+            log_tiers.debug("    應已到達最左端。")
 
             # --- 初始掃描 ---
             initial_cards = self._find_elements(card_selector)
@@ -539,7 +670,7 @@ class PatreonScraperRefactored:
                     break
         else:
             # --- 處理沒有輪播的情況 ---
-            print("    未檢測到會員方案輪播按鈕。直接查找所有卡片...")
+            log_tiers.debug("    未檢測到會員方案輪播按鈕。直接查找所有卡片...")
             all_cards = self._find_elements(card_selector)
             for card_element in all_cards:
                 parsed_info = self._parse_tier_card(card_element)
@@ -557,78 +688,103 @@ class PatreonScraperRefactored:
         1. (優先) 點擊 "Become a member" 按鈕跳轉到新頁面。
         2. 點擊 "See membership options" 按鈕彈出對話框。
         3. 方案直接顯示在主頁上 (舊版結構)。
+        有版型快取時先試這位創作者上次的版型，失敗才依上述順序探測其他版型。
         """
-        print("正在檢查獲取會員方案 (Tiers) 的方法...")
-        original_url = self.driver.current_url
+        log_tiers.debug("正在檢查獲取會員方案 (Tiers) 的方法...")
+        strategies = {
+            "page": self._tiers_via_member_page,
+            "dialog": self._tiers_via_dialog,
+            "inline": self._tiers_inline,
+        }
+        for variant in self._layout_order("tiers"):
+            tiers_data = strategies[variant]()
+            if tiers_data is not None:
+                self._record_layout("tiers", variant)
+                log_tiers.info(f"會員方案資訊提取完成 ({variant})，共 {len(tiers_data)} 個方案。")
+                return tiers_data
+        log_tiers.info("會員方案資訊提取完成，未找到任何方案。")
+        return []
+
+    def _layout_order(self, probe: str) -> List[str]:
+        """版型探測順序 (見 layout_cache)"""
+        if self.layout_cache is None:
+            return list(LAYOUT_VARIANTS[probe])
+        return self.layout_cache.order(self.current_url, probe)
+
+    def _record_layout(self, probe: str, variant: str) -> None:
+        if self.layout_cache is not None:
+            self.layout_cache.record(self.current_url, probe, variant)
+
+    def _tiers_via_member_page(self) -> Optional[List[Dict[str, Any]]]:
+        """點擊 "Become a member" 按鈕到新頁面爬取方案；沒有按鈕時返回 None"""
         tiers_data = []
-
-        # 策略 1: (新優先級) 查找 "Become a member" 按鈕 (新頁面模式)
         become_member_button = self._find_element(self.SELECTORS["become_member_button"], timeout=3)
-        if become_member_button:
-            print("  找到 'Become a member' / '成為會員' 按鈕，將導航至新頁面...")
-            if self._click_element(self.SELECTORS["become_member_button"], timeout=5):
-                try:
-                    # 等待頁面跳轉並出現卡片
-                    WebDriverWait(self.driver, 15).until(
-                        EC.presence_of_element_located(self.SELECTORS["tier_card"])
-                    )
-                    print("  已進入方案頁面，開始爬取...")
-                    tiers_data = self._scrape_tier_cards_from_current_view()
-                    
-                    # 爬取完畢，返回上一頁
-                    print("  方案爬取完畢，正在導航回原始頁面...")
-                    self.driver.back()
-                    # 等待原始頁面的關鍵元素重新加載
-                    WebDriverWait(self.driver, 15).until(
-                        EC.presence_of_element_located(self.SELECTORS["creator_name"])
-                    )
-                    print("  已成功返回原始頁面。")
+        if not become_member_button:
+            return None
+        log_tiers.debug("  找到 'Become a member' / '成為會員' 按鈕，將導航至新頁面...")
+        if self._click_element(self.SELECTORS["become_member_button"], timeout=5):
+            try:
+                # 等待頁面跳轉並出現卡片
+                WebDriverWait(self.driver, 15).until(
+                    EC.presence_of_element_located(self.SELECTORS["tier_card"])
+                )
+                log_tiers.debug("  已進入方案頁面，開始爬取...")
+                tiers_data = self._scrape_tier_cards_from_current_view()
+
+                # 爬取完畢，返回上一頁
+                log_tiers.debug("  方案爬取完畢，正在導航回原始頁面...")
+                self.driver.back()
+                self._anchor_index = None # 返回的頁面可能來自 back-forward cache (記號仍在)，但內容已不同
+                # 等待原始頁面的關鍵元素重新加載
+                WebDriverWait(self.driver, 15).until(
+                    EC.presence_of_element_located(self.SELECTORS["creator_name"])
+                )
+                log_tiers.debug("  已成功返回原始頁面。")
 
-                except TimeoutException:
-                    print("  等待方案頁面加載或返回原始頁面時超時。")
-                except Exception as e:
-                    print(f"  處理新頁面方案時發生錯誤: {e}")
-            
-            print(f"會員方案資訊提取完成 (新頁面模式)，共 {len(tiers_data)} 個方案。")
-            return tiers_data
+            except TimeoutException:
+                log_tiers.warning("  等待方案頁面加載或返回原始頁面時超時。")
+            except Exception as e:
+                log_tiers.warning(f"  處理新頁面方案時發生錯誤: {e}")
+        return tiers_data
 
-        # 策略 2: 查找 "See membership options" 按鈕 (彈窗模式)
+    def _tiers_via_dialog(self) -> Optional[List[Dict[str, Any]]]:
+        """點擊 "See membership options" 按鈕在彈窗中爬取方案；沒有按鈕時返回 None"""
+        tiers_data = []
         see_options_button = self._find_element(self.SELECTORS["see_membership_button"], timeout=3)
-        if see_options_button:
-            print("  找到 'See membership options' 按鈕，將點擊進入彈窗...")
-            if self._click_element(self.SELECTORS["see_membership_button"], timeout=5):
-                try:
-                    # 等待彈窗容器出現
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located(self.SELECTORS["membership_dialog_container"])
+        if not see_options_button:
+            return None
+        log_tiers.debug("  找到 'See membership options' 按鈕，將點擊進入彈窗...")
+        if self._click_element(self.SELECTORS["see_membership_button"], timeout=5):
+            try:
+                # 等待彈窗容器出現
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located(self.SELECTORS["membership_dialog_container"])
+                )
+                log_tiers.debug("  彈窗已打開，開始爬取方案...")
+                tiers_data = self._scrape_tier_cards_from_current_view()
+
+                # 爬取完畢，關閉彈窗
+                log_tiers.debug("  方案爬取完畢，正在關閉彈窗...")
+                if self._click_element(self.SELECTORS["membership_dialog_close_button"], timeout=5):
+                     WebDriverWait(self.driver, 10).until(
+                        EC.invisibility_of_element_located(self.SELECTORS["membership_dialog_container"])
                     )
-                    print("  彈窗已打開，開始爬取方案...")
-                    tiers_data = self._scrape_tier_cards_from_current_view()
-                    
-                    # 爬取完畢，關閉彈窗
-                    print("  方案爬取完畢，正在關閉彈窗...")
-                    if self._click_element(self.SELECTORS["membership_dialog_close_button"], timeout=5):
-                         WebDriverWait(self.driver, 10).until(
-                            EC.invisibility_of_element_located(self.SELECTORS["membership_dialog_container"])
-                        )
-                         print("  彈窗已成功關閉。")
-                    else:
-                        print("  警告：關閉彈窗按鈕點擊失敗，嘗試按 ESC 鍵。")
-                        webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
-
-                except TimeoutException:
-                    print("  等待或關閉會員方案彈窗時超時。")
-                except Exception as e:
-                    print(f"  處理彈窗方案時發生錯誤: {e}")
-            
-            print(f"會員方案資訊提取完成 (彈窗模式)，共 {len(tiers_data)} 個方案。")
-            return tiers_data
+                     log_tiers.debug("  彈窗已成功關閉。")
+                else:
+                    log_tiers.warning("  警告：關閉彈窗按鈕點擊失敗，嘗試按 ESC 鍵。")
+                    webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
 
-        # 策略 3: 在當前頁面直接爬取 (舊版結構)
-        print("  未找到新版方案按鈕，嘗試直接在當前頁面爬取 (舊版結構)...")
-        tiers_data = self._scrape_tier_cards_from_current_view()
-        print(f"會員方案資訊提取完成 (舊版結構)，共 {len(tiers_data)} 個方案。")
+            except TimeoutException:
+                log_tiers.warning("  等待或關閉會員方案彈窗時超時。")
+            except Exception as e:
+                log_tiers.warning(f"  處理彈窗方案時發生錯誤: {e}")
         return tiers_data
+
+    def _tiers_inline(self) -> Optional[List[Dict[str, Any]]]:
+        """在當前頁面直接爬取 (舊版結構)；沒有卡片時返回 None"""
+        log_tiers.debug("  嘗試直接在當前頁面爬取方案 (舊版結構)...")
+        return self._scrape_tier_cards_from_current_view() or None
+
     # --- 解析懸浮篩選視窗的輔助函數 ---
 
     def _parse_filter_dialog(self, dialog_element: webdriver.remote.webelement.WebElement) -> Dict[str, Any]:
@@ -636,7 +792,7 @@ class PatreonScraperRefactored:
         從打開的懸浮篩選視窗元素中解析 Post type 和 Date published 數據。
         [已更新邏輯]
         """
-        print("正在解析懸浮篩選視窗內的數據 (使用新的錨點定位邏輯)...")
+        log_posts.debug("正在解析懸浮篩選視窗內的數據 (使用新的錨點定位邏輯)...")
         filter_data = {
             'post_type_dict': {},
             'post_year_dict': {},
@@ -644,7 +800,7 @@ class PatreonScraperRefactored:
 
         try:
             # --- 解析 Post type (使用更新後的、更穩定的方法) ---
-            print("  解析 Post type...")
+            log_posts.debug("  解析 Post type...")
             # 步驟 1: 先找到 'Post type' 這個 H3 標題，將它作為一個絕對穩定的「錨點」
             post_type_title_element = self._find_element(
                 (By.XPATH, ".//h3[contains(text(), 'Post type')]"),
@@ -652,7 +808,7 @@ class PatreonScraperRefactored:
             )
 
             if post_type_title_element:
-                print("    成功定位到 'Post type' 標題錨點。")
+                log_posts.debug("    成功定位到 'Post type' 標題錨點。")
                 # 步驟 2: 從這個錨點出發，去尋找包含按鈕的容器。
                 # 這個 XPath 的意思是：
                 #   ../                  -> 從 H3 元素往上走一層，到達它的父層 div
@@ -664,30 +820,30 @@ class PatreonScraperRefactored:
                 )
 
                 if type_buttons_container:
-                    print("    成功從標題錨點找到按鈕容器。")
+                    log_posts.debug("    成功從標題錨點找到按鈕容器。")
                     type_buttons = self._find_elements((By.TAG_NAME, "button"), parent=type_buttons_container)
-                    print(f"    找到 {len(type_buttons)} 個 Post type 按鈕。")
+                    log_posts.debug(f"    找到 {len(type_buttons)} 個 Post type 按鈕。")
                     for button in type_buttons:
                         parsed_data = self._parse_type_item(button)
                         if parsed_data:
                             key, value = parsed_data
                             filter_data['post_type_dict'][key] = value
                 else:
-                    print("    警告：從 'Post type' 標題未能找到其同級的按鈕容器。")
+                    log_posts.warning("    警告：從 'Post type' 標題未能找到其同級的按鈕容器。")
             else:
-                print("  未找到 'Post type' 區塊標題。")
+                log_posts.debug("  未找到 'Post type' 區塊標題。")
 
 
             # --- 解析 Date published (Years) ---
             # (這部分的邏輯可以維持原樣，但為了統一，也可以採用類似的錨點定位法)
-            print("  解析 Date published (Years)...")
+            log_posts.debug("  解析 Date published (Years)...")
             years_section = self._find_element(
                 (By.XPATH, ".//h3[contains(text(), 'Date published')]/ancestor::div[contains(@class, 'sc-855f240a-1')]"),
                 parent=dialog_element, timeout=2
             )
             if years_section:
                 year_radios = self._find_elements((By.XPATH, ".//div[@role='radio']"), parent=years_section)
-                print(f"    找到 {len(year_radios)} 個 Year 選項。")
+                log_posts.debug(f"    找到 {len(year_radios)} 個 Year 選項。")
                 for radio in year_radios:
                     try:
                         p_element = self._find_element((By.TAG_NAME, "p"), parent=radio, timeout=0.1)
@@ -699,21 +855,21 @@ class PatreonScraperRefactored:
                                     year, count = parsed_year_data
                                     filter_data['post_year_dict'][year] = count
                                 else:
-                                    print(f"      Year 選項 '{text}' (無法按 YYYY (Count) 格式解析，已忽略)")
+                                    log_posts.debug(f"      Year 選項 '{text}' (無法按 YYYY (Count) 格式解析，已忽略)")
 
                     except StaleElementReferenceException:
-                        print("      解析 Year 選項時元素過時，跳過。")
+                        log_posts.warning("      解析 Year 選項時元素過時，跳過。")
                         continue
                     except Exception as e:
-                        print(f"      解析 Year 選項時出錯: {e}")
+                        log_posts.warning(f"      解析 Year 選項時出錯: {e}")
             else:
-                print("  未找到 Date published 區塊。")
+                log_posts.debug("  未找到 Date published 區塊。")
 
 
         except Exception as e:
-            print(f"解析懸浮篩選視窗時發生錯誤: {e}")
+            log_posts.warning(f"解析懸浮篩選視窗時發生錯誤: {e}")
 
-        print("懸浮篩選視窗數據解析完成。")
+        log_posts.info("懸浮篩選視窗數據解析完成。")
         return filter_data
 
 # 在 PatreonScraperRefactored 類別中修改
@@ -732,7 +888,7 @@ class PatreonScraperRefactored:
                     if card_id: break
                 except StaleElementReferenceException: time.sleep(0.3)
             if not card_id:
-                print("    警告：卡片元素沒有 ID 或多次嘗試後仍 Stale，無法處理。")
+                log_tiers.warning("    警告：卡片元素沒有 ID 或多次嘗試後仍 Stale，無法處理。")
                 return None
 
             tier_info = {'name': '', 'price': 0.0, 'description_word_count': 0, 'tier_id': card_id}
@@ -755,49 +911,49 @@ class PatreonScraperRefactored:
                                 content = element.get_attribute('innerText')
                                 return content.strip() if content is not None else ""
                     except StaleElementReferenceException:
-                        if attempt == max_retries - 1: print(f"      查找元素時 Stale (ID: {card_id}, 多次重試失敗)")
+                        if attempt == max_retries - 1: log_tiers.warning(f"      查找元素時 Stale (ID: {card_id}, 多次重試失敗)")
                         else: time.sleep(retry_delay)
                     except TimeoutException:
-                        print(f"      查找元素時 Timeout (ID: {card_id}, attempt {attempt+1})")
+                        log_tiers.warning(f"      查找元素時 Timeout (ID: {card_id}, attempt {attempt+1})")
                         break # 超時通常不需重試相同元素
                     except Exception as e_find:
-                         print(f"      查找或獲取文本時未知錯誤 (ID: {card_id}): {e_find}")
+                         log_tiers.warning(f"      查找或獲取文本時未知錯誤 (ID: {card_id}): {e_find}")
                          break # 其他錯誤也退出重試
                 return "" # 如果所有嘗試都失敗，返回空字符串
 
             # 提取名稱
             name_text = get_element_text_content(self.SELECTORS["tier_name"], card_element)
             tier_info['name'] = name_text
-            print(f"    DEBUG: 原始名稱文本 (ID: {card_id}): '{name_text}'") # 增加名稱的 DEBUG
+            log_tiers.debug(f"    DEBUG: 原始名稱文本 (ID: {card_id}): '{name_text}'") # 增加名稱的 DEBUG
 
             # 提取價格
             price_text_raw = get_element_text_content(self.SELECTORS["tier_price"], card_element)
-            print(f"    DEBUG: 原始價格文本 (ID: {card_id}): '{price_text_raw}'")
+            log_tiers.debug(f"    DEBUG: 原始價格文本 (ID: {card_id}): '{price_text_raw}'")
             if price_text_raw: # 確保文本不是空的再解析
                 price_value = parse_number(price_text_raw)
                 tier_info['price'] = price_value if price_value is not None else 0.0
 
             # 提取描述區域
             desc_text_raw = get_element_text_content(self.SELECTORS["tier_description_area"], card_element)
-            print(f"    DEBUG: 原始描述文本 (ID: {card_id}): '{desc_text_raw[:100]}...'") # 打印前100個字符
+            log_tiers.debug(f"    DEBUG: 原始描述文本 (ID: {card_id}): '{desc_text_raw[:100]}...'") # 打印前100個字符
             if desc_text_raw:
                 words = desc_text_raw.strip().split()
                 tier_info['description_word_count'] = len(words)
             # --- 修改點結束 ---
 
             if tier_info['name'] or tier_info['price'] > 0:
-                 print(f"    成功解析/記錄卡片 ID {card_id}: Name='{tier_info['name']}', Price={tier_info['price']}, DescWords={tier_info['description_word_count']}")
+                 log_tiers.debug(f"    成功解析/記錄卡片 ID {card_id}: Name='{tier_info['name']}', Price={tier_info['price']}, DescWords={tier_info['description_word_count']}")
                  return tier_info
             else:
-                 print(f"    卡片 ID {card_id} 解析完成，但未提取到有效 Name 或 Price。")
+                 log_tiers.debug(f"    卡片 ID {card_id} 解析完成，但未提取到有效 Name 或 Price。")
                  return tier_info # 仍然返回，標記已處理
 
         # (外層的 Stale 和 Exception 捕獲不變)
         except StaleElementReferenceException:
-            print(f"  解析卡片 (ID: {card_id or '未知'}) 時卡片元素本身 Stale。")
+            log_tiers.warning(f"  解析卡片 (ID: {card_id or '未知'}) 時卡片元素本身 Stale。")
             return None
         except Exception as e:
-            print(f"  解析卡片 (ID: {card_id or '未知'}) 時發生未知錯誤: {e}")
+            log_tiers.warning(f"  解析卡片 (ID: {card_id or '未知'}) 時發生未知錯誤: {e}")
             return None
 
 
@@ -823,26 +979,25 @@ class PatreonScraperRefactored:
             text = p_element.text.strip()
 
             # 解析數量
-            count_match = re.search(r'\((\d+)\)', text)
-            count = int(count_match.group(1)) if count_match else 0
+            count = extract_paren_count(text) or 0
 
             # 解析 Tier 名稱 (移除括號和數字)
-            tier_name = re.sub(r'\s*\(\d+\)\s*$', '', text).strip().lower().replace(" ", "_")
+            tier_name = strip_paren_count(text).lower().replace(" ", "_")
             if not tier_name: # 如果名稱為空，嘗試從 URL 或設為 unknown
                 # (保留之前的 URL 解析邏輯作為備用，但通常文本解析足夠)
                 tier_name = "unknown_tier"
 
-            print(f"  解析到 Tier 項目: {tier_name} = {count} (來自文本: '{text}')")
+            log_posts.debug(f"  解析到 Tier 項目: {tier_name} = {count} (來自文本: '{text}')")
             return tier_name, count
 
         except NoSuchElementException:
-            print(f"  在 Tier 項目 <a> 內未找到預期的 <p> 標籤。")
+            log_posts.debug(f"  在 Tier 項目 <a> 內未找到預期的 <p> 標籤。")
             return None
         except StaleElementReferenceException:
-            print("  解析 Tier 項目時元素過時。")
+            log_posts.warning("  解析 Tier 項目時元素過時。")
             return None
         except Exception as e:
-            print(f"  解析 Tier 項目時發生未知錯誤: {e}")
+            log_posts.warning(f"  解析 Tier 項目時發生未知錯誤: {e}")
             return None
 
     def _parse_type_item(self, item_element: webdriver.remote.webelement.WebElement) -> Optional[Tuple[str, int]]:
@@ -869,9 +1024,9 @@ class PatreonScraperRefactored:
                 }
                 # 如果找不到映射，則歸類為 other_posts
                 type_name = tag_to_type.get(data_tag, f"other_posts_{data_tag}") # fallback 包含 data_tag 幫助識別
-                print(f"  從 data-tag '{data_tag}' 解析到類型: {type_name}")
+                log_posts.debug(f"  從 data-tag '{data_tag}' 解析到類型: {type_name}")
             except NoSuchElementException:
-                print(f"  按鈕內未找到帶 data-tag 的 SVG，無法確定類型。")
+                log_posts.warning(f"  按鈕內未找到帶 data-tag 的 SVG，無法確定類型。")
                 type_name = "unknown_type_no_svg" # 標記為未知類型
 
 
@@ -884,43 +1039,43 @@ class PatreonScraperRefactored:
                 text_div = item_element.find_element(By.XPATH, ".//span[svg[@data-tag]]/following-sibling::div")
                 text = text_div.text.strip()
                 # 解析數量
-                count_match = re.search(r'\((\d+)\)', text) # 從文本中找 (數字)
-                if count_match:
-                    count = int(count_match.group(1))
-                    print(f"  從文本 '{text}' 中提取到數量: {count}")
+                paren_count = extract_paren_count(text) # 從文本中找 (數字)
+                if paren_count is not None:
+                    count = paren_count
+                    log_posts.debug(f"  從文本 '{text}' 中提取到數量: {count}")
                 else:
-                    print(f"  在文本 '{text}' 中未找到括號內的計數。")
+                    log_posts.debug(f"  在文本 '{text}' 中未找到括號內的計數。")
                     # 如果需要，可以嘗試從 text 中解析類型名稱作為備用
                     # type_name_from_text = re.sub(r'\s*\(\d+\)\s*$', '', text).strip().lower()
                     # if type_name == "unknown_type_no_svg": type_name = f"{type_name_from_text}_posts"
 
             except NoSuchElementException:
                 # 如果找不到那個特定的 div，可能是結構又變了，或者沒有 SVG (上面的 try 會先處理)
-                print(f"  在按鈕內找不到預期的包含文本的 div (SVG 的同級元素)。HTML: {item_element.get_attribute('outerHTML')}")
+                if log_posts.isEnabledFor(logging.DEBUG): # outerHTML 需要一次 WebDriver 往返，只在 DEBUG 時取得
+                    log_posts.debug(f"  在按鈕內找不到預期的包含文本的 div (SVG 的同級元素)。HTML: {item_element.get_attribute('outerHTML')}")
                 # 可以嘗試直接獲取按鈕的文本作為備用
                 try:
                      button_text = item_element.text.strip()
-                     count_match = re.search(r'\((\d+)\)', button_text)
-                     if count_match: count = int(count_match.group(1))
-                     print(f"  備用：從按鈕文本 '{button_text}' 提取數量: {count}")
+                     count = extract_paren_count(button_text) or count
+                     log_posts.debug(f"  備用：從按鈕文本 '{button_text}' 提取數量: {count}")
                 except: pass # 忽略備用方案的錯誤
 
             except Exception as e:
-                print(f"  提取類型數量時出錯: {e}")
+                log_posts.warning(f"  提取類型數量時出錯: {e}")
 
             # 返回結果
             if type_name != "unknown": # 只要類型不是 unknown 就返回
-                print(f"  => 解析到類型項目: {type_name} = {count}")
+                log_posts.debug(f"  => 解析到類型項目: {type_name} = {count}")
                 return type_name, count
             else:
-                 print(f"  => 無法完全解析此類型項目。")
+                 log_posts.warning(f"  => 無法完全解析此類型項目。")
                  return None # 返回 None 表示解析失敗
 
         except StaleElementReferenceException:
-            print("  解析類型項目時元素過時。")
+            log_posts.warning("  解析類型項目時元素過時。")
             return None
         except Exception as e:
-            print(f"  解析類型項目時發生未知錯誤: {e}")
+            log_posts.warning(f"  解析類型項目時發生未知錯誤: {e}")
             return None
         # return None # 確保所有路徑都有返回值
 
@@ -943,7 +1098,7 @@ class PatreonScraperRefactored:
             一個包含解析結果的字典。
         """
         results = {}
-        print(f"嘗試打開下拉選單: {button_selector}")
+        log_posts.debug(f"嘗試打開下拉選單: {button_selector}")
 
         # 滾動到頂部，增加按鈕可見性
         self.driver.execute_script("window.scrollTo(0, 0);")
@@ -954,24 +1109,24 @@ class PatreonScraperRefactored:
 
         # 點擊按鈕打開下拉選單
         if not self._click_element(button_selector, timeout=10):
-            print(f"無法點擊按鈕 {button_selector}，跳過此下拉選單。")
+            log_posts.warning(f"無法點擊按鈕 {button_selector}，跳過此下拉選單。")
             return results
 
         # 等待並查找下拉選單容器
-        print(f"等待下拉選單容器: {container_selector}")
+        log_posts.debug(f"等待下拉選單容器: {container_selector}")
         dropdown_container = self._find_element(container_selector, timeout=5) # 容器出現通常較快
 
         if dropdown_container is None:
-            print(f"無法找到下拉選單容器 {container_selector}。")
+            log_posts.warning(f"無法找到下拉選單容器 {container_selector}。")
              # 嘗試點擊 body 關閉可能存在的不可見菜單
             try: self._click_element((By.TAG_NAME, "body"), timeout=1); time.sleep(0.5)
             except: pass
             return results
 
         # 查找並處理選單項目
-        print(f"查找選單項目: {item_locator}")
+        log_posts.debug(f"查找選單項目: {item_locator}")
         menu_items = self._find_elements(item_locator, parent=dropdown_container)
-        print(f"找到 {len(menu_items)} 個選單項目。")
+        log_posts.debug(f"找到 {len(menu_items)} 個選單項目。")
 
         for item in menu_items:
             try:
@@ -981,15 +1136,15 @@ class PatreonScraperRefactored:
                 if parsed_data:
                     key, value = parsed_data
                     results[key] = value
-                    print(f"  解析到項目: {key} = {value}")
+                    log_posts.debug(f"  解析到項目: {key} = {value}")
             except StaleElementReferenceException:
-                 print("  處理選單項目時元素過時，跳過。")
+                 log_posts.warning("  處理選單項目時元素過時，跳過。")
                  continue # 元素已失效，跳過
             except Exception as e:
-                print(f"  處理選單項目時發生錯誤: {e}")
+                log_posts.warning(f"  處理選單項目時發生錯誤: {e}")
 
         # 關閉下拉選單 (點擊 body 通常可以)
-        print("嘗試關閉下拉選單...")
+        log_posts.debug("嘗試關閉下拉選單...")
         try:
             # 點擊 body 的空白區域
             body_element = self._find_element((By.TAG_NAME, 'body'))
@@ -999,11 +1154,11 @@ class PatreonScraperRefactored:
             WebDriverWait(self.driver, 5).until(
                  EC.invisibility_of_element_located(container_selector)
             )
-            print("下拉選單已關閉。")
+            log_posts.debug("下拉選單已關閉。")
         except TimeoutException:
-             print("警告: 無法確認下拉選單是否已關閉。")
+             log_posts.warning("警告: 無法確認下拉選單是否已關閉。")
         except Exception as e:
-            print(f"關閉下拉選單時出錯: {e}")
+            log_posts.warning(f"關閉下拉選單時出錯: {e}")
             # 作為備用，發送 ESC 鍵
             try: webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
             except: pass
@@ -1012,7 +1167,7 @@ class PatreonScraperRefactored:
 
     def get_post_years(self) -> Dict[str, int]:
         """獲取各年份的文章數量"""
-        print("獲取文章年份數據...")
+        log_posts.debug("獲取文章年份數據...")
         button_selector = self.SELECTORS["year_button"] # 使用年份按鈕選擇器
         return self._get_dropdown_data(
             button_selector=button_selector,
@@ -1023,7 +1178,7 @@ class PatreonScraperRefactored:
 
     def get_post_tiers(self) -> Dict[str, int]:
         """獲取各 Tier 的文章數量"""
-        print("獲取文章 Tier 數據...")
+        log_posts.debug("獲取文章 Tier 數據...")
         button_selector = self.SELECTORS["tier_button"] # 使用 Tier 按鈕選擇器
         return self._get_dropdown_data(
             button_selector=button_selector,
@@ -1034,7 +1189,7 @@ class PatreonScraperRefactored:
 
     def get_post_types(self) -> Dict[str, int]:
         """獲取各類型的文章數量"""
-        print("獲取文章類型數據...")
+        log_posts.debug("獲取文章類型數據...")
         button_selector = self.SELECTORS["post_type_button"] # 使用類型按鈕選擇器
         return self._get_dropdown_data(
             button_selector=button_selector,
@@ -1048,7 +1203,7 @@ class PatreonScraperRefactored:
         滾動頁面或點擊「載入更多」按鈕以加載內容。
         現在只處理加載，不返回數據。數據由 get_social_value 獲取。
         """
-        print("開始嘗試加載更多內容 (滾動/點擊)...")
+        log_posts.debug("開始嘗試加載更多內容 (滾動/點擊)...")
         scroll_attempts = 0
         # TODO: 確認 Load More 按鈕選擇器
         load_more_selector = self.SELECTORS["load_more_button"]
@@ -1056,7 +1211,7 @@ class PatreonScraperRefactored:
         last_height = self.driver.execute_script("return document.body.scrollHeight")
 
         while scroll_attempts < max_scrolls:
-            print(f"加載嘗試 {scroll_attempts + 1}/{max_scrolls}...")
+            log_posts.debug(f"加載嘗試 {scroll_attempts + 1}/{max_scrolls}...")
 
             load_more_found_and_visible = False
             try:
@@ -1071,36 +1226,36 @@ class PatreonScraperRefactored:
 
             clicked_button = False
             if load_more_found_and_visible:
-                print("嘗試點擊 '載入更多' 按鈕...")
+                log_posts.debug("嘗試點擊 '載入更多' 按鈕...")
                 if self._click_element(load_more_selector, timeout=5):
                      clicked_button = True
                      # 點擊後等待，最好是等待特定元素加載或 spinner 消失
-                     print("點擊後等待內容加載...")
+                     log_posts.debug("點擊後等待內容加載...")
                      # 簡單等待高度變化
                      try:
                          WebDriverWait(self.driver, 10).until(
                              lambda driver: driver.execute_script("return document.body.scrollHeight") > last_height
                          )
-                         print("檢測到頁面高度增加。")
+                         log_posts.debug("檢測到頁面高度增加。")
                      except TimeoutException:
-                         print("點擊按鈕後頁面高度未在預期內增加。")
+                         log_posts.debug("點擊按鈕後頁面高度未在預期內增加。")
                      # time.sleep(2) # 避免使用 sleep
                 else:
-                     print("'載入更多' 按鈕點擊失敗。")
+                     log_posts.warning("'載入更多' 按鈕點擊失敗。")
 
 
             # 如果沒有找到或點擊按鈕，則滾動
             if not clicked_button:
-                 print("向下滾動頁面...")
+                 log_posts.debug("向下滾動頁面...")
                  self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                  # 滾動後等待
-                 print("滾動後等待內容加載...")
+                 log_posts.debug("滾動後等待內容加載...")
                  # 簡單等待高度變化
                  try:
                      WebDriverWait(self.driver, 5).until( # 滾動觸發的加載可能較快
                          lambda driver: driver.execute_script("return document.body.scrollHeight") > last_height
                      )
-                     print("檢測到頁面高度增加。")
+                     log_posts.debug("檢測到頁面高度增加。")
                  except TimeoutException:
                      # print("滾動後頁面高度未在預期內增加。") # 可能已到底部
                      pass # 繼續檢查最終高度
@@ -1111,27 +1266,27 @@ class PatreonScraperRefactored:
                 time.sleep(0.5) # 給 JS 一點時間更新高度
                 new_height = self.driver.execute_script("return document.body.scrollHeight")
                 if new_height == last_height:
-                     print("頁面高度未改變，判斷已到達底部。")
+                     log_posts.debug("頁面高度未改變，判斷已到達底部。")
                      break # 停止加載
                 else:
-                     print(f"頁面高度已從 {last_height} 增加到 {new_height}。")
+                     log_posts.debug(f"頁面高度已從 {last_height} 增加到 {new_height}。")
                      last_height = new_height
             except Exception as height_e:
-                 print(f"檢查頁面高度時出錯: {height_e}")
+                 log_posts.warning(f"檢查頁面高度時出錯: {height_e}")
                  break # 出錯時停止
 
             scroll_attempts += 1
             # 添加小的隨機延遲
             time.sleep(random.uniform(0.5, 1.5))
 
-        print(f"加載更多內容結束，共完成 {scroll_attempts} 次嘗試。")
+        log_posts.info(f"加載更多內容結束，共完成 {scroll_attempts} 次嘗試。")
 
 
     def get_social_values(self) -> Dict[str, int]:
         """
         遍歷頁面上的貼文，區分公開和私密貼文，分別統計按讚數和留言數。
         """
-        print("正在區分公開/私密貼文並統計社交互動數據...")
+        log_posts.debug("正在區分公開/私密貼文並統計社交互動數據...")
         public_likes = 0
         public_comments = 0
         locked_likes = 0
@@ -1140,17 +1295,17 @@ class PatreonScraperRefactored:
         # 先確保內容已盡可能加載 
         self.scroll_page_to_load_more(max_scrolls = 0) # 增加滾動次數
 
-        print("查找所有點讚和留言元素...")
+        log_posts.debug("查找所有點讚和留言元素...")
         # TODO: 確認點讚和留言元素的選擇器
         post_cards = self._find_elements(self.SELECTORS["post_card_container"])
-        print(f"找到 {len(post_cards)} 個貼文卡片容器。")
+        log_posts.debug(f"找到 {len(post_cards)} 個貼文卡片容器。")
 
 
         for i, card in enumerate(post_cards):
             is_locked = False
             post_likes = 0
             post_comments = 0
-            print(f"  處理第 {i+1} 個貼文卡片...")
+            log_posts.debug(f"  處理第 {i+1} 個貼文卡片...")
 
             try:
                 # 3.1 檢查是否為私密貼文 (在卡片內部查找鎖定標誌)
@@ -1158,7 +1313,7 @@ class PatreonScraperRefactored:
                 lock_indicator = self._find_element(self.SELECTORS["lock_icon_indicator"], parent=card, timeout=0.1)
                 if lock_indicator:
                     is_locked = True
-                    print("貼文已鎖定。")
+                    log_posts.debug("貼文已鎖定。")
                 # else:
                 #     print("貼文是公開的。")
 
@@ -1172,7 +1327,7 @@ class PatreonScraperRefactored:
                     count = parse_number(like_text) # 使用輔助函數
                     if count is not None:
                         post_likes = count
-                        print(f"找到按讚數: {post_likes}")
+                        log_posts.debug(f"找到按讚數: {post_likes}")
 
                 # 3.3 在卡片內部查找留言數
                 # 使用 '.' 開頭的相對 XPath
@@ -1183,7 +1338,7 @@ class PatreonScraperRefactored:
                     count = parse_number(comment_text)
                     if count is not None:
                         post_comments = count
-                        print(f"找到留言數: {post_comments}")
+                        log_posts.debug(f"找到留言數: {post_comments}")
 
                 # 3.4 根據是否鎖定，累加到對應計數器
                 if is_locked:
@@ -1194,17 +1349,14 @@ class PatreonScraperRefactored:
                     public_comments += post_comments
 
             except StaleElementReferenceException:
-                 print(f"處理第 {i+1} 個貼文卡片時元素過時，跳過此卡片。")
+                 log_posts.warning(f"處理第 {i+1} 個貼文卡片時元素過時，跳過此卡片。")
                  continue
             except Exception as e:
-                 print(f"處理第 {i+1} 個貼文卡片時發生錯誤: {e}")
+                 log_posts.warning(f"處理第 {i+1} 個貼文卡片時發生錯誤: {e}")
                  continue # 跳過這個卡片，繼續處理下一個
 
-        print("-" * 20)
-        print(f"統計結果: ")
-        print(f"  公開 - Likes: {public_likes}, Comments: {public_comments}")
-        print(f"  私密 - Likes: {locked_likes}, Comments: {locked_comments}")
-        print("-" * 20)
+        log_posts.info(f"社交互動統計: 公開 Likes={public_likes}, Comments={public_comments}；"
+                       f"私密 Likes={locked_likes}, Comments={locked_comments}")
 
         return {
             'public_likes': public_likes,
@@ -1213,55 +1365,35 @@ class PatreonScraperRefactored:
             'locked_comments': locked_comments
         }
 
+    def _get_anchor_index(self) -> AnchorIndex:
+        """
+        目前文件的連結索引 (見 anchor_index)。同一份文件只以一次 script 呼叫建立一次，
+        社群連結與外部連結數共用；頁面重新載入 (即使網址相同) 後重新建立，與原本各自重新掃描的結果一致。
+        """
+        if self._anchor_index is not None and self.driver.execute_script(DOCUMENT_TOKEN_JS) == self._anchor_index[0]:
+            return self._anchor_index[1]
+        self._find_element((By.XPATH, "//a[@href]"), timeout=5) # 與原本 _find_elements 相同，最多等 5 秒讓連結出現
+        index = AnchorIndex.from_driver(self.driver)
+        token = uuid.uuid4().hex
+        self.driver.execute_script(MARK_DOCUMENT_JS, token)
+        log_links.debug(f"建立連結索引: {index.anchor_count} 個 <a>，{len(index.counts)} 個不同 href")
+        self._anchor_index = (token, index)
+        return index
+
     def get_social_links(self) -> Dict[str, Any]:
         """獲取創作者頁面上的社群平台連結"""
-        print("正在獲取社群平台連結...")
-        social_platforms = {'facebook': 'no', 'twitter': 'no', 'instagram': 'no', 'youtube': 'no', 'twitch': 'no', 'tiktok': 'no', 'discord': 'no'}
-        social_link_count = 0
-        processed_links = set()
-
+        log_links.debug("正在獲取社群平台連結...")
         try:
-            # 嘗試定位包含社群連結的特定區域
-            link_area = self._find_element(self.SELECTORS["social_link_area"])
-            if link_area:
-                print("在指定區域查找社群連結...")
-                links = self._find_elements(self.SELECTORS["social_link"], parent=link_area)
-            else:
-                print("未找到特定社群連結區域，查找頁面所有連結...")
-                links = self._find_elements(self.SELECTORS["social_link"])
-
-            print(f"找到 {len(links)} 個潛在連結。")
-
-            for link in links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and href not in processed_links and not href.startswith("https://www.patreon.com/"):
-                         href_lower = href.lower()
-                         platform_found = None
-                         # 平台判斷邏輯
-                         if 'facebook.com' in href_lower: platform_found = 'facebook'
-                         elif 'twitter.com' in href_lower or 'x.com' in href_lower: platform_found = 'twitter'
-                         elif 'instagram.com' in href_lower: platform_found = 'instagram'
-                         # 注意：Youtube 連結可能需要更精確判斷，避免誤判圖片等
-                         elif 'youtube.com/channel/' in href_lower or 'youtube.com/user/' in href_lower or 'youtube.com/@' in href_lower: platform_found = 'youtube'
-                         elif 'twitch.tv' in href_lower: platform_found = 'twitch'
-                         elif 'discord.gg' in href_lower or 'discord.com/invite' in href_lower: platform_found = 'discord'
-                         elif 'tiktok.com' in href_lower: platform_found = 'tiktok'
-
-                         if platform_found and social_platforms[platform_found] == 'no':
-                              social_platforms[platform_found] = 'yes'
-                              social_link_count += 1
-                              processed_links.add(href)
-                              print(f"  找到社群連結: {platform_found} - {href[:50]}...") # 截斷長連結
-
-                except StaleElementReferenceException: continue
-                except Exception: pass # 忽略處理單個連結的錯誤
-
+            index = self._get_anchor_index()
+            for platform, href in index.platform_hrefs.items():
+                log_links.debug(f"  找到社群連結: {platform} - {href[:50]}...") # 截斷長連結
+            social_platforms = index.social_links()
         except Exception as e:
-            print(f"獲取社群連結時發生錯誤: {e}")
+            log_links.warning(f"獲取社群連結時發生錯誤: {e}")
+            social_platforms = {platform: 'no' for platform in SOCIAL_PLATFORMS}
+            social_platforms['social_link_count'] = 0
 
-        social_platforms['social_link_count'] = social_link_count
-        print(f"社群連結處理完成: {social_platforms}")
+        log_links.info(f"社群連結處理完成: {social_platforms}")
         return social_platforms
     
 
@@ -1289,7 +1421,7 @@ class PatreonScraperRefactored:
                     # else: # 可選調試:
                     #     print(f"    提取數字時，文本 '{text_content}' 清理後非純數字: '{cleaned_number_str}'")
             except StaleElementReferenceException:
-                print("    提取數字時元素過時，將嘗試下一個。")
+                log_about.warning("    提取數字時元素過時，將嘗試下一個。")
                 continue
             except Exception as e:
                 # 為了避免過多不必要的打印，只在真的出錯時打印
@@ -1305,7 +1437,7 @@ class PatreonScraperRefactored:
         統一處理 '關於' 頁面數據，提取會員數和字數統計。
         執行完畢後會導航回原始頁面。
         """
-        print("統一處理 '關於' 頁面數據 (會員數與字數)...")
+        log_about.debug("統一處理 '關於' 頁面數據 (會員數與字數)...")
         about_data = {
             'about_total_members': None,
             'about_paid_members': None,
@@ -1317,10 +1449,10 @@ class PatreonScraperRefactored:
         self.driver.execute_script("window.scrollTo(0, 0);") # 確保 'About' 連結可見
         time.sleep(0.5)
         if not self._click_element(self.SELECTORS["about_link"], timeout=10):
-            print("  未能點擊 '關於' 連結，無法獲取 About 頁數據。")
+            log_about.warning("  未能點擊 '關於' 連結，無法獲取 About 頁數據。")
             return about_data # 如果無法進入 About 頁，直接返回默認數據
 
-        print("  已進入 '關於' 頁面，等待內容加載...")
+        log_about.debug("  已進入 '關於' 頁面，等待內容加載...")
 
         # --- 步驟 2: 等待 About 頁面關鍵元素加載 ---
         # 等待會員數容器或字數內容容器之一出現
@@ -1332,16 +1464,16 @@ class PatreonScraperRefactored:
                     EC.presence_of_element_located(self.SELECTORS["about_content_container"])
                 )
             )
-            print("  '關於' 頁面關鍵元素已初步加載。")
+            log_about.debug("  '關於' 頁面關鍵元素已初步加載。")
         except TimeoutException:
-            print("  等待 '關於' 頁面關鍵元素超時。")
+            log_about.warning("  等待 '關於' 頁面關鍵元素超時。")
             # 嘗試導航回原始 URL (如果 URL 已改變)
             if self.driver.current_url != original_url and "/about" in self.driver.current_url.lower():
-                print(f"  由於 About 頁加載問題，嘗試導航回原始 URL: {original_url}")
+                log_about.debug(f"  由於 About 頁加載問題，嘗試導航回原始 URL: {original_url}")
                 self.driver.get(original_url)
                 try: # 快速檢查是否成功返回
                     WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self.SELECTORS["creator_name"]))
-                except TimeoutException: print("  警告: 導航回原始頁面後，關鍵元素未加載。")
+                except TimeoutException: log_about.warning("  警告: 導航回原始頁面後，關鍵元素未加載。")
             return about_data # 返回默認數據
 
         # --- 步驟 3: 提取會員數 ---
@@ -1351,7 +1483,7 @@ class PatreonScraperRefactored:
             count = self._extract_number_from_member_container(total_members_container_el)
             if count is not None:
                 about_data['about_total_members'] = count
-                print(f"      提取到總會員數 (Total Members): {count}")
+                log_about.debug(f"      提取到總會員數 (Total Members): {count}")
 
         # 提取付費會員數
         paid_members_container_el = self._find_element(self.SELECTORS["about_paid_members_container"], timeout=3) # 縮短超時
@@ -1359,7 +1491,7 @@ class PatreonScraperRefactored:
             count = self._extract_number_from_member_container(paid_members_container_el)
             if count is not None:
                 about_data['about_paid_members'] = count
-                print(f"      提取到付費會員數 (Paid Members): {count}")
+                log_about.debug(f"      提取到付費會員數 (Paid Members): {count}")
         
         # --- 步驟 4: 提取字數統計 ---
         content_container_for_words = self._find_element(self.SELECTORS["about_content_container"], timeout=5)
@@ -1369,24 +1501,24 @@ class PatreonScraperRefactored:
                 if about_text:
                     words = about_text.strip().split()
                     about_data['about_word_count'] = len(words)
-                    print(f"      '關於' 區域字數 (Word Count): {about_data['about_word_count']}")
+                    log_about.debug(f"      '關於' 區域字數 (Word Count): {about_data['about_word_count']}")
                 # else: print("      '關於' 區域文本為空 (用於字數統計)。") # 可選調試
             except StaleElementReferenceException:
-                print("      '關於' 內容容器元素已過時 (用於字數統計)。")
+                log_about.warning("      '關於' 內容容器元素已過時 (用於字數統計)。")
             except Exception as e:
-                print(f"      提取 '關於' 區域字數時出錯: {e}")
+                log_about.warning(f"      提取 '關於' 區域字數時出錯: {e}")
         # else: print("      未能找到 '關於' 內容容器 (用於字數統計)。") # 可選調試
         
         # --- 步驟 5: 導航回原始 URL ---
         current_page_url = self.driver.current_url
         if current_page_url != original_url and "/about" in current_page_url.lower(): # 確保我們真的在 about 頁
-            print(f"  處理完 '關於' 頁面，嘗試導航回原始 URL: {original_url}")
+            log_about.debug(f"  處理完 '關於' 頁面，嘗試導航回原始 URL: {original_url}")
             self.driver.get(original_url)
             try:
                 WebDriverWait(self.driver, 15).until(EC.presence_of_element_located(self.SELECTORS["creator_name"]))
-                print("  已成功導航回原始頁面。")
+                log_about.debug("  已成功導航回原始頁面。")
             except TimeoutException:
-                print("  警告：導航回原始頁面後，關鍵元素未重新加載。後續爬取可能受影響。")
+                log_about.warning("  警告：導航回原始頁面後，關鍵元素未重新加載。後續爬取可能受影響。")
         # else: # 可選調試
             # if "/about" not in current_page_url.lower() and current_page_url != original_url :
             #      print(f"  當前 URL ({current_page_url}) 與原始 URL ({original_url}) 不同，但不在 About 頁，可能無需導航。")
@@ -1395,41 +1527,153 @@ class PatreonScraperRefactored:
         return about_data
 
 
-    def scrape_url(self, url: str) -> Optional[Dict[str, Any]]:
+    def _get_post_filters(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        取得文章類型與年份計數: 優先使用新版懸浮篩選視窗，沒有時退回舊版下拉選單
+        (有版型快取時先試這位創作者上次的版型)。
+
+        Returns:
+            (post_types_data, post_years_data)
+        """
+        strategies = {"dialog": self._post_filters_via_dialog, "legacy": self._post_filters_legacy}
+        for variant in self._layout_order("post_filters"):
+            filter_data = strategies[variant]()
+            if filter_data is not None:
+                self._record_layout("post_filters", variant)
+                return filter_data
+        return {}, {}
+
+    def _post_filters_via_dialog(self) -> Optional[Tuple[Dict[str, int], Dict[str, int]]]:
+        """從新版懸浮篩選視窗解析；沒有觸發按鈕時返回 None"""
+        post_types_data = {}
+        post_years_data = {}
+        log_posts.debug("檢查是否存在新的懸浮篩選視窗觸發按鈕...")
+        new_structure_button = self._find_element(self.SELECTORS["filter_dialog_toggle_button"], timeout=3)
+        if not new_structure_button:
+            log_posts.debug("未檢測到新的懸浮篩選視窗按鈕。")
+            return None
+        log_posts.debug("檢測到新的懸浮篩選視窗按鈕。")
+        if self._click_element(self.SELECTORS["filter_dialog_toggle_button"], timeout=3):
+            dialog_container = self._find_element(self.SELECTORS["filter_dialog_container"], timeout=3)
+            if dialog_container:
+                all_filter_data_from_dialog = self._parse_filter_dialog(dialog_container)
+                post_types_data = all_filter_data_from_dialog.get('post_type_dict', {})
+                post_years_data = all_filter_data_from_dialog.get('post_year_dict', {})
+                try:
+                    body_element = self._find_element((By.TAG_NAME, 'body'))
+                    if body_element: webdriver.ActionChains(self.driver).move_to_element(body_element).click().perform()
+                    WebDriverWait(self.driver, 5).until(EC.invisibility_of_element_located(self.SELECTORS["filter_dialog_container"]))
+                except:
+                    try: webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
+                    except: pass
+            else: log_posts.debug("未能找到懸浮視窗容器。")
+        else: log_posts.warning("點擊新的懸浮篩選視窗觸發按鈕失敗。")
+        return post_types_data, post_years_data
+
+    def _post_filters_legacy(self) -> Optional[Tuple[Dict[str, int], Dict[str, int]]]:
+        """以舊版下拉選單取得文章類型與年份；兩者都沒有資料時返回 None"""
+        log_posts.debug("使用舊版下拉選單處理篩選數據。")
+        try: post_types_data = self.get_post_types()
+        except Exception as e: log_posts.warning(f"舊結構 get_post_types 失敗: {e}"); post_types_data = {}
+        try: post_years_data = self.get_post_years()
+        except Exception as e: log_posts.warning(f"舊結構 get_post_years 失敗: {e}"); post_years_data = {}
+        if not post_types_data and not post_years_data:
+            return None
+        return post_types_data, post_years_data
+
+    def _count_external_links(self, url: str) -> int:
+        """計算創作者主頁上的外部連結數 (不在主頁時先導航回去)"""
+        current_url_lower = self.driver.current_url.lower()
+        # 檢查是否需要導航回主頁面 (url)
+        if self.driver.current_url != url and ("/about" in current_url_lower or "/chats" in current_url_lower or "/tiers" in current_url_lower): # 增加了 /tiers
+            log_links.debug(f"當前在 {self.driver.current_url}，導航回主頁 ({url}) 以計算總連結...")
+            self.driver.get(url)
+            try:
+                WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self.SELECTORS["creator_name"]))
+            except TimeoutException:
+                log_links.warning(f"警告: 導航回主頁 ({url}) 後 creator_name 未加載。")
+
+        log_links.debug("正在計算頁面外部連結數...")
+        try:
+            total_links = self._get_anchor_index().total_links
+        except Exception as e:
+            log_links.warning(f"處理連結標籤時出錯: {e}")
+            total_links = 0
+        log_links.info(f"頁面外部連結數: {total_links}")
+        return total_links
+
+    def scrape_url(self, url: str, prefetched: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         爬取單個 URL 的所有內容。
         如果決定跳過，則返回 None。
+
+        Args:
+            prefetched: HTTP 引擎 (http_engine) 已解析到的欄位；有的部分不再用瀏覽器抓取
+                (靜態內容、About 頁、會員方案)，其餘照常由 Selenium 補齊。
+                計畫中的階段全部能由 prefetched 取代時完全不導航。
         """
-        print(f"\n--- 開始爬取 URL: {url} ---")
+        log_run.info(f"--- 開始爬取 URL: {url} ---")
+        self.last_failure = None
+        self._anchor_index = None
+        self.current_url = url
+        prefetched = prefetched or {}
+        if prefetched.get('patron_count') == 0:
+            log_run.info(f"  HTTP 引擎顯示 Patron Count 為 0。URL: {url}。不開啟瀏覽器，直接跳過。")
+            self.last_failure = ("zero_patrons", "patron_count=0 (http)")
+            return None
+        # 載入頁面與年齡驗證只為其他瀏覽器階段服務；其餘階段都由 HTTP 結果取代時不開啟頁面
+        covered = covered_stages(prefetched)
+        needs_browser = any(stage not in covered for stage in self.plan.stages
+                            if stage not in ("page_load", "age_verification"))
         try:
-            self.driver.get(url)
-            print("等待頁面加載...")
-            creator_name_element = self._find_element(self.SELECTORS["creator_name"], timeout=20) # 先獲取元素
-            if not creator_name_element:
-                 print(f"頁面關鍵元素 (creator_name) 加載超時或未找到。URL: {url} 可能無效或頁面結構改變。跳過此 URL。")
-                 # >>> 修改點：直接返回 None <<<
-                 return None 
-            
-            creator_name_text = creator_name_element.text.strip() # 在確認元素存在後再獲取文本
-            print(f"頁面初步加載完成。Creator Name: {creator_name_text}")
-
+            creator_name_text = ""
+            if needs_browser:
+                stage_start = time.perf_counter()
+                self.driver.get(url)
+                log_run.debug("等待頁面加載...")
+                creator_name_element = self._find_element(self.SELECTORS["creator_name"], timeout=20) # 先獲取元素
+                self._record_stage("page_load", stage_start, url)
+                if not creator_name_element:
+                     log_run.warning(f"頁面關鍵元素 (creator_name) 加載超時或未找到。URL: {url} 可能無效或頁面結構改變。跳過此 URL。")
+                     self.last_failure = ("load_timeout", "creator_name not found")
+                     # >>> 修改點：直接返回 None <<<
+                     return None 
+                
+                creator_name_text = creator_name_element.text.strip() # 在確認元素存在後再獲取文本
+                log_run.info(f"頁面初步加載完成。Creator Name: {creator_name_text}")
 
-            self.handle_age_verification()
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(0.5)
 
-            static_data = self.get_static_content()
+                self._timed("age_verification", url, self.handle_age_verification)
+                self.driver.execute_script("window.scrollTo(0, 0);")
+                time.sleep(0.5)
+            else:
+                log_run.info(f"HTTP 引擎已涵蓋所有需要的階段 ({', '.join(sorted(covered & self.plan.stages))})，不開啟頁面。")
+
+            if "static_content" in covered:
+                log_run.info("使用 HTTP 引擎取得的靜態內容，略過 get_static_content。")
+                static_data = {
+                    'creator_name': prefetched['creator_name'],
+                    'patron_count': prefetched['patron_count'],
+                    'total_posts': prefetched['total_posts'],
+                    'income_per_month': prefetched.get('income_per_month', 0), # 沒有 pledge_sum 表示未公開收入
+                }
+            else:
+                static_data = self._timed("static_content", url, self.get_static_content)
             # 在 get_static_content 之後，static_data['creator_name'] 應該已經被賦值 (如果成功)
             # 所以我們可以從 static_data 中獲取 creator_name 用於日誌
             
             initial_patron_count = static_data.get('patron_count', 0)
             if initial_patron_count is None or initial_patron_count == 0:
                 # >>> 修改點：在返回 None 前打印原因 <<<
-                print(f"  主頁初步 Patron Count 為 {initial_patron_count}。URL: {url}, Creator: {static_data.get('creator_name', 'N/A')}。跳過詳細爬取。")
+                log_run.info(f"  主頁初步 Patron Count 為 {initial_patron_count}。URL: {url}, Creator: {static_data.get('creator_name', 'N/A')}。跳過詳細爬取。")
+                self.last_failure = ("zero_patrons", f"patron_count={initial_patron_count}")
                 # >>> 修改點：直接返回 None <<<
                 return None
             
-            print(f"  主頁初步 Patron Count 為 {initial_patron_count} (Creator: {static_data.get('creator_name', 'N/A')})，繼續詳細爬取...")
+            log_run.info(f"  主頁初步 Patron Count 為 {initial_patron_count} (Creator: {static_data.get('creator_name', 'N/A')})，繼續詳細爬取...")
+            wants = self.plan.wants # --fields 未要求的階段直接略過 (見 field_planner)
+            # 在主頁上檢查一次 Chats 標籤頁，之後的聊天室統計直接沿用結果
+            has_chat_tab = self._timed("chat_tab_check", url, self.check_chat_tab_exists) if wants("chats") else False
             
             # ... (後續的詳細爬取邏輯保持不變，如 combined_about_data = self._get_combined_about_page_data() 等) ...
             
@@ -1449,69 +1693,36 @@ class PatreonScraperRefactored:
         #     return None
 
         # --- 將成功返回和錯誤處理放在 try 塊的末尾 ---
-            combined_about_data = self._get_combined_about_page_data()
-            social_links_data = self.get_social_links()
-            membership_tiers_data = self.get_membership_tiers()
-            post_types_data = {}
-            post_years_data = {}
-            post_tiers_data = self.get_post_tiers()
-            
-            print("檢查是否存在新的懸浮篩選視窗觸發按鈕...")
-            new_structure_button = self._find_element(self.SELECTORS["filter_dialog_toggle_button"], timeout=3)
-            if new_structure_button:
-                print("檢測到新的懸浮篩選視窗按鈕。")
-                if self._click_element(self.SELECTORS["filter_dialog_toggle_button"], timeout=3):
-                    dialog_container = self._find_element(self.SELECTORS["filter_dialog_container"], timeout=3)
-                    if dialog_container:
-                        all_filter_data_from_dialog = self._parse_filter_dialog(dialog_container)
-                        post_types_data = all_filter_data_from_dialog.get('post_type_dict', {})
-                        post_years_data = all_filter_data_from_dialog.get('post_year_dict', {})
-                        try: 
-                            body_element = self._find_element((By.TAG_NAME, 'body'))
-                            if body_element: webdriver.ActionChains(self.driver).move_to_element(body_element).click().perform()
-                            WebDriverWait(self.driver, 5).until(EC.invisibility_of_element_located(self.SELECTORS["filter_dialog_container"]))
-                        except: 
-                            try: webdriver.ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
-                            except: pass
-                    else: print("未能找到懸浮視窗容器。")
-                else: print("點擊新的懸浮篩選視窗觸發按鈕失敗。")
+            if not wants("about_page"):
+                combined_about_data = {}
+            elif "about_page" in covered:
+                log_run.info("使用 HTTP 引擎取得的 About 頁數據，略過 About 頁導航。")
+                combined_about_data = {k: prefetched.get(k) for k in ('about_total_members', 'about_paid_members', 'about_word_count')}
             else:
-                print("未檢測到新的懸浮篩選視窗按鈕，使用原有邏輯處理篩選數據。")
-                try: post_types_data = self.get_post_types()
-                except Exception as e: print(f"舊結構 get_post_types 失敗: {e}"); post_types_data = {}
-                try: post_years_data = self.get_post_years()
-                except Exception as e: print(f"舊結構 get_post_years 失敗: {e}"); post_years_data = {}
-
-            social_values_data = self.get_social_values()
-            chat_details = self.get_chat_room_details()
-            free_chat_count = chat_details.get('free_chat_count', 0)
-            paid_chat_count = chat_details.get('paid_chat_count', 0)
-            has_chat_tab_str = 'yes' if (free_chat_count > 0 or paid_chat_count > 0) else 'no'
-            about_word_count = combined_about_data.get('about_word_count', 0)
+                combined_about_data = self._timed("about_page", url, self._get_combined_about_page_data)
+            social_links_data = self._timed("social_links", url, self.get_social_links) if wants("social_links") else {}
+            if not wants("membership_tiers"):
+                membership_tiers_data = []
+            elif "membership_tiers" in covered:
+                log_run.info(f"使用 HTTP 引擎取得的 {len(prefetched['membership_tiers'])} 個會員方案，略過方案彈窗。")
+                membership_tiers_data = prefetched['membership_tiers']
+            else:
+                membership_tiers_data = self._timed("membership_tiers", url, self.get_membership_tiers)
+            post_tiers_data = self._timed("post_tiers", url, self.get_post_tiers) if wants("post_tiers") else {}
+            post_types_data, post_years_data = (self._timed("post_filters", url, self._get_post_filters)
+                                                if wants("post_filters") else ({}, {}))
 
-            current_url_lower = self.driver.current_url.lower()
-            # 檢查是否需要導航回主頁面 (url)
-            if self.driver.current_url != url and ("/about" in current_url_lower or "/chats" in current_url_lower or "/tiers" in current_url_lower): # 增加了 /tiers
-                print(f"當前在 {self.driver.current_url}，導航回主頁 ({url}) 以計算總連結...")
-                self.driver.get(url) 
-                try:
-                    WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(self.SELECTORS["creator_name"]))
-                except TimeoutException:
-                    print(f"警告: 導航回主頁 ({url}) 後 creator_name 未加載。")
+            social_values_data = self._timed("social_values", url, self.get_social_values) if wants("social_values") else {}
+            about_word_count = combined_about_data.get('about_word_count', 0)
 
+            total_links = self._timed("link_census", url, lambda: self._count_external_links(url)) if wants("link_census") else 0
 
-            print("正在計算頁面外部連結數...")
-            all_a_tags = self._find_elements((By.TAG_NAME, "a"))
-            external_links_count = 0
-            for link_element in all_a_tags:
-                try:
-                    href = link_element.get_attribute('href')
-                    if href and href.strip() and not href.startswith("#") and not href.startswith("https://www.patreon.com/"):
-                        external_links_count += 1
-                except StaleElementReferenceException: continue
-                except Exception as e: print(f"處理連結標籤時出錯: {e}"); continue
-            total_links = external_links_count
-            print(f"頁面外部連結數: {total_links}")
+            # 聊天室放在最後: 導航到 Chats 頁面後不必再回到主頁
+            chat_details = (self._timed("chats", url, lambda: self.get_chat_room_details(has_chat_tab))
+                            if wants("chats") else {})
+            free_chat_count = chat_details.get('free_chat_count', 0)
+            paid_chat_count = chat_details.get('paid_chat_count', 0)
+            has_chat_tab_str = 'yes' if (free_chat_count > 0 or paid_chat_count > 0) else 'no'
             
             final_patron_number = combined_about_data.get('about_paid_members')
             if final_patron_number is None:
@@ -1544,17 +1755,17 @@ class PatreonScraperRefactored:
                 'paid_chat_count': paid_chat_count,
                 'membership_tiers': membership_tiers_data,
                 'membership_tier_count': len(membership_tiers_data),
+                'not_collected': self.plan.not_collected,
             }
             result['total_likes_combined'] = result['public_likes'] + result['locked_likes']
             result['total_comments_combined'] = result['public_comments'] + result['locked_comments']
 
-            print(f"--- URL: {url} 爬取完成 (成功) ---")
+            log_run.info(f"--- URL: {url} 爬取完成 (成功) ---")
             return result # 成功完成所有爬取步驟後返回數據字典
 
         except Exception as e: # 捕獲在詳細爬取過程中可能發生的任何其他未預期錯誤
-            print(f"爬取 URL {url} 的詳細數據時發生嚴重錯誤: {e}")
-            import traceback
-            traceback.print_exc()
+            log_run.error(f"爬取 URL {url} 的詳細數據時發生嚴重錯誤: {e}", exc_info=True)
+            self.last_failure = (classify_exception(e), f"{type(e).__name__}: {str(e)[:200]}")
             # >>> 修改點：嚴重錯誤也返回 None <<<
             return None
 
@@ -1625,14 +1836,26 @@ class PatreonScraperRefactored:
                 elif field in ['about_total_members', 'about_paid_members']: row_data[field] = '' # 確保默認為空字符串
                 else: row_data[field] = 0 # 其他 (如文章類型) 默認為 0
 
+        # --fields 未要求的欄位留空，與真實的 0 區分
+        for field in data.get('not_collected', ()):
+            if field in fieldnames:
+                row_data[field] = NOT_COLLECTED
 
         return row_data
 
 
-    def scrape_multiple_targets(self, urls: List[str], fieldnames: List[str]) -> List[Dict[str, Any]]:
-        """爬取多個目標 URL 並保存到 CSV"""
+    def scrape_multiple_targets(self, urls: List[str], fieldnames: List[str],
+                                retry_queue: Optional[RetryQueue] = None,
+                                skip_list: Optional[SkipList] = None) -> List[Dict[str, Any]]:
+        """
+        爬取多個目標 URL 並保存到 CSV。
+
+        Args:
+            retry_queue: 暫時性失敗 (逾時、元素失效等) 的 URL 會依類型排入此佇列，由呼叫端在最後重試。
+            skip_list: 非創作者 / 0 贊助人的 URL 記錄於此，有效期內直接略過。
+        """
         if not urls:
-            print("沒有提供 URL，無法爬取。")
+            log_run.warning("沒有提供 URL，無法爬取。")
             return []
 
         # *** 明確定義所有期望的 CSV 欄位 ***
@@ -1668,18 +1891,70 @@ class PatreonScraperRefactored:
         results_list = [] # 先將結果存儲在列表中
 
         for i, url in enumerate(urls):
-            data = self.scrape_url(url) # scrape_url 現在返回 None 表示失敗
-            if data: # 僅處理成功爬取的數據
-                row_data = self._prepare_row_data(data, fieldnames)
-                results_list.append(row_data)
-                print(f"成功處理 URL ({i+1}/{len(urls)}): {url}")
-            else:
-                 print(f"跳過失敗的 URL ({i+1}/{len(urls)}): {url}")
+            with creator_context(url, self.logs):
+                if skip_list is not None and skip_list.should_skip(url):
+                    log_run.info(f"略過已知的非創作者 URL ({i+1}/{len(urls)}): {url}")
+                    self.trace.event("url_skipped", url=url, reason="skip_list")
+                    continue
+
+                if self.measure_bytes:
+                    drain_log(self.driver)
+                url_start = time.perf_counter()
+                prefetched = None
+                if self.http_engine is not None:
+                    start = time.perf_counter()
+                    prefetched = self.http_engine.fetch(url)
+                    self.trace.event("http_prefetch", url=url, elapsed_s=round(time.perf_counter() - start, 3),
+                                     fields=sorted(prefetched) if prefetched else [])
+                if self.profiler is not None:
+                    data = self.profiler.run(url, self.scrape_url, url, prefetched=prefetched)
+                else:
+                    data = self.scrape_url(url, prefetched=prefetched) # scrape_url 現在返回 None 表示失敗
+                if self.measure_bytes:
+                    transfer = collect_transfer(self.driver)
+                    log_run.info(f"  下載量: {format_bytes(transfer['bytes'])}，{transfer['requests']} 個請求 "
+                                 f"({transfer['cached_requests']} 個來自快取)")
+                    self.trace.event("transfer", url=url, **transfer)
+                    self.trace.add_total("transfer_bytes", transfer["bytes"])
+                    self.trace.add_total("transfer_creators", 1)
+                if data: # 僅處理成功爬取的數據
+                    row_data = self._prepare_row_data(data, fieldnames)
+                    results_list.append(row_data)
+                    log_run.info(f"成功處理 URL ({i+1}/{len(urls)}): {url}")
+                    self.trace.event("url_done", url=url, seconds=round(time.perf_counter() - url_start, 3))
+                    if skip_list is not None:
+                        skip_list.unmark(url)
+                else:
+                    kind, detail = self.last_failure or ("error", "")
+                    log_run.warning(f"跳過失敗的 URL ({i+1}/{len(urls)}): {url} [{kind}]")
+                    self.trace.event("url_failed", url=url, kind=kind, detail=detail,
+                                     seconds=round(time.perf_counter() - url_start, 3))
+                    if skip_list is not None and kind == "zero_patrons":
+                        skip_list.mark(url, kind, detail)
+                    elif retry_queue is not None and retry_queue.add(url, kind, detail):
+                        log_run.info(f"  已排入重試佇列 (第 {retry_queue.attempts[url]} 次失敗)。")
+
+            # 在 URL 之間檢查 Chrome 記憶體，必要時重啟瀏覽器
+            try:
+                self.check_memory(url)
+            except Exception as e:
+                log_run.warning(f"記憶體檢查/重啟失敗: {e}")
+                # 瀏覽器已無法使用，本批次剩下的 URL 記為 webdriver_error 並排入重試，而不是直接丟棄
+                detail = f"記憶體檢查/重啟失敗: {e}"[:200]
+                remaining = [u for u in urls[i+1:] if skip_list is None or not skip_list.should_skip(u)]
+                for pending_url in remaining:
+                    self.trace.event("url_failed", url=pending_url, kind="webdriver_error", detail=detail, seconds=0.0)
+                    if retry_queue is not None:
+                        retry_queue.add(pending_url, "webdriver_error", detail)
+                if remaining:
+                    log_run.warning(f"本批次剩下的 {len(remaining)} 個 URL "
+                                    f"{'已排入重試佇列' if retry_queue is not None else '未能處理'}。")
+                break
 
             # 添加隨機延遲，避免請求過於頻繁
             if i < len(urls) - 1: # 最後一個 URL 後不需要等待
                 delay = random.uniform(5, 10) # 增加延遲範圍
-                print(f"等待 {delay:.1f} 秒...")
+                log_run.debug(f"等待 {delay:.1f} 秒...")
                 time.sleep(delay)
 
         # # --- 所有 URL 處理完畢後，一次性寫入 CSV ---
@@ -1697,7 +1972,7 @@ class PatreonScraperRefactored:
         #          print(f"寫入 CSV 時發生未知錯誤: {e}")
         # else:
         #     print("沒有成功爬取到任何數據，未生成 CSV 文件。")
-        print(f"本批次處理完成，共獲得 {len(results_list)} 條記錄。")
+        log_run.info(f"本批次處理完成，共獲得 {len(results_list)} 條記錄。")
         return results_list
 
 
@@ -1705,11 +1980,11 @@ class PatreonScraperRefactored:
         """關閉瀏覽器"""
         if hasattr(self, 'driver') and self.driver:
             try:
-                print("正在關閉 WebDriver...")
+                log_driver.debug("正在關閉 WebDriver...")
                 self.driver.quit()
-                print("WebDriver 已關閉。")
+                log_driver.info("WebDriver 已關閉。")
             except Exception as e:
-                print(f"關閉 WebDriver 時出錯: {e}")
+                log_driver.warning(f"關閉 WebDriver 時出錯: {e}")
 
 def load_urls_from_txt(filepath: str) -> List[str]:
     """從文字檔讀取 URL 列表"""
@@ -1739,7 +2014,61 @@ if __name__ == "__main__":
                         help="run Chrome in headless=new mode")
     parser.add_argument("max_urls", nargs="?", type=int,
                         help="limit URL count for quick test")
+    parser.add_argument("--memory-limit-mb", type=float, default=2048,
+                        help="restart Chrome between URLs when its process tree RSS exceeds this (MB, 0 = never)")
+    parser.add_argument("--max-retries", type=int, default=3,
+                        help="retry transient failures (timeouts, stale elements) up to N times at the end of the run")
+    parser.add_argument("--retry-base-delay", type=float, default=30,
+                        help="base delay in seconds for the exponential retry backoff")
+    parser.add_argument("--skip-list-days", type=float, default=14,
+                        help="skip URLs recorded as non-creator / zero patrons for this many days (0 = disable)")
+    parser.add_argument("--browser-profile", default="standard", choices=list(BROWSER_PROFILES),
+                        help="Chrome launch profile: 'lean' uses chrome-headless-shell when available, a smaller viewport and fewer subsystems")
+    parser.add_argument("--disk-cache-dir", default=None,
+                        help="shared Chrome HTTP disk cache directory so JS/CSS/font bundles survive browser restarts")
+    parser.add_argument("--disk-cache-size-mb", type=int, default=None, help="size cap for --disk-cache-dir (MB)")
+    parser.add_argument("--profile-dir", default=None,
+                        help="root for persistent per-worker Chrome profile directories (cache and cookies kept between runs)")
+    parser.add_argument("--measure-bytes", action="store_true",
+                        help="record network bytes per creator from the Chrome performance log")
+    parser.add_argument("--session-state-days", type=float, default=7,
+                        help="reuse saved age-verification / consent cookies across sessions for this many days (0 = do not persist)")
+    parser.add_argument("--preflight", action="store_true",
+                        help="HTTP-check all URLs first (pooled requests session) and drop 404 / zero-patron pages before any browser work")
+    parser.add_argument("--preflight-workers", type=int, default=8, help="concurrent HTTP requests during --preflight")
+    parser.add_argument("--engine", default="selenium", choices=["selenium", "http"],
+                        help="'http' reads name, counts, about data and tiers from the page's embedded JSON first and uses the browser only for the rest")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="run each selected URL under cProfile; writes one .prof per URL and prints CPU / WebDriver / idle breakdowns")
+    parser.add_argument("--cprofile-top", type=int, default=20, help="number of hot functions to list with --cprofile")
+    parser.add_argument("--progress-interval", type=float, default=60,
+                        help="seconds between progress/ETA lines when output is not a terminal (0 disables progress reporting)")
+    parser.add_argument("--progress-window-min", type=float, default=15,
+                        help="rolling window (minutes) for the throughput, ETA and failure-rate estimates")
+    parser.add_argument("--log-level", default="INFO", type=str.upper,
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="level written to the rotating scraper log file")
+    parser.add_argument("--console-log-level", default="WARNING", type=str.upper,
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="minimum level echoed to the console")
+    parser.add_argument("--log-module-level", action="append", default=[], metavar="MODULE=LEVEL",
+                        help="per-module level, e.g. chat=DEBUG (modules: driver, element, static, chat, tiers, posts, links, about, run, http); repeatable")
+    parser.add_argument("--debug-url", action="append", default=[], metavar="URL",
+                        help="log at DEBUG level while scraping this creator; repeatable")
+    parser.add_argument("--layout-cache-days", type=float, default=30,
+                        help="remember each creator's tier / post-filter layout for this many days and try it first (0 disables)")
+    parser.add_argument("--fields", default=None, metavar="COL,COL,...",
+                        help="only collect these CSV columns (or stage names, see field_planner.py); stages they do not need are skipped and other columns are left blank")
+    parser.add_argument("--metrics-file", default=None,
+                        help="write Prometheus textfile metrics (counters, stage histograms) to this .prom path while running")
+    parser.add_argument("--metrics-interval", type=float, default=30, help="seconds between --metrics-file writes")
+    parser.add_argument("--shard", type=parse_shard, default=None, metavar="I/N",
+                        help="only scrape shard I of N (stable URL hash, 1-based); merge outputs with sharding.py merge")
     args = parser.parse_args()
+    try:
+        scrape_plan = plan_for_fields(args.fields)
+    except ValueError as e:
+        parser.error(str(e))
+    if not scrape_plan.is_full:
+        print(scrape_plan.describe())
 
     run_headless = args.headless        # ←改成讀 CLI
     max_urls_to_process = args.max_urls
@@ -1761,6 +2090,14 @@ if __name__ == "__main__":
     run_headless = True   # 是否使用無頭模式 (True 或 False)
 
     target_urls = load_urls_from_txt(url_file)
+    all_url_order = url_order(target_urls) # 分片輸出依原始順序排列，方便之後合併
+
+    run_tag = "combined"
+    if args.shard:
+        shard_index, shard_count = args.shard
+        run_tag = shard_tag(shard_index, shard_count)
+        target_urls = select_shard(target_urls, shard_index, shard_count)
+        print(f"分片模式 {shard_index}/{shard_count}: 本機負責 {len(target_urls)} 個 URL。")
 
     if max_urls_to_process is not None and max_urls_to_process > 0:
         target_urls = target_urls[:max_urls_to_process]
@@ -1774,18 +2111,74 @@ if __name__ == "__main__":
 
         batch_size = 10
 
-        fieldnames = [
-            'URL', 'creator_name', 'total_post', 'patreon_number', 'income_per_month',
-            'tier_post_data', 'post_year_count', 'tier_count', 'total_links',
-            'facebook', 'twitter', 'instagram', 'youtube', 'twitch', 'tiktok', 'discord', 'social_link_count',
-            'text_posts', 'image_posts', 'video_posts', 'podcast_posts', 'audio_posts',
-            'link_posts', 'poll_posts', 'livestream_posts', 'other_posts', 'unknown',
-            'public_likes', 'public_comments', 'locked_likes', 'locked_comments',
-            'total_likes_combined', 'total_comments_combined', 'free_chat_count', 'paid_chat_count',
-            'membership_tier_count', 'membership_tiers_json', 'about_word_count',
-            'about_total_members', 'about_paid_members',
-        ]
-        fieldnames = sorted(list(set(fieldnames)), key=lambda x: fieldnames.index(x))
+        fieldnames = list(FIELDNAMES)
+        # 分片模式下每片使用各自的紀錄與略過清單 (同一 URL 永遠落在同一片)
+        suffix = "" if run_tag == "combined" else f"_{run_tag}"
+        run_trace = RunTrace.in_directory(output_directory, prefix=f"run_trace{suffix}")
+        try:
+            module_levels = parse_module_levels(args.log_module_level)
+        except ValueError as e:
+            parser.error(str(e))
+        scrape_logs = ScrapeLogging(os.path.join(output_directory, "logs", f"scraper{suffix}.log"),
+                                    level=logging.getLevelName(args.log_level),
+                                    console_level=logging.getLevelName(args.console_log_level),
+                                    module_levels=module_levels, debug_urls=args.debug_url)
+        print(f"詳細日誌寫入: {scrape_logs.log_path} (主控台只顯示 {args.console_log_level} 以上)")
+        metrics = None
+        if args.metrics_file:
+            metrics = ScrapeMetrics(args.metrics_file, interval_s=args.metrics_interval, shard=run_tag)
+            run_trace.add_listener(metrics.on_event)
+            metrics.start()
+        if args.progress_interval > 0:
+            # 分片行程的狀態檔供 sharding.py run-local 彙整
+            progress = ProgressTracker(window_s=args.progress_window_min * 60, interval_s=args.progress_interval,
+                                       state_path=os.path.join(output_directory, f"progress{suffix}.json"))
+            run_trace.add_listener(progress.on_event)
+        # 持久化 profile 會被 Chrome 鎖定，每個 worker (分片) 各用一個子目錄
+        browser_options = {
+            "disk_cache_dir": args.disk_cache_dir,
+            "disk_cache_size_mb": args.disk_cache_size_mb,
+            "user_data_dir": os.path.join(args.profile_dir, run_tag) if args.profile_dir else None,
+        }
+        retry_queue = RetryQueue(max_attempts=args.max_retries)
+        profiler = None
+        if args.cprofile:
+            cprofile_dir = os.path.join(output_directory, "cprofile", datetime.now().strftime("%Y%m%d_%H%M%S") + suffix)
+            profiler = UrlProfiler(cprofile_dir, top_n=args.cprofile_top)
+        # --session-state-days 0 只是不寫檔；本次執行中仍沿用已確認的狀態 (使用預設有效期)
+        session_state = (SessionState(os.path.join(output_directory, f"session_state{suffix}.json"),
+                                      ttl_days=args.session_state_days)
+                         if args.session_state_days > 0 else SessionState(None))
+        wait_ledger = WaitLedger(PatreonScraperRefactored.selector_names())
+        layout_cache = LayoutCache(os.path.join(output_directory, f"layout_cache{suffix}.json"),
+                                   ttl_days=args.layout_cache_days) if args.layout_cache_days > 0 else None
+        skip_list = SkipList(os.path.join(output_directory, f"skip_list{suffix}.json") if args.skip_list_days > 0 else None,
+                             ttl_days=args.skip_list_days)
+        url_redirects: Dict[str, str] = {} # 預檢轉址: 最終網址 -> 原始網址 (合併分片時排序用)
+        if args.preflight:
+            print("-" * 30)
+            print("執行 HTTP 預檢...")
+            candidates = [u for u in target_urls if not skip_list.should_skip(u)]
+            preflight = preflight_urls(candidates, max_workers=args.preflight_workers)
+            print(preflight.summary())
+            for url, (reason, detail) in preflight.dropped.items():
+                run_trace.event("preflight_dropped", url=url, reason=reason, detail=detail)
+                if reason == "zero_patrons":
+                    skip_list.mark(url, reason, detail)
+            for final_url, original_url in preflight.redirects.items():
+                # 轉址後的網址沿用原始網址在清單中的位置
+                all_url_order.setdefault(final_url, all_url_order.get(original_url, len(all_url_order)))
+            url_redirects = dict(preflight.redirects)
+            run_trace.event("preflight", checked=len(candidates), kept=len(preflight.kept),
+                            dropped=len(preflight.dropped), redirected=len(preflight.redirects),
+                            navigations_saved=preflight.navigations_saved,
+                            seconds_saved=round(preflight.seconds_saved), elapsed_s=round(preflight.elapsed_s, 1))
+            target_urls = preflight.kept
+
+        run_trace.event("run_start", url_count=len(target_urls), batch_size=batch_size,
+                        headless=run_headless, memory_limit_mb=args.memory_limit_mb, shard=run_tag,
+                        browser_profile=args.browser_profile, browser_options=browser_options,
+                        measure_bytes=args.measure_bytes)
         print(f"準備開始爬取 {len(target_urls)} 個目標，每 {batch_size} 個目標將重啟一次瀏覽器。")
 
         for i in range(0, len(target_urls), batch_size):
@@ -1795,9 +2188,16 @@ if __name__ == "__main__":
 
             scraper = None # 初始化為 None
             try:
-                scraper = PatreonScraperRefactored(output_dir=output_directory, headless=run_headless)
+                scraper = PatreonScraperRefactored(output_dir=output_directory, headless=run_headless,
+                                                   memory_limit_mb=args.memory_limit_mb, trace=run_trace,
+                                                   browser_profile=args.browser_profile,
+                                                   browser_options=browser_options, measure_bytes=args.measure_bytes,
+                                                   session_state=session_state, engine=args.engine,
+                                                   profiler=profiler, logs=scrape_logs, plan=scrape_plan,
+                                                   layout_cache=layout_cache, wait_ledger=wait_ledger)
                 print(f"本批次準備爬取 {len(url_batch)} 個目標...")
-                batch_results = scraper.scrape_multiple_targets(url_batch, fieldnames)
+                batch_results = scraper.scrape_multiple_targets(url_batch, fieldnames,
+                                                                retry_queue=retry_queue, skip_list=skip_list)
                 #scraper.scrape_multiple_targets(url_batch)
                 print(f"本批次 {len(url_batch)} 個目標處理完成。")
 
@@ -1809,6 +2209,16 @@ if __name__ == "__main__":
                 print(f"\n爬取過程中發生未預期的嚴重錯誤: {e}")
                 import traceback
                 traceback.print_exc()
+                # 瀏覽器無法啟動或批次中途中斷時，把本批次尚未完成的 URL 放進重試佇列
+                done_urls = {r.get('URL') for r in all_results}
+                detail = str(e)[:200]
+                requeued = 0
+                for url in url_batch:
+                    if url in done_urls or url in retry_queue.pending() or skip_list.should_skip(url):
+                        continue
+                    run_trace.event("url_failed", url=url, kind="webdriver_error", detail=detail, seconds=0.0)
+                    requeued += retry_queue.add(url, "webdriver_error", detail)
+                print(f"本批次 {requeued} 個未完成的 URL 已排入重試佇列。")
             finally:
                 if scraper:
                     scraper.close()
@@ -1816,24 +2226,62 @@ if __name__ == "__main__":
 
         print("\n所有批次處理完成。")
 
+        # --- 以指數退避重試暫時性失敗的 URL ---
+        attempt = 0
+        while len(retry_queue) > 0 and attempt < args.max_retries:
+            attempt += 1
+            retry_urls = retry_queue.drain()
+            delay = backoff_delay(attempt, base=args.retry_base_delay)
+            print("-" * 30)
+            print(f"第 {attempt} 輪重試: {len(retry_urls)} 個 URL，等待 {delay:.0f} 秒後開始...")
+            run_trace.event("retry_round", attempt=attempt, url_count=len(retry_urls), delay_s=round(delay, 1))
+            time.sleep(delay)
+
+            scraper = None
+            try:
+                scraper = PatreonScraperRefactored(output_dir=output_directory, headless=run_headless,
+                                                   memory_limit_mb=args.memory_limit_mb, trace=run_trace,
+                                                   browser_profile=args.browser_profile,
+                                                   browser_options=browser_options, measure_bytes=args.measure_bytes,
+                                                   session_state=session_state, engine=args.engine,
+                                                   profiler=profiler, logs=scrape_logs, plan=scrape_plan,
+                                                   layout_cache=layout_cache, wait_ledger=wait_ledger)
+                retry_results = scraper.scrape_multiple_targets(retry_urls, fieldnames,
+                                                                retry_queue=retry_queue, skip_list=skip_list)
+                all_results.extend(retry_results)
+                print(f"第 {attempt} 輪重試成功 {len(retry_results)}/{len(retry_urls)} 個 URL。")
+            except Exception as e:
+                print(f"重試過程中發生錯誤: {e}")
+                done_urls = {r.get('URL') for r in all_results}
+                for url in retry_urls: # 整輪失敗時把尚未處理的 URL 放回佇列
+                    if url not in retry_queue.pending() and url not in done_urls:
+                        retry_queue.add(url, "webdriver_error", str(e)[:200])
+            finally:
+                if scraper:
+                    scraper.close()
+
+        gave_up = {**retry_queue.exhausted, **retry_queue.pending()}
+        if gave_up:
+            print(f"重試後仍失敗的 URL: {len(gave_up)} 個")
+            for url, (kind, detail) in gave_up.items():
+                print(f"  [{kind}] {url} {detail}")
+                run_trace.event("url_gave_up", url=url, kind=kind, detail=detail)
+        try:
+            skip_list.save()
+        except OSError as e:
+            print(f"寫入略過清單失敗: {e}")
+        if layout_cache is not None:
+            print(layout_cache.summary())
+            try:
+                layout_cache.save()
+            except OSError as e:
+                print(f"寫入版型快取失敗: {e}")
+
         if all_results:
-            # 將 fieldnames 的定義移到這裡
-            fieldnames = [
-                'URL', 'creator_name', 'total_post', 'patreon_number', 'income_per_month',
-                'tier_post_data', 'post_year_count', 'tier_count', 'total_links',
-                'facebook', 'twitter', 'instagram', 'youtube', 'twitch', 'tiktok', 'discord', 'social_link_count',
-                'text_posts', 'image_posts', 'video_posts', 'podcast_posts', 'audio_posts',
-                'link_posts', 'poll_posts', 'livestream_posts', 'other_posts', 'unknown',
-                'public_likes', 'public_comments', 'locked_likes', 'locked_comments',
-                'total_likes_combined', 'total_comments_combined', 'free_chat_count', 'paid_chat_count',
-                'membership_tier_count', 'membership_tiers_json', 'about_word_count',
-                'about_total_members', 'about_paid_members',
-            ]
-            fieldnames = sorted(list(set(fieldnames)), key=lambda x: fieldnames.index(x))
-            
             # 產生一個最終的、帶時間戳的檔名
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            final_output_path = os.path.join(output_directory, f'patreon_data_{timestamp}_combined.csv')
+            final_output_path = os.path.join(output_directory, f'patreon_data_{timestamp}_{run_tag}.csv')
+            all_results = sort_rows_by_url_order(all_results, all_url_order)
             os.makedirs(output_directory, exist_ok=True) # 確保目錄存在
 
             print(f"\n準備將全部 {len(all_results)} 條記錄寫入單一 CSV 檔案: {final_output_path}")
@@ -1842,6 +2290,7 @@ if __name__ == "__main__":
                     writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
                     writer.writeheader()
                     writer.writerows(all_results)
+                write_redirects(final_output_path, url_redirects) # sharding.py merge 依原始網址排序
                 print("最終 CSV 檔案寫入成功！")
             except IOError as e:
                 print(f"寫入最終 CSV 檔案時出錯: {e}")
@@ -1853,6 +2302,21 @@ if __name__ == "__main__":
 
         end_time_monotonic = time.monotonic() # 記錄結束時間
         total_duration_seconds = end_time_monotonic - start_time_monotonic
+        run_trace.event("run_end", records=len(all_results), duration_s=round(total_duration_seconds, 1),
+                        driver_restarts=run_trace.counts.get("driver_restart", 0),
+                        transfer_bytes=run_trace.totals.get("transfer_bytes"))
+        run_trace.event("negative_waits", wasted_s=round(wait_ledger.total_wasted_s, 1),
+                        top=[{k: (round(v, 2) if isinstance(v, float) else v) for k, v in row.items()}
+                             for row in wait_ledger.ranking(10)])
+        if metrics is not None:
+            metrics.stop()
+        scrape_logs.stop()
+        if profiler is not None:
+            profiler.summary()
+        measured = run_trace.totals.get("transfer_creators", 0)
+        if measured:
+            total_bytes = run_trace.totals.get("transfer_bytes", 0)
+            print(f"下載量: 共 {format_bytes(total_bytes)}，平均每位創作者 {format_bytes(total_bytes / measured)} ({measured} 位)")
 
         minutes, seconds = divmod(total_duration_seconds, 60)
         hours, minutes = divmod(minutes, 60)
@@ -1866,5 +2330,13 @@ if __name__ == "__main__":
         else:
             print(f"  {seconds:.2f} 秒")
         print("-" * 30)
+        print(wait_ledger.report(run_seconds=total_duration_seconds))
+        ledger_path = os.path.join(output_directory, f"wait_ledger_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}.json")
+        try:
+            wait_ledger.save(ledger_path)
+            print(f"完整的等待排行已寫入: {ledger_path}")
+        except OSError as e:
+            print(f"寫入等待排行失敗: {e}")
+        print("-" * 30)
 
         print("程式執行完畢。")
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+分析腳本共用的磁碟快取。
+
+快取鍵由來源檔案內容的雜湊組成，快照檔案有任何改動時舊快取自然失效，
+不需要手動清除；刪除 .analysis_cache 目錄即可全部重建。
+"""
+import hashlib
+import os
+import pickle
+from typing import Any, Callable, Iterable
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".analysis_cache")
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """計算檔案內容的 SHA-256 (分塊讀取，不會一次載入整個檔案)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def combined_digest(parts: Iterable[str]) -> str:
+    """把多個字串 (通常是檔案雜湊與參數) 合併成一個快取鍵"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_path(namespace: str, key: str) -> str:
+    """返回某個命名空間下快取檔的路徑"""
+    return os.path.join(CACHE_DIR, namespace, f"{key[:32]}.pkl")
+
+
+def load_or_build(namespace: str, key: str, builder: Callable[[], Any]) -> Any:
+    """
+    讀取快取；不存在或損壞時呼叫 builder() 重建並寫回。
+
+    Args:
+        namespace: 快取子目錄名稱，例如 'tiers'。
+        key: 快取鍵 (見 file_digest / combined_digest)。
+        builder: 無參數函數，返回要快取的物件 (需可被 pickle)。
+    """
+    path = cache_path(namespace, key)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"讀取快取 {path} 失敗，將重新計算: {e}")
+
+    value = builder()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path) # 原子替換，避免中斷時留下半個檔案
+    return value
@@ -0,0 +1,199 @@
+"""
+創作者主頁的連結索引: 一次 script 呼叫取得所有 <a href>，同時算出社群平台欄位與外部連結數。
+
+原本 get_social_links 與 scrape_url 的外部連結統計各自列出所有 <a>，
+並對每個元素呼叫一次 get_attribute('href') (每次都是一個 WebDriver 往返)。
+AnchorIndex 把 href 去重後 (保留出現次數) 交給預先編譯的網域比對:
+    - 社群平台: 依原本的判斷順序 (facebook、twitter/x、instagram、youtube、twitch、discord、tiktok)，
+      每個平台只計一次，social_link_count 為找到的平台數
+    - total_links: 不以 # 或 https://www.patreon.com/ 開頭的 href 的 <a> 個數 (與原本一樣不去重)
+benchmark 的 legacy_scan 保留原本 get_social_links 的 if/elif 判斷與 all_a_tags 計數，用來確認結果沒有改變。
+
+用法 (需要 Chrome；比較舊的逐元素方式與索引方式的耗時，並確認結果相同):
+    python anchor_index.py https://www.patreon.com/xxx https://www.patreon.com/yyy --headless
+"""
+import argparse
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from csv_schema import SOCIAL_PLATFORMS
+
+PATREON_PREFIX = "https://www.patreon.com/"
+
+# a.href 為瀏覽器解析後的絕對網址，與 Selenium get_attribute('href') 相同；SVG 的 <a> 退回屬性值
+ANCHOR_HREFS_JS = """
+    return Array.from(document.querySelectorAll('a[href]'), function (a) {
+        return typeof a.href === 'string' ? a.href : a.getAttribute('href');
+    });
+"""
+
+# 建立索引後在 window 上留下記號；重新整理或導航後 window 被替換，記號消失，
+# 藉此判斷快取的索引是否仍屬於目前的文件 (同一網址重新載入也會失效)
+DOCUMENT_TOKEN_JS = "return window.__anchorIndexToken || null;"
+MARK_DOCUMENT_JS = "window.__anchorIndexToken = arguments[0];"
+
+# 判斷順序即優先順序 (一個 href 只歸給第一個符合的平台)；比對對象為小寫的 href
+SOCIAL_PATTERNS: List[Tuple[str, Pattern[str]]] = [
+    ("facebook", re.compile(r"facebook\.com")),
+    ("twitter", re.compile(r"twitter\.com|x\.com")), # 與原本的子字串判斷一致 (也會符合 netflix.com 等)
+    ("instagram", re.compile(r"instagram\.com")),
+    ("youtube", re.compile(r"youtube\.com/(?:channel/|user/|@)")), # 避免把嵌入影片、圖片當成頻道
+    ("twitch", re.compile(r"twitch\.tv")),
+    ("discord", re.compile(r"discord\.gg|discord\.com/invite")),
+    ("tiktok", re.compile(r"tiktok\.com")),
+]
+
+
+def classify_href(href: str) -> Optional[str]:
+    """href -> 社群平台名稱；不是社群連結時返回 None"""
+    href_lower = href.lower()
+    for platform, pattern in SOCIAL_PATTERNS:
+        if pattern.search(href_lower):
+            return platform
+    return None
+
+
+def is_external(href: Optional[str]) -> bool:
+    return bool(href and href.strip()) and not href.startswith("#") and not href.startswith(PATREON_PREFIX)
+
+
+class AnchorIndex:
+    """
+    一個頁面的 href 索引。
+
+    Args:
+        hrefs: 頁面上所有 <a href> 的 href (依文件順序，可重複)。
+    """
+
+    def __init__(self, hrefs: Sequence[Optional[str]]):
+        self.counts: Counter = Counter(h for h in hrefs if h)
+        self.anchor_count = len(hrefs)
+        self.platforms: Dict[str, str] = {p: "no" for p in SOCIAL_PLATFORMS}
+        self.platform_hrefs: Dict[str, str] = {}
+        for href in self.counts: # Counter 保留第一次出現的順序
+            if href.startswith(PATREON_PREFIX):
+                continue
+            platform = classify_href(href)
+            if platform and platform not in self.platform_hrefs:
+                self.platforms[platform] = "yes"
+                self.platform_hrefs[platform] = href
+        self.total_links = sum(n for href, n in self.counts.items() if is_external(href))
+
+    @classmethod
+    def from_driver(cls, driver) -> "AnchorIndex":
+        """以一次 execute_script 建立索引"""
+        return cls(driver.execute_script(ANCHOR_HREFS_JS) or [])
+
+    @property
+    def social_link_count(self) -> int:
+        return len(self.platform_hrefs)
+
+    def social_links(self) -> Dict[str, Any]:
+        """與 get_social_links 相同格式: 各平台 'yes'/'no' 與 social_link_count"""
+        result: Dict[str, Any] = dict(self.platforms)
+        result["social_link_count"] = self.social_link_count
+        return result
+
+
+# 原本 get_social_links 使用的區域與連結選擇器 (只供 legacy_scan 使用)
+_LEGACY_SOCIAL_LINK_AREA = "//div[@data-testid='creator-profile-social-links'] | //section[contains(@aria-label,'Social')] | //body"
+_LEGACY_SOCIAL_LINK = ".//a[@href]"
+
+
+def legacy_social_links(driver) -> Dict[str, Any]:
+    """原本 get_social_links 的逐元素判斷 (if/elif 子字串比對)，與 AnchorIndex 的結果互相獨立"""
+    from selenium.webdriver.common.by import By
+    social_platforms = {'facebook': 'no', 'twitter': 'no', 'instagram': 'no', 'youtube': 'no', 'twitch': 'no', 'tiktok': 'no', 'discord': 'no'}
+    social_link_count = 0
+    processed_links = set()
+
+    areas = driver.find_elements(By.XPATH, _LEGACY_SOCIAL_LINK_AREA)
+    links = (areas[0] if areas else driver).find_elements(By.XPATH, _LEGACY_SOCIAL_LINK)
+    for link in links:
+        try:
+            href = link.get_attribute('href')
+            if href and href not in processed_links and not href.startswith(PATREON_PREFIX):
+                href_lower = href.lower()
+                platform_found = None
+                if 'facebook.com' in href_lower: platform_found = 'facebook'
+                elif 'twitter.com' in href_lower or 'x.com' in href_lower: platform_found = 'twitter'
+                elif 'instagram.com' in href_lower: platform_found = 'instagram'
+                elif 'youtube.com/channel/' in href_lower or 'youtube.com/user/' in href_lower or 'youtube.com/@' in href_lower: platform_found = 'youtube'
+                elif 'twitch.tv' in href_lower: platform_found = 'twitch'
+                elif 'discord.gg' in href_lower or 'discord.com/invite' in href_lower: platform_found = 'discord'
+                elif 'tiktok.com' in href_lower: platform_found = 'tiktok'
+
+                if platform_found and social_platforms[platform_found] == 'no':
+                    social_platforms[platform_found] = 'yes'
+                    social_link_count += 1
+                    processed_links.add(href)
+        except Exception:
+            continue
+
+    social_platforms['social_link_count'] = social_link_count
+    return social_platforms
+
+
+def legacy_total_links(driver) -> int:
+    """原本 scrape_url 中 all_a_tags 的外部連結計數"""
+    from selenium.webdriver.common.by import By
+    external_links_count = 0
+    for link_element in driver.find_elements(By.TAG_NAME, "a"):
+        try:
+            href = link_element.get_attribute('href')
+            if href and href.strip() and not href.startswith("#") and not href.startswith(PATREON_PREFIX):
+                external_links_count += 1
+        except Exception:
+            continue
+    return external_links_count
+
+
+def legacy_scan(driver) -> Tuple[Dict[str, Any], int]:
+    """原本的逐元素方式 (每個 <a> 各呼叫一次 get_attribute)，只供 benchmark 比對"""
+    return legacy_social_links(driver), legacy_total_links(driver)
+
+
+def benchmark(driver, url: str) -> Dict[str, Any]:
+    """載入 url 後比較兩種方式的耗時與結果"""
+    driver.get(url)
+    time.sleep(3) # 等待主頁內容渲染
+    start = time.perf_counter()
+    legacy_social, legacy_total = legacy_scan(driver)
+    legacy_s = time.perf_counter() - start
+    start = time.perf_counter()
+    index = AnchorIndex.from_driver(driver)
+    index_s = time.perf_counter() - start
+    return {
+        "url": url,
+        "anchors": index.anchor_count,
+        "unique_hrefs": len(index.counts),
+        "legacy_s": legacy_s,
+        "index_s": index_s,
+        "match": legacy_social == index.social_links() and legacy_total == index.total_links,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="比較逐元素連結掃描與單次 script 連結索引")
+    parser.add_argument("urls", nargs="+", help="連結多的創作者頁面")
+    parser.add_argument("--headless", action="store_true")
+    args = parser.parse_args()
+
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    from browser_profiles import build_chrome_options
+
+    chrome = webdriver.Chrome(service=Service(ChromeDriverManager().install()),
+                              options=build_chrome_options("standard", args.headless))
+    try:
+        print(f"{'URL':<45}{'<a>':>6}{'去重':>6}{'逐元素 (秒)':>12}{'索引 (秒)':>10}{'加速':>8}  結果一致")
+        for target in args.urls:
+            r = benchmark(chrome, target)
+            speedup = r["legacy_s"] / r["index_s"] if r["index_s"] else float("inf")
+            print(f"{r['url'][:44]:<45}{r['anchors']:>6}{r['unique_hrefs']:>6}{r['legacy_s']:>12.2f}"
+                  f"{r['index_s']:>10.3f}{speedup:>7.0f}x  {'是' if r['match'] else '否'}")
+    finally:
+        chrome.quit()
@@ -0,0 +1,169 @@
+"""
+Chrome 啟動設定 (browser profile)。
+
+    standard  原本的設定: 完整 Chrome、1920×1080、最大化 (已去除重複的參數)
+    lean      每個 worker 用最少記憶體: 有 chrome-headless-shell 時優先使用，
+              較小的視窗，關閉背景網路、同步、元件更新、翻譯等用不到的子系統，並不載入圖片
+
+chrome-headless-shell 的位置依序從環境變數 CHROME_HEADLESS_SHELL、PATH、
+以及 ~/.cache/selenium 下 Selenium Manager 的下載目錄尋找；找不到時 lean 退回一般 Chrome 的 --headless=new。
+
+用法:
+    python browser_profiles.py --compare https://www.patreon.com/xxx   # 比較各設定的啟動時間與記憶體
+"""
+import argparse
+import glob
+import logging
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+
+from selenium.webdriver.chrome.options import Options
+
+log_driver = logging.getLogger("scraper.driver")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+
+BROWSER_PROFILES: Dict[str, Dict] = {
+    "standard": {
+        "window_size": (1920, 1080),
+        "args": [
+            "--disable-gpu",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--start-maximized", # 嘗試最大化視窗
+            "--disable-infobars",
+            "--disable-extensions",
+        ],
+        "prefs": {},
+        "use_headless_shell": False,
+    },
+    "lean": {
+        "window_size": (1280, 800), # 仍為桌面版排版
+        "args": [
+            "--disable-gpu",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-sync",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-domain-reliability",
+            "--disable-client-side-phishing-detection",
+            "--disable-breakpad",
+            "--disable-hang-monitor",
+            "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,InterestFeedContentSuggestions",
+            "--metrics-recording-only",
+            "--no-first-run",
+            "--mute-audio",
+            "--password-store=basic",
+            "--renderer-process-limit=2",
+        ],
+        # 不載入圖片 (爬取只依賴 DOM 文字與屬性)
+        "prefs": {"profile.managed_default_content_settings.images": 2},
+        "use_headless_shell": True,
+    },
+}
+
+
+def find_headless_shell() -> Optional[str]:
+    """尋找 chrome-headless-shell 執行檔；找不到時返回 None"""
+    env_path = os.environ.get("CHROME_HEADLESS_SHELL")
+    if env_path and os.path.isfile(env_path):
+        return env_path
+    for name in ("chrome-headless-shell", "chrome-headless-shell.exe"):
+        found = shutil.which(name)
+        if found:
+            return found
+    pattern = os.path.join(os.path.expanduser("~"), ".cache", "selenium", "chrome-headless-shell", "*", "*", "*",
+                           "chrome-headless-shell*")
+    candidates = sorted(p for p in glob.glob(pattern) if os.path.isfile(p) and not p.endswith(".zip"))
+    return candidates[-1] if candidates else None
+
+
+def build_chrome_options(profile: str = "standard", headless: bool = True,
+                         disk_cache_dir: Optional[str] = None, disk_cache_size_mb: Optional[int] = None,
+                         user_data_dir: Optional[str] = None) -> Options:
+    """
+    依 profile 建立 Chrome Options。
+
+    Args:
+        disk_cache_dir: 共用的 HTTP 磁碟快取目錄；同一台機器上依序啟動的工作階段 (批次、重啟) 共用
+            Patreon 的 JS / CSS / 字型，不必每次重新下載。
+        disk_cache_size_mb: 磁碟快取上限 (MB)。
+        user_data_dir: 持久化的 profile 目錄 (含快取與 cookies)；Chrome 會鎖定此目錄，
+            同時執行的 worker 必須各用一個目錄。
+    """
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"未知的 browser profile: {profile!r} (可用: {list(BROWSER_PROFILES)})")
+    spec = BROWSER_PROFILES[profile]
+
+    chrome_options = Options()
+    chrome_options.page_load_strategy = 'eager'
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    width, height = spec["window_size"]
+    chrome_options.add_argument(f"--window-size={width},{height}")
+    for arg in dict.fromkeys(spec["args"]): # 保留順序並去除重複
+        chrome_options.add_argument(arg)
+    # 設置語言偏好，可能影響頁面文本
+    chrome_options.add_experimental_option('prefs', {'intl.accept_languages': 'en,en_US', **spec["prefs"]})
+
+    if user_data_dir:
+        os.makedirs(user_data_dir, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+        log_driver.info(f"[{profile}] 使用持久化 profile 目錄: {user_data_dir}")
+    if disk_cache_dir:
+        os.makedirs(disk_cache_dir, exist_ok=True)
+        chrome_options.add_argument(f"--disk-cache-dir={os.path.abspath(disk_cache_dir)}")
+        log_driver.info(f"[{profile}] 使用共用磁碟快取: {disk_cache_dir}")
+    if disk_cache_size_mb:
+        chrome_options.add_argument(f"--disk-cache-size={int(disk_cache_size_mb) * 1024 * 1024}")
+
+    if headless:
+        shell = find_headless_shell() if spec["use_headless_shell"] else None
+        if shell:
+            chrome_options.binary_location = shell
+            log_driver.info(f"[{profile}] 使用 chrome-headless-shell: {shell}，視窗 {width}×{height}")
+        else:
+            chrome_options.add_argument("--headless=new")
+            log_driver.info(f"[{profile}] 啟用新版無頭模式 (--headless=new) 並固定視窗 {width}×{height}")
+    return chrome_options
+
+
+def profile_args(profile: str) -> List[str]:
+    """某個 profile 實際傳給 Chrome 的參數 (除錯用)"""
+    return list(build_chrome_options(profile, headless=False).arguments)
+
+
+if __name__ == "__main__":
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    from browser_watchdog import MemoryWatchdog
+
+    parser = argparse.ArgumentParser(description="比較各 browser profile 的啟動時間與記憶體")
+    parser.add_argument("--compare", metavar="URL", required=True, help="載入此頁面後量測 RSS")
+    parser.add_argument("--profiles", nargs="+", default=list(BROWSER_PROFILES), choices=list(BROWSER_PROFILES))
+    parser.add_argument("--no-headless", action="store_true")
+    args = parser.parse_args()
+
+    watchdog = MemoryWatchdog()
+    driver_path = ChromeDriverManager().install()
+    print(f"{'profile':<10} {'啟動(秒)':>10} {'載入(秒)':>10} {'RSS(MB)':>10}")
+    for name in args.profiles:
+        start = time.perf_counter()
+        driver = webdriver.Chrome(service=Service(driver_path), options=build_chrome_options(name, not args.no_headless))
+        startup = time.perf_counter() - start
+        try:
+            start = time.perf_counter()
+            driver.get(args.compare)
+            load = time.perf_counter() - start
+            time.sleep(2)
+            rss = watchdog.sample_mb(driver)
+        finally:
+            driver.quit()
+        rss_text = f"{rss:.0f}" if rss is not None else "N/A"
+        print(f"{name:<10} {startup:>10.2f} {load:>10.2f} {rss_text:>10}")
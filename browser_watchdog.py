@@ -0,0 +1,65 @@
+"""
+Chrome 記憶體監控。
+
+在兩個 URL 之間取樣 chromedriver 及其所有子行程 (Chrome 瀏覽器、renderer、GPU 等)
+的 RSS 總和；超過門檻時由爬蟲重啟瀏覽器工作階段 (見 PatreonScraperRefactored.restart_driver)。
+
+需要 psutil；未安裝時監控自動停用，爬蟲照常執行。
+"""
+from typing import Optional
+
+try:
+    import psutil
+except ImportError: # psutil 為選用套件
+    psutil = None
+
+
+class MemoryWatchdog:
+    """
+    監控 WebDriver 行程樹的記憶體用量。
+
+    Args:
+        limit_mb: RSS 門檻 (MB)；None 或 <= 0 表示只取樣不重啟。
+    """
+
+    def __init__(self, limit_mb: Optional[float] = None):
+        self.limit_mb = limit_mb if limit_mb and limit_mb > 0 else None
+        self.enabled = psutil is not None
+        self.peak_mb = 0.0
+        if not self.enabled:
+            print("未安裝 psutil，Chrome 記憶體監控已停用 (pip install psutil)。")
+
+    @staticmethod
+    def driver_pid(driver) -> Optional[int]:
+        """取得 chromedriver 行程的 PID"""
+        try:
+            return driver.service.process.pid
+        except AttributeError:
+            return None
+
+    def sample_mb(self, driver) -> Optional[float]:
+        """返回 chromedriver 與所有子行程的 RSS 總和 (MB)；無法取得時返回 None"""
+        if not self.enabled:
+            return None
+        pid = self.driver_pid(driver)
+        if pid is None:
+            return None
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+
+        total = 0
+        for proc in processes:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error: # 行程可能在取樣期間結束
+                continue
+        rss_mb = total / (1024 * 1024)
+        self.peak_mb = max(self.peak_mb, rss_mb)
+        return rss_mb
+
+    def over_limit(self, rss_mb: Optional[float]) -> bool:
+        """RSS 是否超過門檻"""
+        return self.limit_mb is not None and rss_mb is not None and rss_mb > self.limit_mb
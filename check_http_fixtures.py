@@ -0,0 +1,66 @@
+"""
+以存檔的創作者頁面檢查 http_engine.parse_creator_page 的解析結果。
+
+__NEXT_DATA__ / window.patreon.bootstrap 的結構改變時，正規表示式與 campaign 搜尋會默默地
+少解析欄位 (HttpEngine 只會退回瀏覽器)，這裡把每個 fixture 的預期欄位值寫死在 expected.json:
+    next_data.html          Next.js 頁面 (公開收入、付費 / 免費會員、未發布的方案)
+    legacy_bootstrap.html   舊版 window.patreon.bootstrap 頁面
+    hidden_earnings.html    隱藏收入與贊助人數 (方案物件的 patron_count 為 0，預檢不可因此丟棄)
+    zero_patrons.html       0 贊助人 (只有系統 reward)
+    no_post_count.html      沒有 creation_count (靜態內容須交給 Selenium，不可記為 0 篇)
+"fields" 中的欄位必須完全相同，"absent" 中的欄位不可出現，
+"covered_stages" 為 HTTP 結果可取代的 scrape_url 階段 (見 http_engine.covered_stages)。
+
+用法 (全部通過時 exit code 為 0):
+    python check_http_fixtures.py
+    python check_http_fixtures.py --fixtures-dir fixtures/http_engine
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+from http_engine import covered_stages, parse_creator_page
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "http_engine")
+
+
+def check_fixture(path: str, expected: Dict[str, Any]) -> List[str]:
+    """返回與預期不符之處；空清單表示通過"""
+    with open(path, "r", encoding="utf-8") as f:
+        parsed = parse_creator_page(f.read())
+    if parsed is None:
+        return ["找不到 campaign 資料"]
+    problems = []
+    for field, value in expected.get("fields", {}).items():
+        if field not in parsed:
+            problems.append(f"{field}: 未解析到 (預期 {value!r})")
+        elif parsed[field] != value:
+            problems.append(f"{field}: 解析為 {parsed[field]!r}，預期 {value!r}")
+    for field in expected.get("absent", []):
+        if field in parsed:
+            problems.append(f"{field}: 不應出現，卻解析為 {parsed[field]!r}")
+    if "covered_stages" in expected and sorted(covered_stages(parsed)) != sorted(expected["covered_stages"]):
+        problems.append(f"covered_stages: 為 {sorted(covered_stages(parsed))}，預期 {sorted(expected['covered_stages'])}")
+    return problems
+
+
+def check_all(fixtures_dir: str = DEFAULT_FIXTURES_DIR) -> bool:
+    with open(os.path.join(fixtures_dir, "expected.json"), "r", encoding="utf-8") as f:
+        expectations = json.load(f)
+    ok = True
+    for name, expected in expectations.items():
+        problems = check_fixture(os.path.join(fixtures_dir, name), expected)
+        print(f"{'通過' if not problems else '失敗'}: {name}")
+        for problem in problems:
+            print(f"  {problem}")
+        ok = ok and not problems
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="以存檔的頁面檢查 HTTP 引擎的解析結果")
+    parser.add_argument("--fixtures-dir", default=DEFAULT_FIXTURES_DIR)
+    args = parser.parse_args()
+    sys.exit(0 if check_all(args.fixtures_dir) else 1)
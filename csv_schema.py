@@ -0,0 +1,50 @@
+"""
+爬蟲輸出 CSV 的欄位定義。
+
+Ver16.py 寫出 CSV 時使用 FIELDNAMES；匯入與分析腳本以同一份定義
+把歷史檔案對齊到目前的欄位結構。
+"""
+from typing import Dict, List
+
+# 目前爬蟲輸出的完整欄位 (順序即 CSV 欄位順序)
+FIELDNAMES: List[str] = [
+    'URL', 'creator_name', 'total_post', 'patreon_number', 'income_per_month',
+    'tier_post_data', 'post_year_count', 'tier_count', 'total_links',
+    'facebook', 'twitter', 'instagram', 'youtube', 'twitch', 'tiktok', 'discord', 'social_link_count',
+    'text_posts', 'image_posts', 'video_posts', 'podcast_posts', 'audio_posts',
+    'link_posts', 'poll_posts', 'livestream_posts', 'other_posts', 'unknown',
+    'public_likes', 'public_comments', 'locked_likes', 'locked_comments',
+    'total_likes_combined', 'total_comments_combined', 'free_chat_count', 'paid_chat_count',
+    'membership_tier_count', 'membership_tiers_json', 'about_word_count',
+    'about_total_members', 'about_paid_members',
+]
+
+# yes/no 社群平台欄位
+SOCIAL_PLATFORMS: List[str] = ['facebook', 'twitter', 'instagram', 'youtube', 'twitch', 'tiktok', 'discord']
+
+# 文章類型計數欄位
+POST_TYPE_COLUMNS: List[str] = [
+    'text_posts', 'image_posts', 'video_posts', 'podcast_posts', 'audio_posts',
+    'link_posts', 'poll_posts', 'livestream_posts', 'other_posts', 'unknown',
+]
+
+# 原始計數欄位 (整數語意；精簡 dtype 時可轉為 int32)
+COUNT_COLUMNS: List[str] = [
+    'total_post', 'patreon_number', 'tier_count', 'total_links', 'social_link_count',
+] + POST_TYPE_COLUMNS + [
+    'public_likes', 'public_comments', 'locked_likes', 'locked_comments',
+    'total_likes_combined', 'total_comments_combined', 'free_chat_count', 'paid_chat_count',
+    'membership_tier_count', 'about_word_count', 'about_total_members', 'about_paid_members',
+]
+
+# 以字串形式保存的欄位 (其餘皆為數值)
+TEXT_COLUMNS: List[str] = ['URL', 'creator_name', 'tier_post_data', 'post_year_count',
+                           'membership_tiers_json'] + SOCIAL_PLATFORMS
+
+# 舊版 CSV 曾使用過的欄位名稱 -> 目前的欄位名稱
+LEGACY_COLUMN_ALIASES: Dict[str, str] = {
+    'monthly_income_element': 'income_per_month',
+    'monthly_income_income': 'income_per_month',
+    'total_likes': 'total_likes_combined',
+    'total_comments': 'total_comments_combined',
+}
@@ -0,0 +1,80 @@
+"""
+跨快照的一階差分 / 週成長率 / 落後值快取。
+
+對一組快照只計算一次所有數值欄位的:
+    delta_<col>   本週 - 上週 (等同 groupby("creator_name")[col].diff())
+    growth_<col>  週成長率 delta / |上週值| (上週為 0 時為 NaN)
+    lag1_<col>    上週值
+結果以各快照檔案的內容雜湊為鍵存放在 .analysis_cache/deltas，
+任何一個快照改動 (或換一組快照) 時才會重新計算；模型與繪圖直接讀取這些欄位。
+
+用法:
+    from delta_cache import build_delta_panel
+    df_long, df_panel = build_delta_panel(["patreon_data_w1.csv", "patreon_data_w2.csv"])
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analysis_cache import combined_digest, file_digest, load_or_build
+from panel_builder import balanced_panel, build_panel
+
+# 計算方式改變時調整版本號，讓舊快取失效
+DELTA_CACHE_VERSION = "deltas-v3"
+
+_EXCLUDED_COLS = {"week"}
+
+
+def delta_source_columns(df: pd.DataFrame) -> List[str]:
+    """需要計算差分的欄位: 所有數值欄位 (布林社群欄位與 week 除外)"""
+    return [
+        c for c in df.columns
+        if c not in _EXCLUDED_COLS
+        and pd.api.types.is_numeric_dtype(df[c])
+        and df[c].dtype != bool
+        and not c.startswith(("delta_", "growth_", "lag1_"))
+    ]
+
+
+def add_deltas(df_long: pd.DataFrame, cols: Optional[Sequence[str]] = None, compact: bool = False) -> pd.DataFrame:
+    """
+    依 (creator_name, week) 排序後，一次計算所有欄位的落後值、差分與成長率。
+
+    Args:
+        df_long: 含 creator_name 與 week 欄位的長表 (panel_builder.build_panel 的第一個返回值)。
+        cols: 要計算的欄位；None 表示所有數值欄位。
+        compact: 以 float32 計算並存放衍生欄位 (與 compact_dtypes 一致)，否則為 float64。
+    """
+    cols = list(cols) if cols is not None else delta_source_columns(df_long)
+    df = df_long.sort_values(["creator_name", "week"], kind="stable").reset_index(drop=True)
+
+    current = df[cols].astype(np.float32 if compact else np.float64)
+    lagged = current.groupby(df["creator_name"], sort=False, observed=True).shift(1)
+    delta = current - lagged
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = delta / lagged.abs().replace(0, np.nan)
+
+    derived = pd.concat([
+        lagged.add_prefix("lag1_"),
+        delta.add_prefix("delta_"),
+        growth.add_prefix("growth_"),
+    ], axis=1)
+    return pd.concat([df, derived], axis=1)
+
+
+def build_delta_panel(paths: Sequence[str], compact: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    讀入快照、完成特徵工程並加上差分欄位；結果依快照內容快取。
+
+    Returns:
+        (df_long, df_panel): 含 delta_/growth_/lag1_ 欄位的長表與平衡面板。
+    """
+    key = combined_digest([file_digest(p) for p in paths] + [f"compact={compact}", DELTA_CACHE_VERSION])
+
+    def _build() -> Tuple[pd.DataFrame, pd.DataFrame]:
+        df_long, _ = build_panel(paths, compact=compact)
+        df_long = add_deltas(df_long, compact=compact)
+        return df_long, balanced_panel(df_long, n_weeks=len(paths))
+
+    return load_or_build("deltas", key, _build)
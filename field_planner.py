@@ -0,0 +1,130 @@
+"""
+依需要的 CSV 欄位決定 scrape_url 要執行哪些階段 (Ver16.py --fields)。
+
+每個階段對應它能產生的欄位，以及它需要的頁面 (主頁 / 關於頁 / 方案頁 / 篩選視窗 / Chats 頁)。
+只要求部分欄位時，planner 找出最少的階段與導航；未要求的欄位在 CSV 中寫成 NOT_COLLECTED (空白)，
+而不是被 _prepare_row_data 補成 0，避免被誤認為真實的 0。
+
+用法:
+    python field_planner.py --fields about_word_count,facebook,discord
+    python field_planner.py --fields social_links,chats      # 也可直接寫階段名稱
+"""
+import argparse
+from typing import Dict, Iterable, List, Optional, Set
+
+from csv_schema import FIELDNAMES, POST_TYPE_COLUMNS, SOCIAL_PLATFORMS
+
+# 寫入未收集欄位的值 (snapshot_store 會把空白轉成 NULL)
+NOT_COLLECTED = ""
+
+# 階段 -> 產生的欄位 (依 scrape_url 中的執行順序)
+STAGE_FIELDS: Dict[str, List[str]] = {
+    "static_content": ["URL", "creator_name", "total_post", "income_per_month"],
+    "about_page": ["about_total_members", "about_paid_members", "about_word_count", "patreon_number"],
+    "social_links": SOCIAL_PLATFORMS + ["social_link_count"],
+    "membership_tiers": ["membership_tier_count", "membership_tiers_json"],
+    "post_tiers": ["tier_post_data", "tier_count"],
+    "post_filters": POST_TYPE_COLUMNS + ["post_year_count"],
+    "social_values": ["public_likes", "public_comments", "locked_likes", "locked_comments",
+                      "total_likes_combined", "total_comments_combined"],
+    "link_census": ["total_links"],
+    "chats": ["free_chat_count", "paid_chat_count"],
+}
+
+# 階段 -> 必須先執行的階段
+STAGE_DEPENDENCIES: Dict[str, List[str]] = {
+    "chats": ["chat_tab_check"],
+}
+
+# 每個 URL 一定執行的階段 (載入頁面、年齡驗證、0 贊助人判斷需要 static_content)
+ALWAYS_STAGES = ("page_load", "age_verification", "static_content")
+
+# 會離開主頁的階段與其目的頁面
+STAGE_VIEWS: Dict[str, str] = {
+    "about_page": "/about",
+    "membership_tiers": "方案頁 / 彈窗",
+    "post_filters": "篩選視窗",
+    "chats": "/chats",
+}
+
+FIELD_STAGE: Dict[str, str] = {field: stage for stage, fields in STAGE_FIELDS.items() for field in fields}
+
+
+def parse_fields(spec: str) -> List[str]:
+    """
+    解析以逗號分隔的欄位或階段名稱 (階段名稱代表該階段的所有欄位)。
+
+    Raises:
+        ValueError: 有未知的名稱。
+    """
+    fields: List[str] = []
+    unknown = []
+    for name in (part.strip() for part in spec.split(",")):
+        if not name:
+            continue
+        if name in STAGE_FIELDS:
+            fields.extend(STAGE_FIELDS[name])
+        elif name in FIELD_STAGE:
+            fields.append(name)
+        else:
+            unknown.append(name)
+    if unknown:
+        raise ValueError(f"未知的欄位 / 階段: {', '.join(unknown)}；可用的階段: {', '.join(STAGE_FIELDS)}")
+    return fields
+
+
+class ScrapePlan:
+    """
+    一次爬取要執行的階段。
+
+    Args:
+        fields: 需要的 CSV 欄位；None 表示全部 (不跳過任何階段)。
+    """
+
+    def __init__(self, fields: Optional[Iterable[str]] = None):
+        requested = set(FIELDNAMES if fields is None else fields) | {"URL", "creator_name"}
+        self.fields: List[str] = [f for f in FIELDNAMES if f in requested]
+        self.stages: Set[str] = set(ALWAYS_STAGES)
+        for field in self.fields:
+            self.stages.add(FIELD_STAGE[field])
+        for stage in list(self.stages):
+            self.stages.update(STAGE_DEPENDENCIES.get(stage, []))
+        # 已執行的階段產生的欄位都一併寫出 (不需要額外成本)
+        collected = {f for stage in self.stages for f in STAGE_FIELDS.get(stage, [])}
+        self.not_collected: List[str] = [f for f in FIELDNAMES if f not in collected]
+
+    @property
+    def is_full(self) -> bool:
+        return not self.not_collected
+
+    def wants(self, stage: str) -> bool:
+        """是否需要執行某個階段"""
+        return stage in self.stages
+
+    def skipped_stages(self) -> List[str]:
+        return [stage for stage in STAGE_FIELDS if stage not in self.stages]
+
+    def describe(self) -> str:
+        run = [stage for stage in STAGE_FIELDS if stage in self.stages]
+        views = [STAGE_VIEWS[s] for s in run if s in STAGE_VIEWS]
+        skipped_views = [STAGE_VIEWS[s] for s in self.skipped_stages() if s in STAGE_VIEWS]
+        lines = [
+            f"欄位: {len(self.fields)}/{len(FIELDNAMES)} 個 -> 執行階段: {', '.join(run)}",
+            f"  離開主頁的導航: {', '.join(views) or '無'}",
+        ]
+        if self.skipped_stages():
+            lines.append(f"  略過階段: {', '.join(self.skipped_stages())} (省下導航: {', '.join(skipped_views) or '無'})")
+            lines.append(f"  不收集的欄位 ({len(self.not_collected)} 個) 將留空")
+        return "\n".join(lines)
+
+
+def plan_for_fields(spec: Optional[str]) -> ScrapePlan:
+    """--fields 參數 -> ScrapePlan；None 或空字串表示全部欄位"""
+    return ScrapePlan(parse_fields(spec) if spec else None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="顯示指定欄位需要的爬取階段與導航")
+    parser.add_argument("--fields", required=True, help="逗號分隔的 CSV 欄位或階段名稱")
+    args = parser.parse_args()
+    print(plan_for_fields(args.fields).describe())
@@ -0,0 +1,203 @@
+"""
+不開瀏覽器的快速路徑: 從創作者頁面 HTML 內嵌的 bootstrap / Next.js JSON 取出資料。
+
+一次 HTTP GET + JSON 解析 (約 100 ms) 就能取得:
+    creator_name, patron_count, total_posts, income_per_month,
+    about_total_members, about_paid_members, about_word_count, membership_tiers
+其餘欄位 (聊天室、文章類型 / 年份 / 方案篩選、按讚留言、社群連結、外部連結數) 需要頁面互動，
+由 Selenium 引擎補齊 (見 PatreonScraperRefactored.scrape_url 的 prefetched 參數)。
+
+用法:
+    python http_engine.py https://www.patreon.com/xxx     # 線上抓取並顯示解析結果
+    python http_engine.py --html saved_page.html          # 解析已存檔的 HTML (檢查頁面結構是否改變)
+    python check_http_fixtures.py                         # 以 fixtures/http_engine 的頁面檢查解析結果
+"""
+import argparse
+import html as html_lib
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+log_http = logging.getLogger("scraper.http")
+
+# 這個引擎能提供的 scrape_url 結果欄位
+HTTP_FIELDS = ("creator_name", "patron_count", "total_posts", "income_per_month",
+               "about_total_members", "about_paid_members", "about_word_count", "membership_tiers")
+
+# scrape_url 的階段 (見 field_planner) -> 以 HTTP 結果取代該階段所需的欄位。
+# 缺少任一欄位時該階段仍交給 Selenium，不以 0 代替；pledge_sum 不在其中，
+# 因為沒有公開收入時 get_static_content 同樣記為 0
+STAGE_HTTP_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "static_content": ("creator_name", "patron_count", "total_posts"),
+    "about_page": ("about_paid_members", "about_word_count"),
+    "membership_tiers": ("membership_tiers",),
+}
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+_LEGACY_BOOTSTRAP_RE = re.compile(r'window\.patreon\.bootstrap\s*=\s*(\{.*?\});\s*\n', re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# 不是真正方案的系統 reward (所有人 / 所有贊助人)
+_SYSTEM_REWARD_IDS = {"-1", "0"}
+
+
+def extract_bootstrap(page_html: str) -> Optional[Any]:
+    """取出頁面內嵌的 JSON (優先 __NEXT_DATA__，其次舊版 window.patreon.bootstrap)"""
+    for pattern in (_NEXT_DATA_RE, _LEGACY_BOOTSTRAP_RE):
+        m = pattern.search(page_html)
+        if not m:
+            continue
+        try:
+            return json.loads(m.group(1))
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def _walk(node: Any) -> Iterator[Dict[str, Any]]:
+    """深度優先走訪 JSON 中所有 dict"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def find_campaign(bootstrap: Any) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    找出 JSON:API 格式的 campaign 物件與其 included 資源。
+
+    Returns:
+        (campaign, included)；找不到 campaign 時為 (None, [])。
+    """
+    fallback = None
+    for node in _walk(bootstrap):
+        data = node.get("data")
+        if isinstance(data, dict) and data.get("type") == "campaign" and isinstance(node.get("included"), list):
+            return data, node["included"]
+        if fallback is None and node.get("type") == "campaign" and isinstance(node.get("attributes"), dict):
+            fallback = node
+    return fallback, []
+
+
+def html_word_count(fragment: Optional[str]) -> int:
+    """去除 HTML 標籤後的字數 (與 Selenium 以 .text.split() 計算的方式一致)"""
+    if not fragment:
+        return 0
+    return len(html_lib.unescape(_TAG_RE.sub(" ", fragment)).split())
+
+
+def _tiers_from_included(included: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    tiers = []
+    for item in included:
+        if item.get("type") not in ("reward", "tier") or str(item.get("id")) in _SYSTEM_REWARD_IDS:
+            continue
+        attrs = item.get("attributes") or {}
+        if attrs.get("published") is False:
+            continue
+        cents = attrs.get("amount_cents")
+        tiers.append({
+            "name": attrs.get("title") or "",
+            "price": float(cents) / 100 if cents is not None else 0.0,
+            "description_word_count": html_word_count(attrs.get("description")),
+            "tier_id": str(item.get("id")),
+        })
+    return tiers
+
+
+def parse_creator_page(page_html: str) -> Optional[Dict[str, Any]]:
+    """
+    從頁面 HTML 解析出 scrape_url 結果的一部分。
+
+    Returns:
+        只含 HTTP_FIELDS 中實際解析到的欄位；找不到 campaign 資料時返回 None。
+    """
+    bootstrap = extract_bootstrap(page_html)
+    if bootstrap is None:
+        return None
+    campaign, included = find_campaign(bootstrap)
+    if not campaign:
+        return None
+    attrs = campaign.get("attributes") or {}
+
+    data: Dict[str, Any] = {}
+    if attrs.get("name"):
+        data["creator_name"] = attrs["name"]
+    if attrs.get("patron_count") is not None:
+        data["patron_count"] = int(attrs["patron_count"])
+    posts = attrs.get("creation_count", attrs.get("post_count"))
+    if posts is not None:
+        data["total_posts"] = int(posts)
+    if attrs.get("pledge_sum") is not None: # 只有公開收入的創作者才有
+        data["income_per_month"] = float(attrs["pledge_sum"]) / 100
+
+    paid = attrs.get("paid_member_count")
+    free = attrs.get("free_member_count")
+    if paid is not None:
+        data["about_paid_members"] = int(paid)
+        if free is not None:
+            data["about_total_members"] = int(paid) + int(free)
+    if "summary" in attrs:
+        data["about_word_count"] = html_word_count(attrs.get("summary"))
+    if included:
+        data["membership_tiers"] = _tiers_from_included(included)
+    return data
+
+
+def covered_stages(data: Optional[Dict[str, Any]]) -> Set[str]:
+    """HTTP 結果已足以取代的 scrape_url 階段"""
+    if not data:
+        return set()
+    return {stage for stage, fields in STAGE_HTTP_FIELDS.items() if all(f in data for f in fields)}
+
+
+class HttpEngine:
+    """以共用連線池抓取創作者頁面並解析內嵌 JSON"""
+
+    def __init__(self, timeout: float = 10.0):
+        from preflight import make_session # requests 只有在使用此引擎時才需要
+        self.session = make_session(pool_size=2)
+        self.timeout = timeout
+
+    def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """抓取並解析；任何失敗 (網路、被擋、頁面結構改變) 都返回 None，由 Selenium 接手"""
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(url, timeout=self.timeout)
+        except Exception as e:
+            log_http.info(f"HTTP 引擎抓取失敗，改用瀏覽器: {e}")
+            return None
+        if resp.status_code != 200:
+            log_http.info(f"HTTP 引擎收到 HTTP {resp.status_code}，改用瀏覽器。")
+            return None
+        data = parse_creator_page(resp.text)
+        elapsed = time.perf_counter() - start
+        if data is None:
+            log_http.info(f"HTTP 引擎找不到內嵌的 campaign 資料 ({elapsed:.2f} 秒)，改用瀏覽器。")
+            return None
+        log_http.info(f"HTTP 引擎取得 {len(data)} 個欄位 ({elapsed:.2f} 秒): {sorted(data)}")
+        return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="從創作者頁面內嵌 JSON 解析資料 (不開瀏覽器)")
+    parser.add_argument("targets", nargs="+", help="創作者 URL，或搭配 --html 的已存檔 HTML 檔")
+    parser.add_argument("--html", action="store_true", help="targets 為本機 HTML 檔")
+    args = parser.parse_args()
+
+    engine = None if args.html else HttpEngine()
+    for target in args.targets:
+        if args.html:
+            with open(target, "r", encoding="utf-8") as f:
+                result = parse_creator_page(f.read())
+        else:
+            result = engine.fetch(target)
+        missing = [field for field in HTTP_FIELDS if result is None or field not in result]
+        print(f"\n=== {target} ===")
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        print(f"未解析到的欄位: {missing}")
@@ -0,0 +1,80 @@
+"""
+每位創作者的頁面版型快取。
+
+get_membership_tiers 依序探測 become_member_button (3 秒)、see_membership_button (3 秒)，
+最後才在主頁直接找方案卡片；文章篩選也要先探測 filter_dialog_toggle_button (3 秒)
+才會退回舊版下拉選單。創作者的版型很少在兩次執行之間改變，
+因此把上次成功的版型記下來，下次先試它，失敗時才依原本順序探測其他版型。
+"""
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# 探測項目 -> 可能的版型 (依原本的探測順序)
+VARIANTS: Dict[str, List[str]] = {
+    "tiers": ["page", "dialog", "inline"], # 新頁面 / 彈窗 / 主頁上的舊版卡片
+    "post_filters": ["dialog", "legacy"],  # 懸浮篩選視窗 / 舊版下拉選單
+}
+
+
+class LayoutCache:
+    """
+    Args:
+        path: JSON 檔路徑；None 表示只在本次執行的記憶體中保存。
+        ttl_days: 記錄的有效天數，過期後依原本順序重新探測。
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_days: float = 30):
+        self.path = path
+        self.ttl = timedelta(days=ttl_days)
+        self.entries: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+                print(f"已載入版型快取 {path}: {len(self.entries)} 位創作者。")
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"讀取版型快取 {path} 失敗，將重新建立: {e}")
+
+    def get(self, url: str, probe: str) -> Optional[str]:
+        """有效期內記錄的版型；沒有記錄時返回 None"""
+        entry = self.entries.get(url, {}).get(probe)
+        if not entry or entry.get("variant") not in VARIANTS[probe]:
+            return None
+        try:
+            seen = datetime.fromisoformat(entry["seen_at"])
+        except (KeyError, ValueError):
+            return None
+        return entry["variant"] if datetime.now() - seen < self.ttl else None
+
+    def order(self, url: str, probe: str) -> List[str]:
+        """探測順序: 記錄的版型在前，其餘依原本順序"""
+        cached = self.get(url, probe)
+        default = VARIANTS[probe]
+        return default if cached is None else [cached] + [v for v in default if v != cached]
+
+    def record(self, url: str, probe: str, variant: str) -> None:
+        """記錄這次成功的版型 (與快取相同時計為命中，不同時計為版型改變)"""
+        cached = self.get(url, probe)
+        if cached == variant:
+            self.hits += 1
+        elif cached is not None:
+            self.misses += 1
+        self.entries.setdefault(url, {})[probe] = {"variant": variant,
+                                                   "seen_at": datetime.now().isoformat(timespec="seconds")}
+
+    def summary(self) -> str:
+        return f"版型快取: 命中 {self.hits} 次、版型改變 {self.misses} 次，共 {len(self.entries)} 位創作者"
+
+    def save(self) -> None:
+        """寫回 JSON 檔 (原子替換)"""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
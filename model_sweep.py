@@ -0,0 +1,239 @@
+"""
+一次載入面板，平行擬合所有 (target, mode) 組合的 FD / FE / RE 模型，並快取結果。
+
+模型設定 (y 與 X) 與 Roadmap.ipynb 原本的 run_model 相同，集中在 MODEL_SPECS。
+快取鍵 = 該模型實際用到的欄位資料雜湊 + 模型設定，資料或設定不變時
+重跑 notebook cell 會直接讀取快取。
+
+用法:
+    from model_sweep import run_sweep
+    results = run_sweep(["patreon_data_w1.csv", ..., "patreon_data_w4.csv"])
+    print(results[("likes", "fe")].summary)
+
+    python model_sweep.py patreon_data_w1.csv patreon_data_w2.csv patreon_data_w3.csv patreon_data_w4.csv
+"""
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from linearmodels.panel import PanelOLS, RandomEffects
+
+from analysis_cache import combined_digest, load_or_build
+from delta_cache import build_delta_panel
+
+# 模型或前處理邏輯改變時調整版本號，讓舊快取失效
+MODEL_CACHE_VERSION = "models-v1"
+
+MODES = ["fd", "fe", "re"]
+TARGETS = ["likes", "comments", "eng_rate", "conversion_rate"]
+
+# FD 模型需要完整差分的欄位 (與 notebook 相同)
+DELTA_COLS = ["total_likes", "total_comments", "weekly_post_count",
+              "social_link_count", "membership_tier_count",
+              "income_per_month", "log_eng_per_post"]
+
+POST_TYPE_Z_COLS = ["text_posts_z", "image_posts_z", "video_posts_z", "audio_posts_z",
+                    "link_posts_z", "poll_posts_z", "podcast_posts_z", "livestream_posts_z"]
+
+# (mode, target) -> (y 欄位, X 欄位)；未列出的組合在 notebook 中也未定義
+MODEL_SPECS: Dict[Tuple[str, str], Tuple[str, List[str]]] = {
+    ("fd", "likes"): ("delta_total_likes",
+                      ["delta_weekly_post_count", "delta_social_link_count", "delta_membership_tier_count"]),
+    ("fd", "comments"): ("delta_total_comments",
+                         ["delta_weekly_post_count", "delta_social_link_count", "delta_membership_tier_count",
+                          "delta_total_likes"]),
+    # notebook 原本引用不存在的 Y_eng_rate_change；依 FE/RE 的 eng_per_post 改為其差分
+    ("fd", "eng_rate"): ("delta_eng_per_post",
+                         ["delta_weekly_post_count", "delta_social_link_count", "delta_membership_tier_count",
+                          "delta_total_likes", "delta_total_comments"]),
+    ("fe", "likes"): ("total_likes",
+                      POST_TYPE_Z_COLS + ["social_link_count", "membership_tier_count"]),
+    ("fe", "conversion_rate"): ("conversion_rate",
+                                ["weekly_post_count", "social_link_count", "membership_tier_count"]),
+    ("fe", "eng_rate"): ("eng_per_post",
+                         POST_TYPE_Z_COLS + ["social_link_count", "membership_tier_count",
+                                             "total_likes", "total_comments"]),
+    ("re", "likes"): ("total_likes",
+                      ["weekly_post_count", "social_link_count", "membership_tier_count"]),
+    ("re", "conversion_rate"): ("conversion_rate",
+                                ["weekly_post_count", "social_link_count", "membership_tier_count"]),
+    ("re", "eng_rate"): ("eng_per_post",
+                         ["weekly_post_count", "social_link_count", "membership_tier_count",
+                          "total_likes", "total_comments"]),
+}
+
+
+def _standardize(X: pd.DataFrame) -> pd.DataFrame:
+    """等同 sklearn StandardScaler (母體標準差，標準差為 0 時不縮放)"""
+    std = X.std(ddof=0).replace(0, 1)
+    return (X - X.mean()) / std
+
+
+def _entities_with_min_obs(tmp: pd.DataFrame, min_obs: int = 2) -> pd.DataFrame:
+    """只保留觀測數 >= min_obs 的創作者 (取代 groupby(...).filter(lambda g: len(g) >= 2))"""
+    codes, _ = pd.factorize(tmp.index.get_level_values("creator_name"))
+    counts = np.bincount(codes[codes >= 0])
+    keep = np.zeros(len(codes), dtype=bool)
+    keep[codes >= 0] = counts[codes[codes >= 0]] >= min_obs
+    return tmp[keep]
+
+
+def fd_frame(df_long: pd.DataFrame) -> pd.DataFrame:
+    """FD 模型使用的資料: 依 (creator, week) 排序後只留下所有 DELTA_COLS 差分皆存在的列"""
+    df_fd = df_long.sort_values(["creator_name", "week"])
+    return df_fd.dropna(subset=[f"delta_{v}" for v in DELTA_COLS])
+
+
+def model_frame(df_long: pd.DataFrame, df_panel: pd.DataFrame, target: str, mode: str) -> pd.DataFrame:
+    """取出某個模型實際使用的 [y] + X 資料 (已去除缺值)"""
+    if (mode, target) not in MODEL_SPECS:
+        raise ValueError(f"未定義的模型組合: mode={mode!r}, target={target!r}")
+    y_col, X_cols = MODEL_SPECS[(mode, target)]
+    if mode == "fd":
+        return fd_frame(df_long)[[y_col] + X_cols].dropna()
+    tmp = df_panel[[y_col] + X_cols].dropna()
+    return _entities_with_min_obs(tmp)
+
+
+def fit_model(df_long: pd.DataFrame, df_panel: pd.DataFrame, target: str = "likes", mode: str = "fd",
+              verbose: bool = False) -> Any:
+    """
+    擬合單一模型 (邏輯與 notebook 原本的 run_model 相同)。
+
+    Args:
+        df_long: delta_cache.build_delta_panel 的長表 (FD 使用)。
+        df_panel: 平衡面板 (FE / RE 使用)。
+        target: 'likes' | 'comments' | 'eng_rate' | 'conversion_rate'
+        mode: 'fd' | 'fe' | 're'
+        verbose: 是否打印模型摘要。
+    """
+    y_col, X_cols = MODEL_SPECS[(mode, target)]
+    tmp = model_frame(df_long, df_panel, target, mode)
+    y = tmp[y_col].astype(np.float64)
+
+    if mode == "fd":
+        X = sm.add_constant(tmp[X_cols].astype(np.float64))
+        res = sm.OLS(y, X).fit()
+        if verbose:
+            print(f"\n=== First-Difference OLS (Y = {y_col}) ===")
+            print(res.summary())
+        return res
+
+    X_scaled = _standardize(tmp[X_cols].astype(np.float64))
+    if mode == "fe":
+        # 刪掉變異數為 0 的欄位
+        X_scaled = X_scaled.drop(columns=X_scaled.columns[X_scaled.std() == 0])
+        res = PanelOLS(y, sm.add_constant(X_scaled), entity_effects=True, drop_absorbed=True) \
+            .fit(cov_type="clustered", cluster_entity=True)
+        title = "Fixed-Effects"
+    else:
+        res = RandomEffects(y, sm.add_constant(X_scaled)).fit(cov_type="clustered", cluster_entity=True)
+        title = "Random-Effects"
+    if verbose:
+        print(f"\n=== {title} (Y = {target}) ===")
+        print(res.summary)
+    return res
+
+
+def model_cache_key(df_long: pd.DataFrame, df_panel: pd.DataFrame, target: str, mode: str) -> str:
+    """由模型實際使用的資料內容與模型設定組成快取鍵"""
+    tmp = model_frame(df_long, df_panel, target, mode)
+    data_hash = hashlib.sha256(pd.util.hash_pandas_object(tmp, index=True).to_numpy().tobytes()).hexdigest()
+    y_col, X_cols = MODEL_SPECS[(mode, target)]
+    return combined_digest([data_hash, mode, target, y_col] + X_cols + [MODEL_CACHE_VERSION])
+
+
+# --- 子行程 ---
+_WORKER_DATA: Dict[str, pd.DataFrame] = {}
+
+
+def _init_worker(df_long: pd.DataFrame, df_panel: pd.DataFrame) -> None:
+    """每個子行程只接收一次面板資料"""
+    _WORKER_DATA["long"] = df_long
+    _WORKER_DATA["panel"] = df_panel
+
+
+def _fit_in_worker(target: str, mode: str, key: str) -> Any:
+    df_long, df_panel = _WORKER_DATA["long"], _WORKER_DATA["panel"]
+    return load_or_build("models", key, lambda: fit_model(df_long, df_panel, target, mode))
+
+
+def run_sweep(paths: Optional[Sequence[str]] = None,
+              targets: Sequence[str] = TARGETS,
+              modes: Sequence[str] = MODES,
+              df_long: Optional[pd.DataFrame] = None,
+              df_panel: Optional[pd.DataFrame] = None,
+              max_workers: Optional[int] = None,
+              verbose: bool = False,
+              raise_errors: bool = False) -> Dict[Tuple[str, str], Any]:
+    """
+    載入一次面板，擬合 targets × modes 中所有已定義的組合。
+
+    Args:
+        paths: 快照 CSV；若已提供 df_long / df_panel 則可省略。
+        targets, modes: 要擬合的組合 (MODEL_SPECS 未定義的組合會略過)。
+        max_workers: 行程池大小；1 表示在目前行程中依序擬合。
+        verbose: 是否打印每個模型的摘要。
+        raise_errors: 擬合失敗時直接拋出原本的異常 (預設只打印並略過該組合)。
+
+    Returns:
+        {(target, mode): 擬合結果}
+    """
+    if df_long is None or df_panel is None:
+        df_long, df_panel = build_delta_panel(paths)
+
+    combos = [(t, m) for m in modes for t in targets if (m, t) in MODEL_SPECS]
+    skipped = [(t, m) for m in modes for t in targets if (m, t) not in MODEL_SPECS]
+    if skipped:
+        print(f"略過未定義的模型組合: {skipped}")
+
+    start = time.perf_counter()
+    keys = {combo: model_cache_key(df_long, df_panel, *combo) for combo in combos}
+    results: Dict[Tuple[str, str], Any] = {}
+
+    if max_workers == 1 or len(combos) <= 1:
+        for target, mode in combos:
+            try:
+                results[(target, mode)] = load_or_build(
+                    "models", keys[(target, mode)], lambda: fit_model(df_long, df_panel, target, mode))
+            except Exception as e:
+                if raise_errors:
+                    raise
+                print(f"模型 {(target, mode)} 擬合失敗: {e}")
+    else:
+        workers = min(max_workers or os.cpu_count() or 1, len(combos))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(df_long, df_panel)) as pool:
+            futures = {combo: pool.submit(_fit_in_worker, combo[0], combo[1], keys[combo]) for combo in combos}
+            for combo, future in futures.items():
+                try:
+                    results[combo] = future.result()
+                except Exception as e:
+                    if raise_errors:
+                        raise
+                    print(f"模型 {combo} 擬合失敗: {e}")
+
+    elapsed = time.perf_counter() - start
+    print(f"模型掃描完成: {len(results)}/{len(combos)} 個模型，耗時 {elapsed:.2f} 秒")
+    if verbose:
+        for (target, mode), res in results.items():
+            print(f"\n=== {mode.upper()} (Y = {target}) ===")
+            print(res.summary() if callable(res.summary) else res.summary)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="平行擬合所有 target × mode 的面板模型")
+    parser.add_argument("paths", nargs="+", help="依時間排序的快照 CSV")
+    parser.add_argument("--targets", nargs="+", default=TARGETS, help="要擬合的 target")
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES, help="要擬合的模式")
+    parser.add_argument("--workers", type=int, default=None, help="行程池大小 (預設為 CPU 核心數)")
+    args = parser.parse_args()
+
+    run_sweep(args.paths, targets=args.targets, modes=args.modes, max_workers=args.workers, verbose=True)
@@ -0,0 +1,202 @@
+"""
+爬蟲共用的數字文本解析 (按讚數、留言數、方案價格、贊助人數等)。
+
+所有正則表達式在模組載入時預先編譯；除了單筆解析，也提供一次處理整個列表的版本。
+支援:
+    - K / M / B 縮寫 ("1.2K", "3.4M patrons", "1.2Kpatrons", "1B")，以及中文的 萬 / 万 / 億 / 亿
+    - 千分位逗號 ("1,234")
+    - 貨幣符號與前後文字 ("$5 / month", "US$3.50", "NT$150")
+找不到數字時返回 None，不會拋出例外。
+
+用法:
+    from number_parsing import parse_number, parse_numbers
+    parse_number("1.2M patrons")       # 1200000.0
+    parse_numbers(["$5", "1,234", ""])  # [5.0, 1234.0, None]
+
+    python number_parsing.py --samples 1000000   # 與舊版輔助函數比較速度
+"""
+import argparse
+import random
+import re
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+# 數字 (可含千分位逗號與小數) + 可選的單位。緊接在數字後的 K/M/B 一律是單位 ("1.2Kpatrons")；
+# 與數字之間有空白時，單位後面不能緊接英文字母，避免把 "5 books" 或 "12 Members" 的首字母當成單位
+_NUMBER_RE = re.compile(
+    r"(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+)"
+    r"(?:([KkMmBb萬万億亿])|\s+([KkMmBb](?![A-Za-z])|[萬万億亿]))?"
+)
+_INTEGER_RE = re.compile(r"\d+")
+_YEAR_RE = re.compile(r"^(\d{4})")
+_PAREN_COUNT_RE = re.compile(r"\((\d+)\)")
+_TRAILING_PAREN_COUNT_RE = re.compile(r"\s*\(\d+\)\s*$")
+
+_MULTIPLIERS = {
+    None: 1, "k": 1_000, "K": 1_000, "m": 1_000_000, "M": 1_000_000, "b": 1_000_000_000, "B": 1_000_000_000,
+    "萬": 10_000, "万": 10_000, "億": 100_000_000, "亿": 100_000_000,
+}
+
+
+def parse_number(text: Optional[str]) -> Optional[float]:
+    """從文本中解析第一個數字，處理 K/M/B、千分位與貨幣符號；沒有數字時返回 None"""
+    if not text:
+        return None
+    m = _NUMBER_RE.search(text)
+    if m is None:
+        return None
+    return float(m.group(1).replace(",", "")) * _MULTIPLIERS[m.group(2) or m.group(3)]
+
+
+def parse_numbers(texts: Iterable[Optional[str]]) -> List[Optional[float]]:
+    """parse_number 的批次版本，一次解析整個列表"""
+    search = _NUMBER_RE.search
+    multipliers = _MULTIPLIERS
+    results: List[Optional[float]] = []
+    append = results.append
+    for text in texts:
+        m = search(text) if text else None
+        if m is None:
+            append(None)
+        else:
+            number, glued, spaced = m.groups()
+            append(float(number.replace(",", "") if "," in number else number) * multipliers[glued or spaced])
+    return results
+
+
+def extract_integer(text: Optional[str]) -> Optional[int]:
+    """從文本中提取第一個整數 (空文本返回 None，沒有數字返回 0)"""
+    if not text:
+        return None
+    m = _INTEGER_RE.search(str(text))
+    return int(m.group()) if m else 0
+
+
+def extract_integers(texts: Iterable[Optional[str]]) -> List[Optional[int]]:
+    """extract_integer 的批次版本"""
+    search = _INTEGER_RE.search
+    results: List[Optional[int]] = []
+    for text in texts:
+        if not text:
+            results.append(None)
+            continue
+        m = search(str(text))
+        results.append(int(m.group()) if m else 0)
+    return results
+
+
+def extract_paren_count(text: Optional[str]) -> Optional[int]:
+    """提取 'Name (Count)' 中括號內的數量；找不到時返回 None"""
+    if not text:
+        return None
+    m = _PAREN_COUNT_RE.search(text)
+    return int(m.group(1)) if m else None
+
+
+def strip_paren_count(text: str) -> str:
+    """移除結尾的 ' (Count)'，例如 'Gold Tier (12)' -> 'Gold Tier'"""
+    return _TRAILING_PAREN_COUNT_RE.sub("", text).strip()
+
+
+def extract_year_and_count(text: str) -> Optional[Tuple[str, int]]:
+    """從 'YYYY (Count)' 格式的文本中提取年份和數量"""
+    year_match = _YEAR_RE.match(text)
+    count_match = _PAREN_COUNT_RE.search(text)
+    if year_match and count_match:
+        return year_match.group(1), int(count_match.group(1))
+    return None
+
+
+# --- 基準測試 ---
+
+def _legacy_parse_number(text: Optional[str]) -> Optional[float]:
+    """Ver16 原本的 parse_number (只處理 K，沒有數字時會拋出 IndexError)"""
+    if not text:
+        return None
+    clean = re.sub(r'[^0-9Kk\.]', '', text)
+    multiplier = 1
+    if clean[-1].lower() == 'k':
+        multiplier = 1_000
+        clean = clean[:-1]
+    try:
+        return float(clean) * multiplier
+    except ValueError:
+        return None
+
+
+def _legacy_extract_integer(text: Optional[str]) -> Optional[int]:
+    """Ver16 原本的 extract_integer"""
+    if not text:
+        return None
+    m = re.findall(r'\d+', str(text))
+    return int(m[0]) if m else 0
+
+
+def _sample_texts(n: int, seed: int = 0) -> List[str]:
+    """產生貼近頁面實際文字的樣本 (按讚數、價格、贊助人數等)"""
+    rng = random.Random(seed)
+    templates = [
+        lambda: str(rng.randint(0, 999)),
+        lambda: f"{rng.randint(1, 999)}.{rng.randint(0, 9)}K",
+        lambda: f"{rng.randint(1, 99)}.{rng.randint(0, 9)}M patrons",
+        lambda: f"{rng.randint(1, 9)},{rng.randint(0, 999):03d} members",
+        lambda: f"${rng.randint(1, 100)}",
+        lambda: f"US${rng.randint(1, 50)}.{rng.randint(0, 99):02d} / month",
+        lambda: f"{rng.randint(1, 999)} Comments",
+        lambda: f"{rng.randint(1, 999)}.{rng.randint(0, 9)}Kpatrons",
+    ]
+    return [rng.choice(templates)() for _ in range(n)]
+
+
+# 必須與舊版結果相同的文字 (單位緊接在數字後、後面還有文字)
+_EQUIVALENCE_CASES = ["1.2K", "1.2Kpatrons", "3Kmembers", "12", "999 Comments", "$5"]
+
+
+def _time_it(label: str, func: Callable[[], object], n: int) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {elapsed:8.3f} 秒  ({n / elapsed / 1e6:6.2f} M 筆/秒)")
+    return elapsed
+
+
+def _safe_legacy(text: str) -> Optional[float]:
+    try:
+        return _legacy_parse_number(text)
+    except IndexError:
+        return None
+
+
+def run_benchmark(n_samples: int = 1_000_000, seed: int = 0) -> None:
+    """比較舊版輔助函數與本模組在 n_samples 筆樣本上的速度與結果差異"""
+    texts = _sample_texts(n_samples, seed)
+    print(f"數字解析基準測試: {n_samples} 筆樣本")
+
+    legacy = _time_it("舊版 parse_number (逐筆)", lambda: [_safe_legacy(t) for t in texts], n_samples)
+    single = _time_it("parse_number (逐筆)", lambda: [parse_number(t) for t in texts], n_samples)
+    batch = _time_it("parse_numbers (批次)", lambda: parse_numbers(texts), n_samples)
+    print(f"  加速: 逐筆 {legacy / single:.2f}x，批次 {legacy / batch:.2f}x")
+
+    legacy_int = _time_it("舊版 extract_integer (findall)", lambda: [_legacy_extract_integer(t) for t in texts], n_samples)
+    new_int = _time_it("extract_integers (批次)", lambda: extract_integers(texts), n_samples)
+    print(f"  加速: {legacy_int / new_int:.2f}x")
+
+    mismatched = [(t, _safe_legacy(t), parse_number(t)) for t in _EQUIVALENCE_CASES
+                  if _safe_legacy(t) != parse_number(t)]
+    print(f"  必須與舊版相同的樣本: {len(_EQUIVALENCE_CASES) - len(mismatched)}/{len(_EQUIVALENCE_CASES)} 筆相同")
+    for text, old, new in mismatched:
+        print(f"    不一致 {text!r}: 舊版 {old} -> 新版 {new}")
+
+    # 結果差異 (舊版會誤判 M 縮寫與數字後的文字)
+    diffs = [(t, o, n) for t, o, n in zip(texts, (_safe_legacy(t) for t in texts), parse_numbers(texts)) if o != n]
+    print(f"  與舊版結果不同的樣本: {len(diffs)} 筆")
+    for text, old, new in diffs[:5]:
+        print(f"    {text!r}: 舊版 {old} -> 新版 {new}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="數字文本解析的基準測試")
+    parser.add_argument("--samples", type=int, default=1_000_000, help="樣本數 (預設 1,000,000)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run_benchmark(args.samples, args.seed)
@@ -0,0 +1,253 @@
+"""
+向量化的面板資料建構，取代 Roadmap.ipynb 中的 load_and_prepare / feature_engineering。
+
+原本的做法是逐檔讀取、逐列 apply(json.loads)、再用 groupby(...).filter(lambda ...)
+篩出完整創作者；這裡一次讀入 N 個快照並以欄位運算完成所有特徵工程，
+會員方案彙總來自 tier_table.py 的快取方案表，
+平衡面板 (creator, week) 也改用 factorize + bincount 的陣列運算建立。
+
+用法:
+    from panel_builder import build_panel, split_weeks
+    df_long, df_panel = build_panel(["patreon_data_w1.csv", "patreon_data_w2.csv"])
+    df_t1, df_t2 = split_weeks(df_long)
+"""
+import sqlite3
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from csv_schema import COUNT_COLUMNS, SOCIAL_PLATFORMS
+from tier_table import explode_frame, load_tier_table, row_aggregates
+
+# 參與標準化與發文總數計算的文章類型 (與 notebook 相同，不含 other_posts / unknown)
+POST_COLS = [
+    "text_posts", "image_posts", "video_posts", "audio_posts",
+    "podcast_posts", "link_posts", "poll_posts", "livestream_posts",
+]
+
+ENGAGEMENT_COLS = ["public_likes", "locked_likes", "public_comments", "locked_comments"]
+
+# 精簡 dtype 時轉為 category 的鍵欄位
+KEY_COLS = ["creator_name", "URL"]
+
+# 精簡 dtype 時可轉為 int32 的欄位 (原始計數與 week)；其餘數值欄位一律 float32
+INT32_COLS = set(COUNT_COLUMNS) | {"week"}
+
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def read_snapshots(paths: Sequence[str]) -> pd.DataFrame:
+    """
+    讀入多個快照 CSV 並直接堆疊成長表，依傳入順序標上 week = 1..N。
+    各檔欄位不一致時取聯集，缺少的欄位為 NaN。
+    """
+    frames = [pd.read_csv(path, encoding="utf-8-sig") for path in paths]
+    df = pd.concat(frames, keys=range(1, len(frames) + 1), names=["week", None])
+    return df.reset_index(level="week").reset_index(drop=True)
+
+
+def read_snapshot_store(db_path: str, days: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    從 snapshot_store.py 建立的 SQLite 資料庫讀取快照，依 snapshot_day 順序標上 week。
+
+    Args:
+        db_path: SQLite 檔案路徑。
+        days: 要讀取的日期 (YYYY-MM-DD)；None 表示全部。
+    """
+    query = "SELECT * FROM snapshots"
+    params: Tuple = ()
+    if days:
+        query += " WHERE snapshot_day IN (%s)" % ", ".join("?" * len(days))
+        params = tuple(days)
+    conn = sqlite3.connect(db_path)
+    try:
+        df = pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
+    df["week"] = pd.factorize(df["snapshot_day"], sort=True)[0] + 1
+    return df
+
+
+def _zscore_by_week(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+    """每個快照內各自標準化 (等同於逐檔使用 StandardScaler，標準差為 0 時視為 1)"""
+    grouped = df.groupby("week", sort=False)[cols]
+    mean = grouped.transform("mean")
+    std = grouped.transform("std", ddof=0).replace(0, 1)
+    return (df[cols] - mean) / std
+
+
+def _tier_aggregates_from_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """沒有來源檔案可快取時 (例如從資料庫讀入)，直接由長表展開方案並彙總"""
+    tiers = explode_frame(df, snapshot="")
+    pos = tiers["row"].to_numpy()
+    tiers["week"] = df["week"].to_numpy()[pos]
+    tiers["row"] = df.groupby("week").cumcount().to_numpy()[pos]
+    return row_aggregates(tiers, keys=("week", "row"))
+
+
+def _attach_tier_features(df: pd.DataFrame, tier_aggs: pd.DataFrame) -> None:
+    """依 (week, 檔內列號) 把方案彙總對回長表；沒有方案的列為 0"""
+    key = pd.MultiIndex.from_arrays([df["week"].to_numpy(), df.groupby("week").cumcount().to_numpy()])
+    values = tier_aggs.reindex(key)
+    df["avg_tier_price"] = values["avg_tier_price"].fillna(0.0).to_numpy()
+    df["avg_desc_wc"] = values["avg_desc_wc"].fillna(0.0).to_numpy()
+
+
+def engineer_features(df: pd.DataFrame, tier_aggs: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    對堆疊後的長表 (需含 week 欄位，且各週內保持來源檔案的列順序) 一次計算所有衍生欄位。
+    欄位定義與 notebook 的 feature_engineering 相同，只是按 week 分組而非逐檔處理。
+
+    Args:
+        df: read_snapshots / read_snapshot_store 的結果。
+        tier_aggs: 以 (week, row) 為索引的方案彙總 (見 tier_table.row_aggregates)；
+                   None 時直接從 membership_tiers_json 展開。
+    """
+    df = df.reset_index(drop=True)
+
+    yn_cols = [c for c in SOCIAL_PLATFORMS if c in df.columns] # 轉換 yes/no 為 0/1
+    for col in yn_cols:
+        if df[col].dtype != bool: # compact_dtypes 已轉為布林時保留
+            df[col] = df[col].astype(str).str.lower().eq("yes").astype(int)
+
+    post_cols = [c for c in POST_COLS if c in df.columns]
+    df[post_cols] = df[post_cols].fillna(0).astype(int)
+    df[[f"{c}_z" for c in post_cols]] = _zscore_by_week(df, post_cols).to_numpy()
+
+    df["weekly_post_count"] = df[post_cols].sum(axis=1) # 每週發文總數
+    # 所有互動總數 (公開/私密)；與 notebook 的 + 串接相同，任一欄缺值時為 NaN
+    df["eng_all"] = df[ENGAGEMENT_COLS].sum(axis=1, min_count=len(ENGAGEMENT_COLS)) + 1
+    df["eng_per_post"] = (np.log(df["eng_all"]) + 1) / (df["weekly_post_count"] + 1)
+
+    df["weekly_post_count_w"] = df["weekly_post_count"]
+    df["log_post"] = np.log1p(df["weekly_post_count_w"])
+    df["log_post_z"] = _zscore_by_week(df, ["log_post"])["log_post"]
+    df["log_post_z_sq"] = df["log_post_z"] ** 2
+
+    df["log_eng_per_post"] = np.log1p(df["eng_per_post"].fillna(0))
+
+    df["total_likes"] = df["public_likes"] + df["locked_likes"]
+    df["total_comments"] = df["public_comments"] + df["locked_comments"]
+    df["conversion_rate"] = np.where(
+        df["about_total_members"] > 0,
+        df["about_paid_members"] / df["about_total_members"],
+        np.nan,
+    )
+
+    if "membership_tiers_json" in df.columns:
+        if tier_aggs is None:
+            tier_aggs = _tier_aggregates_from_frame(df)
+        _attach_tier_features(df, tier_aggs)
+    return df
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    """DataFrame (含索引與字串內容) 實際佔用的記憶體，單位 MB"""
+    return df.memory_usage(deep=True, index=True).sum() / 1024 ** 2
+
+
+def compact_dtypes(df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
+    """
+    把面板欄位轉為精簡的 dtype:
+        - creator_name / URL 轉為 category
+        - 七個 yes/no 社群欄位轉為 bool
+        - INT32_COLS 中的原始計數欄位 (沒有缺值且皆為整數) 轉為 int32，有缺值時為 float32
+        - 其餘數值欄位 (衍生的比率、標準化值、互動指標、方案平均等) 一律轉為 float32，
+          不因某一週的值剛好都是整數而改變 dtype
+    字串型的字典/JSON 欄位維持原樣。
+
+    Args:
+        df: 長表或面板 (索引中的 creator_name 也會一併轉為 category)。
+        verbose: 是否打印轉換前後的記憶體用量。
+    """
+    before = memory_mb(df) if verbose else 0.0
+    df = df.copy()
+
+    for col in KEY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    if isinstance(df.index, pd.MultiIndex) and "creator_name" in df.index.names:
+        level = df.index.names.index("creator_name")
+        df.index = df.index.set_levels(df.index.levels[level].astype("category"), level=level)
+
+    for col in SOCIAL_PLATFORMS:
+        if col in df.columns and df[col].dtype != bool:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = df[col].fillna(0).astype(bool)
+            else:
+                df[col] = df[col].astype(str).str.lower().eq("yes")
+
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == bool or not pd.api.types.is_numeric_dtype(series):
+            continue
+        values = series.to_numpy()
+        if col not in INT32_COLS:
+            df[col] = values.astype(np.float32)
+            continue
+        finite = np.isfinite(values)
+        if (finite.all() and np.array_equal(values, np.round(values))
+                and (len(values) == 0 or (values.min() >= _INT32_MIN and values.max() <= _INT32_MAX))):
+            df[col] = values.astype(np.int32)
+        else:
+            df[col] = values.astype(np.float32)
+
+    if verbose:
+        after = memory_mb(df)
+        saved = (1 - after / before) * 100 if before else 0.0
+        print(f"記憶體用量: {before:.2f} MB -> {after:.2f} MB (節省 {saved:.1f}%)")
+    return df
+
+
+def balanced_panel(df: pd.DataFrame, n_weeks: Optional[int] = None) -> pd.DataFrame:
+    """
+    只保留每一週都恰好出現一次的創作者，回傳以 (creator_name, week) 為索引的面板。
+    以 factorize + bincount 計數，取代 groupby(level=0).filter(lambda g: len(g) == N)。
+    """
+    if n_weeks is None:
+        n_weeks = int(df["week"].nunique())
+    codes, uniques = pd.factorize(df["creator_name"])
+    valid = codes >= 0 # creator_name 為空的列無法建立索引
+    n_creators = len(uniques)
+
+    rows_per_creator = np.bincount(codes[valid], minlength=n_creators)
+    first_of_pair = valid & ~df.duplicated(["creator_name", "week"]).to_numpy()
+    weeks_per_creator = np.bincount(codes[first_of_pair], minlength=n_creators)
+    complete = (rows_per_creator == n_weeks) & (weeks_per_creator == n_weeks)
+
+    keep = valid.copy()
+    keep[valid] = complete[codes[valid]]
+    return df[keep].set_index(["creator_name", "week"]).sort_index()
+
+
+def split_weeks(df_long: pd.DataFrame) -> List[pd.DataFrame]:
+    """把長表依 week 拆回各期的 DataFrame (對應 notebook 的 df_t1, df_t2, ...)"""
+    return [g.reset_index(drop=True) for _, g in df_long.groupby("week", sort=True)]
+
+
+def build_panel(paths: Sequence[str], compact: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    讀入 N 個快照並完成特徵工程。
+
+    Args:
+        paths: 依時間排序的快照 CSV。
+        compact: 是否轉為精簡 dtype (見 compact_dtypes)，適合堆疊數十週、上千位創作者時使用。
+
+    Returns:
+        (df_long, df_panel): 含 week 欄位的完整長表，以及平衡後的 (creator_name, week) 面板。
+    """
+    start = time.perf_counter()
+    # 方案表依來源檔案雜湊快取，只有新的或改動過的快照才需要解析 JSON
+    tiers = pd.concat([load_tier_table(p).assign(week=week) for week, p in enumerate(paths, 1)],
+                      ignore_index=True)
+    tier_aggs = row_aggregates(tiers, keys=("week", "row"))
+    df_long = engineer_features(read_snapshots(paths), tier_aggs=tier_aggs)
+    if compact:
+        df_long = compact_dtypes(df_long)
+    df_panel = balanced_panel(df_long, n_weeks=len(paths))
+    elapsed = time.perf_counter() - start
+    n_creators = df_panel.index.get_level_values(0).nunique()
+    print(f"面板建構完成: {len(paths)} 期、{len(df_long)} 列，完整創作者 {n_creators} 位，耗時 {elapsed:.2f} 秒")
+    return df_long, df_panel
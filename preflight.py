@@ -0,0 +1,171 @@
+"""
+瀏覽器爬取前的 HTTP 預檢 (preflight)。
+
+urls_for_scrape.txt 中有不少已改名、刪除或沒有贊助人的頁面，瀏覽器要等 20 秒的
+creator_name 逾時才會發現。預檢用共用連線池的 requests.Session 與有限的並行數，
+先對每個 URL 發出 GET (或只發 HEAD，見 --head-only)：
+    - 404 / 410、被導回首頁或登入頁    -> 丟棄 (not_found)
+    - 跟隨轉址到新的 vanity URL      -> 改用最終網址 (canonical)
+    - 內嵌 campaign 本身的 patron_count 為 0 -> 丟棄 (zero_patrons)
+      (方案 / reward 物件也有 patron_count；隱藏贊助人數的 campaign 沒有此欄位，一律保留)
+    - 被 Cloudflare 擋下、逾時、其他錯誤 -> 保留，交給瀏覽器判斷
+結束時報告丟棄數量與省下的瀏覽器導航次數。
+
+用法:
+    python preflight.py urls_for_scrape.txt --workers 8
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_engine import parse_creator_page
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+
+# 丟棄的原因；其餘結果一律保留
+DROP_REASONS = {"not_found", "zero_patrons"}
+# 瀏覽器在這些頁面上平均要花的秒數 (creator_name 逾時 20 秒 / 載入後才讀到 0 贊助人)
+_BROWSER_SECONDS_SAVED = {"not_found": 20.0, "zero_patrons": 8.0}
+
+_CHALLENGE_MARKERS = ("cf-chl", "Just a moment...", "challenge-platform")
+
+
+def make_session(pool_size: int = 8) -> requests.Session:
+    """建立共用連線池的 Session；對 429 / 5xx 自動退避重試"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("HEAD", "GET"), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en,en_US"})
+    return session
+
+
+def _canonical(url: str) -> str:
+    return url.split("?")[0].split("#")[0].rstrip("/")
+
+
+def check_url(session: requests.Session, url: str, timeout: float = 10.0,
+              head_only: bool = False) -> Tuple[str, str, str]:
+    """
+    檢查單一 URL。head_only 時只發 HEAD (較省流量，但無法判斷 0 贊助人；HEAD 被拒時仍改用 GET)。
+
+    Returns:
+        (status, final_url, detail)；status 為 ok / redirected / not_found / zero_patrons / blocked / error。
+    """
+    try:
+        if head_only:
+            resp = session.head(url, allow_redirects=True, timeout=timeout)
+            if resp.status_code in (403, 405, 501): # 不接受 HEAD
+                resp = session.get(url, allow_redirects=True, timeout=timeout)
+        else:
+            resp = session.get(url, allow_redirects=True, timeout=timeout)
+    except requests.RequestException as e:
+        return "error", url, f"{type(e).__name__}: {str(e)[:120]}"
+
+    final_url = resp.url or url
+    if resp.status_code in (404, 410):
+        return "not_found", final_url, f"HTTP {resp.status_code}"
+    text = resp.text if resp.request.method == "GET" else ""
+    if resp.status_code in (403, 503) or any(m in text[:5000] for m in _CHALLENGE_MARKERS):
+        return "blocked", url, f"HTTP {resp.status_code}"
+    if resp.status_code >= 400:
+        return "error", url, f"HTTP {resp.status_code}"
+
+    path = final_url.split("://", 1)[-1].split("/", 1)[1] if "/" in final_url.split("://", 1)[-1] else ""
+    if _canonical(path) in ("", "home", "login", "search"): # 創作者已不存在時會被導回首頁 / 登入頁
+        return "not_found", final_url, f"redirected to {final_url}"
+
+    parsed = parse_creator_page(text) if text else None
+    if parsed is not None and parsed.get("patron_count") == 0:
+        return "zero_patrons", final_url, "patron_count=0"
+    if _canonical(final_url) != _canonical(url):
+        return "redirected", _canonical(final_url), f"{url} -> {final_url}"
+    return "ok", url, ""
+
+
+class PreflightResult:
+    """預檢結果: 保留的 URL (已換成最終網址)、丟棄的 URL 與轉址對照"""
+
+    def __init__(self):
+        self.kept: List[str] = []
+        self.dropped: Dict[str, Tuple[str, str]] = {}
+        self.redirects: Dict[str, str] = {} # 最終網址 -> 原始網址
+        self.status_counts: Dict[str, int] = {}
+        self.elapsed_s = 0.0
+
+    @property
+    def navigations_saved(self) -> int:
+        return len(self.dropped)
+
+    @property
+    def seconds_saved(self) -> float:
+        return sum(_BROWSER_SECONDS_SAVED.get(reason, 0) for reason, _ in self.dropped.values())
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{k}={v}" for k, v in sorted(self.status_counts.items()))
+        return (f"預檢完成 ({self.elapsed_s:.1f} 秒): 保留 {len(self.kept)}、丟棄 {len(self.dropped)}、"
+                f"轉址 {len(self.redirects)} [{counts}]；省下 {self.navigations_saved} 次瀏覽器導航"
+                f" (約 {self.seconds_saved / 60:.1f} 分鐘)")
+
+
+def preflight_urls(urls: Sequence[str], max_workers: int = 8, timeout: float = 10.0,
+                   session: Optional[requests.Session] = None, head_only: bool = False) -> PreflightResult:
+    """以 max_workers 個執行緒並行預檢，保留原順序 (轉址後重複的 URL 只保留一次)"""
+    start = time.perf_counter()
+    session = session or make_session(max_workers)
+    result = PreflightResult()
+    lock = threading.Lock()
+    done = [0]
+
+    def _check(url: str) -> Tuple[str, str, str]:
+        outcome = check_url(session, url, timeout, head_only)
+        with lock:
+            done[0] += 1
+            if done[0] % 100 == 0:
+                print(f"  預檢進度 {done[0]}/{len(urls)}")
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = list(pool.map(_check, urls))
+
+    seen = set()
+    for url, (status, final_url, detail) in zip(urls, outcomes):
+        result.status_counts[status] = result.status_counts.get(status, 0) + 1
+        if status in DROP_REASONS:
+            result.dropped[url] = (status, detail)
+            continue
+        if final_url in seen:
+            continue
+        seen.add(final_url)
+        if status == "redirected":
+            result.redirects[final_url] = url
+        result.kept.append(final_url)
+
+    result.elapsed_s = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="以 HTTP 預檢 URL 清單，找出失效與無贊助人的頁面")
+    parser.add_argument("url_file", help="每行一個 URL 的文字檔")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--head-only", action="store_true", help="只發 HEAD 請求 (不判斷 0 贊助人)")
+    args = parser.parse_args()
+
+    with open(args.url_file, "r", encoding="utf-8") as f:
+        url_list = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+    res = preflight_urls(url_list, args.workers, args.timeout, head_only=args.head_only)
+    for dropped_url, (reason, info) in res.dropped.items():
+        print(f"  [{reason}] {dropped_url} {info}")
+    for final, original in res.redirects.items():
+        print(f"  [redirected] {original} -> {final}")
+    print(res.summary())
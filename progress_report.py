@@ -0,0 +1,246 @@
+"""
+爬取進度與預估剩餘時間 (ETA)。
+
+ProgressTracker 監聽 RunTrace 事件，以滾動視窗 (預設 15 分鐘) 內的吞吐量估計:
+    完成數 / 總數、每小時 URL 數、ETA、失敗率、worker 使用率 (視窗內花在 URL 上的時間比例)
+在終端機上以同一行原地更新；輸出被導向檔案 (Jenkins) 時改為每 interval_s 秒打印一行。
+原地更新的進度行由 STATUS_LINE 管理: scrape_logging 的主控台 handler 在輸出每筆記錄前
+先清掉進度行、輸出後再重畫，背景日誌執行緒的 WARNING 不會與進度行交錯。
+
+分片模式下每個行程把目前狀態寫成 progress_<分片>.json，
+`sharding.py run-local` 會定期讀取所有分片的狀態並打印合計的進度行 (aggregate_states)。
+"""
+import json
+import os
+import sys
+import threading
+import time
+import unicodedata
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """秒數 -> 1h23m / 4m05s；None 表示無法估計"""
+    if seconds is None:
+        return "--"
+    seconds = int(max(0, seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{secs:02d}s"
+
+
+def format_progress(state: Dict[str, Any]) -> str:
+    """把狀態 dict 格式化為一行進度"""
+    total = state.get("total") or 0
+    processed = state.get("processed", 0)
+    pct = processed / total if total else 0.0
+    workers = f" | workers {state['workers']}" if state.get("workers", 1) > 1 else ""
+    return (f"[進度] {processed}/{total} ({pct:.1%}) | 成功 {state.get('done', 0)} 失敗 {state.get('failed', 0)}"
+            f" 略過 {state.get('skipped', 0)} | {state.get('rate_per_hour', 0):.0f} URL/小時"
+            f" | ETA {format_duration(state.get('eta_s'))} | 失敗率 {state.get('failure_rate', 0):.1%}"
+            f" | 使用率 {state.get('utilization', 0):.0%}{workers}")
+
+
+def display_width(text: str) -> int:
+    """終端機上的顯示寬度 (全形 / 中文字佔兩格)"""
+    return sum(2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1 for ch in text)
+
+
+class StatusLine:
+    """
+    stdout 上以 \r 原地更新的一行狀態。
+
+    其他輸出 (例如日誌的主控台 handler) 用 suspended() 包住寫入:
+    先以空白蓋掉狀態行，寫完後再重畫，避免兩者寫在同一行。
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._lock = threading.RLock()
+
+    def show(self, text: str) -> None:
+        with self._lock:
+            pad = max(0, display_width(self.text) - display_width(text))
+            sys.stdout.write("\r" + text + " " * pad)
+            sys.stdout.flush()
+            self.text = text
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.text:
+                sys.stdout.write("\r" + " " * display_width(self.text) + "\r")
+                sys.stdout.flush()
+
+    def finish(self) -> None:
+        """保留目前的狀態行並換行 (之後的輸出從新的一行開始)"""
+        with self._lock:
+            if self.text:
+                sys.stdout.write("\n")
+                sys.stdout.flush()
+            self.text = ""
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        with self._lock:
+            self.clear()
+            try:
+                yield
+            finally:
+                if self.text:
+                    sys.stdout.write(self.text)
+                    sys.stdout.flush()
+
+
+STATUS_LINE = StatusLine()
+
+
+class ProgressTracker:
+    """
+    Args:
+        window_s: 計算吞吐量與失敗率的滾動視窗長度。
+        interval_s: 非終端機輸出時的打印間隔；終端機上最多每秒原地更新一次。
+        state_path: 狀態 JSON 檔 (分片彙整用)；None 表示不寫檔。
+        in_place: 是否以 \\r 原地更新；預設依 stdout 是否為終端機決定。
+    """
+
+    def __init__(self, window_s: float = 900, interval_s: float = 60,
+                 state_path: Optional[str] = None, in_place: Optional[bool] = None):
+        self.window_s = window_s
+        self.interval_s = interval_s
+        self.state_path = state_path
+        self.in_place = sys.stdout.isatty() if in_place is None else in_place
+        self.total = 0
+        self.started = time.time()
+        self.processed_urls = set()
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        # (完成時間, 耗時秒數, 是否失敗)
+        self._recent: Deque[Tuple[float, float, bool]] = deque()
+        self._last_print = 0.0
+        self._lock = threading.Lock()
+        if state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+
+    def on_event(self, record: Dict[str, Any]) -> None:
+        """RunTrace 監聽器"""
+        event = record.get("event")
+        now = time.time()
+        with self._lock:
+            if event == "run_start":
+                self.total = record.get("url_count", 0)
+                self.started = now
+            elif event in ("url_done", "url_failed"):
+                failed = event == "url_failed"
+                self.done += not failed
+                self.failed += failed
+                self.processed_urls.add(record.get("url"))
+                self._recent.append((now, float(record.get("seconds") or 0), failed))
+            elif event == "url_skipped":
+                self.skipped += 1
+                self.processed_urls.add(record.get("url"))
+            else:
+                if event != "run_end":
+                    return
+            self._trim(now)
+        if event == "run_end":
+            self.report(force=True)
+            if self.in_place:
+                STATUS_LINE.finish()
+        else:
+            self.report()
+
+    def _trim(self, now: float) -> None:
+        while self._recent and now - self._recent[0][0] > self.window_s:
+            self._recent.popleft()
+
+    def state(self) -> Dict[str, Any]:
+        """目前狀態 (可序列化為 JSON)"""
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            span = min(self.window_s, max(now - self.started, 1e-9))
+            attempts = len(self._recent)
+            busy_s = sum(seconds for _, seconds, _ in self._recent)
+            failures = sum(1 for _, _, failed in self._recent if failed)
+            processed = len(self.processed_urls)
+            rate_per_s = attempts / span if attempts else 0.0
+            remaining = max(0, self.total - processed)
+            return {
+                "total": self.total,
+                "processed": processed,
+                "done": self.done,
+                "failed": self.failed,
+                "skipped": self.skipped,
+                "rate_per_hour": rate_per_s * 3600,
+                "eta_s": remaining / rate_per_s if rate_per_s else (0.0 if remaining == 0 else None),
+                "failure_rate": failures / attempts if attempts else 0.0,
+                "utilization": min(1.0, busy_s / span),
+                "workers": 1,
+                "updated_at": now,
+            }
+
+    def report(self, force: bool = False) -> None:
+        """依間隔打印進度行並更新狀態檔"""
+        now = time.time()
+        min_gap = 1.0 if self.in_place else self.interval_s
+        if not force and now - self._last_print < min_gap:
+            return
+        self._last_print = now
+        state = self.state()
+        line = format_progress(state)
+        if self.in_place:
+            STATUS_LINE.show(line)
+        else:
+            print(line, flush=True)
+        if self.state_path:
+            write_state(self.state_path, state)
+
+
+def write_state(path: str, state: Dict[str, Any]) -> None:
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"寫入進度狀態失敗: {e}")
+
+
+def read_states(paths: Sequence[str]) -> List[Dict[str, Any]]:
+    """讀取存在且可解析的狀態檔"""
+    states = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                states.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return states
+
+
+def aggregate_states(states: Sequence[Dict[str, Any]], expected_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    合計多個 worker 的狀態: 數量與吞吐量相加，失敗率依吞吐量加權，使用率取平均，
+    ETA 取最慢的 worker (整體要等最後一個分片結束)。
+    """
+    workers = expected_workers or len(states)
+    if not states:
+        return {"total": 0, "processed": 0, "workers": workers}
+    rate = sum(s.get("rate_per_hour", 0) for s in states)
+    etas = [s.get("eta_s") for s in states]
+    return {
+        "total": sum(s.get("total", 0) for s in states),
+        "processed": sum(s.get("processed", 0) for s in states),
+        "done": sum(s.get("done", 0) for s in states),
+        "failed": sum(s.get("failed", 0) for s in states),
+        "skipped": sum(s.get("skipped", 0) for s in states),
+        "rate_per_hour": rate,
+        "eta_s": None if None in etas or len(states) < workers else max(etas),
+        "failure_rate": (sum(s.get("failure_rate", 0) * s.get("rate_per_hour", 0) for s in states) / rate
+                         if rate else 0.0),
+        "utilization": sum(s.get("utilization", 0) for s in states) / workers,
+        "workers": workers,
+    }
@@ -0,0 +1,241 @@
+"""
+面板模型的平行 cluster bootstrap 與 permutation 推論 (以創作者為群集)。
+
+Roadmap 的 FE/RE/FD 結果只有解析標準誤；這裡針對 model_sweep.MODEL_SPECS 中
+FD 與 FE 的設定，以 NumPy 向量化重抽樣:
+
+- 先把資料壓成每位創作者的充分統計量 X_g'X_g 與 X_g'y_g，
+  每個 bootstrap 副本只是「各創作者被抽中次數」的加權和，再做一次批次 solve；
+- permutation 在「觀測數相同的創作者」之間整塊交換 X，
+  X'X 不變，只需重算 X'y；
+- 副本分塊後交給行程池，每塊使用獨立的 SeedSequence 子種子，結果可重現。
+
+FE 的係數以組內轉換 (within transformation) 計算，與 PanelOLS(entity_effects=True) 的斜率相同；
+標準化的平均與標準差固定使用原始樣本的值。
+
+用法:
+    from resampling import resampling_summary
+    summary = resampling_summary(df_long, df_panel, target="likes", mode="fe", n_boot=5000, n_perm=5000)
+
+    python resampling.py patreon_data_w1.csv ... patreon_data_w4.csv --target likes --mode fe
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from model_sweep import MODEL_SPECS, model_frame
+
+RESAMPLING_MODES = ["fd", "fe"]
+
+# 每塊副本數；分塊方式與行程數無關，同一個 seed 在不同機器上結果相同
+_CHUNK_SIZE = 250
+# 單一批次 permutation 展開陣列的元素上限 (控制記憶體)
+_MAX_BLOCK_ELEMENTS = 20_000_000
+
+
+def design_matrices(df_long: pd.DataFrame, df_panel: pd.DataFrame,
+                    target: str, mode: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """
+    建立重抽樣用的設計矩陣，列已依創作者排序。
+
+    Returns:
+        (codes, X, y, names): 每列的創作者編號、X、y 與係數名稱。
+        FD 含常數項；FE 為組內轉換後的資料 (被固定效果吸收的欄位會移除)。
+    """
+    if mode not in RESAMPLING_MODES:
+        raise ValueError(f"重抽樣只支援 {RESAMPLING_MODES}，收到 mode={mode!r}")
+    y_col, X_cols = MODEL_SPECS[(mode, target)]
+    tmp = model_frame(df_long, df_panel, target, mode)
+    if mode == "fd":
+        # fd_frame 保留 df_long 的列索引，可直接對回創作者
+        creators = df_long.loc[tmp.index, "creator_name"].to_numpy()
+    else:
+        creators = tmp.index.get_level_values("creator_name").to_numpy()
+
+    codes, _ = pd.factorize(creators)
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    X = tmp[X_cols].to_numpy(dtype=np.float64)[order]
+    y = tmp[y_col].to_numpy(dtype=np.float64)[order]
+    names = list(X_cols)
+
+    if mode == "fd":
+        X = np.column_stack([np.ones(len(X)), X])
+        return codes, X, y, ["const"] + names
+
+    # FE: 與 fit_model 相同先標準化，再做組內轉換
+    std = X.std(axis=0)
+    X = (X - X.mean(axis=0)) / np.where(std == 0, 1, std)
+    n_groups = codes.max() + 1 if len(codes) else 0
+    counts = np.bincount(codes, minlength=n_groups)
+    X_means = np.column_stack([np.bincount(codes, weights=X[:, j], minlength=n_groups) for j in range(X.shape[1])])
+    X = X - (X_means / counts[:, None])[codes]
+    y = y - (np.bincount(codes, weights=y, minlength=n_groups) / counts)[codes]
+
+    keep = ~np.all(np.isclose(X, 0.0), axis=0) # 組內無變異 = 被固定效果吸收
+    return codes, X[:, keep], y, [n for n, k in zip(names, keep) if k]
+
+
+def _group_sufficient_stats(codes: np.ndarray, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """每位創作者的 X_g'X_g (G, k, k) 與 X_g'y_g (G, k)；codes 需已排序"""
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    XtX = np.add.reduceat(np.einsum("ni,nj->nij", X, X), starts, axis=0)
+    Xty = np.add.reduceat(X * y[:, None], starts, axis=0)
+    return XtX, Xty
+
+
+def _batched_solve(XtX: np.ndarray, Xty: np.ndarray) -> np.ndarray:
+    """批次求解 (B, k, k) β = (B, k)；奇異矩陣改用 pseudo-inverse"""
+    try:
+        return np.linalg.solve(XtX, Xty[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.einsum("bij,bj->bi", np.linalg.pinv(XtX), Xty)
+
+
+# --- 子行程 ---
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(codes: np.ndarray, X: np.ndarray, y: np.ndarray) -> None:
+    """每個子行程只接收一次資料並預先計算充分統計量與 permutation 分層"""
+    XtX_g, Xty_g = _group_sufficient_stats(codes, X, y)
+    _WORKER["XtX_g"] = XtX_g
+    _WORKER["Xty_g"] = Xty_g
+    _WORKER["XtX"] = XtX_g.sum(axis=0)
+
+    # 依觀測數分層，每層整理成 (G_s, T, k) 與 (G_s, T) 的區塊
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    lengths = np.diff(np.r_[starts, len(codes)])
+    strata = []
+    for T in np.unique(lengths):
+        group_starts = starts[lengths == T]
+        rows = group_starts[:, None] + np.arange(T)[None, :]
+        strata.append((X[rows], y[rows]))
+    _WORKER["strata"] = strata
+
+
+def _bootstrap_chunk(seed: np.random.SeedSequence, n_rep: int) -> np.ndarray:
+    XtX_g, Xty_g = _WORKER["XtX_g"], _WORKER["Xty_g"]
+    n_groups, k = Xty_g.shape
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n_groups, size=(n_rep, n_groups))
+    # 各副本中每位創作者被抽中的次數 (B, G)
+    flat = (draws + np.arange(n_rep)[:, None] * n_groups).ravel()
+    weights = np.bincount(flat, minlength=n_rep * n_groups).reshape(n_rep, n_groups).astype(np.float64)
+    XtX_b = (weights @ XtX_g.reshape(n_groups, k * k)).reshape(n_rep, k, k)
+    Xty_b = weights @ Xty_g
+    return _batched_solve(XtX_b, Xty_b)
+
+
+def _permutation_chunk(seed: np.random.SeedSequence, n_rep: int) -> np.ndarray:
+    XtX = _WORKER["XtX"]
+    rng = np.random.default_rng(seed)
+    k = XtX.shape[0]
+    Xty = np.zeros((n_rep, k))
+    for Xs, ys in _WORKER["strata"]:
+        n_groups, T, _ = Xs.shape
+        if n_groups < 2:
+            Xty += np.einsum("gtk,gt->k", Xs, ys)
+            continue
+        step = max(1, _MAX_BLOCK_ELEMENTS // (n_groups * T * k))
+        for lo in range(0, n_rep, step):
+            hi = min(n_rep, lo + step)
+            perms = rng.permuted(np.tile(np.arange(n_groups), (hi - lo, 1)), axis=1)
+            Xty[lo:hi] += np.einsum("bgtk,gt->bk", Xs[perms], ys)
+    return np.linalg.solve(XtX, Xty.T).T
+
+
+def _run_chunks(func, codes: np.ndarray, X: np.ndarray, y: np.ndarray,
+                n_rep: int, seed: int, max_workers: Optional[int]) -> np.ndarray:
+    """把 n_rep 個副本切塊，平行執行 func 並依序合併"""
+    workers = max(1, max_workers or os.cpu_count() or 1)
+    sizes = [min(_CHUNK_SIZE, n_rep - lo) for lo in range(0, n_rep, _CHUNK_SIZE)]
+    if not sizes:
+        return np.empty((0, X.shape[1]))
+    n_chunks = len(sizes)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    if workers == 1 or n_chunks == 1:
+        _init_worker(codes, X, y)
+        return np.concatenate([func(s, n) for s, n in zip(seeds, sizes)])
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(codes, X, y)) as pool:
+        return np.concatenate(list(pool.map(func, seeds, sizes)))
+
+
+def observed_coefficients(codes: np.ndarray, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """原始樣本的 OLS 係數"""
+    return np.linalg.solve(X.T @ X, X.T @ y)
+
+
+def cluster_bootstrap(df_long: pd.DataFrame, df_panel: pd.DataFrame, target: str, mode: str,
+                      n_boot: int = 2000, seed: int = 0, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    以創作者為單位有放回重抽樣，返回 (n_boot, k) 的係數副本。
+    """
+    codes, X, y, names = design_matrices(df_long, df_panel, target, mode)
+    draws = _run_chunks(_bootstrap_chunk, codes, X, y, n_boot, seed, max_workers)
+    return pd.DataFrame(draws, columns=names)
+
+
+def permutation_test(df_long: pd.DataFrame, df_panel: pd.DataFrame, target: str, mode: str,
+                     n_perm: int = 2000, seed: int = 1, max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    在觀測數相同的創作者之間整塊交換 X (打破 X 與 y 的對應)，
+    返回 (n_perm, k) 的虛無分配係數副本。
+    """
+    codes, X, y, names = design_matrices(df_long, df_panel, target, mode)
+    draws = _run_chunks(_permutation_chunk, codes, X, y, n_perm, seed, max_workers)
+    return pd.DataFrame(draws, columns=names)
+
+
+def resampling_summary(df_long: pd.DataFrame, df_panel: pd.DataFrame, target: str = "likes", mode: str = "fe",
+                       n_boot: int = 2000, n_perm: int = 2000, alpha: float = 0.05, seed: int = 0,
+                       max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    同時執行 bootstrap 與 permutation，整理成每個係數一列的摘要:
+    estimate, boot_se, ci_low, ci_high (百分位區間), perm_p (雙尾)。
+    """
+    start = time.perf_counter()
+    codes, X, y, names = design_matrices(df_long, df_panel, target, mode)
+    beta = observed_coefficients(codes, X, y)
+    boot = _run_chunks(_bootstrap_chunk, codes, X, y, n_boot, seed, max_workers)
+    perm = _run_chunks(_permutation_chunk, codes, X, y, n_perm, seed + 1, max_workers)
+
+    exceed = (np.abs(perm) >= np.abs(beta)[None, :] - 1e-12).sum(axis=0)
+    summary = pd.DataFrame({
+        "estimate": beta,
+        "boot_se": boot.std(axis=0, ddof=1),
+        "ci_low": np.quantile(boot, alpha / 2, axis=0),
+        "ci_high": np.quantile(boot, 1 - alpha / 2, axis=0),
+        "perm_p": (exceed + 1) / (n_perm + 1),
+    }, index=pd.Index(names, name="term"))
+    if mode == "fd":
+        summary.loc["const", "perm_p"] = np.nan # 常數項在交換下不變，permutation 無意義
+
+    elapsed = time.perf_counter() - start
+    print(f"重抽樣完成 ({mode.upper()}, Y = {target}): {n_boot} 次 bootstrap + {n_perm} 次 permutation，"
+          f"{len(np.unique(codes))} 位創作者，耗時 {elapsed:.2f} 秒")
+    return summary
+
+
+if __name__ == "__main__":
+    from delta_cache import build_delta_panel
+
+    parser = argparse.ArgumentParser(description="面板模型的 cluster bootstrap 與 permutation 推論")
+    parser.add_argument("paths", nargs="+", help="依時間排序的快照 CSV")
+    parser.add_argument("--target", default="likes")
+    parser.add_argument("--mode", default="fe", choices=RESAMPLING_MODES)
+    parser.add_argument("--n-boot", type=int, default=2000)
+    parser.add_argument("--n-perm", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="行程池大小 (預設為 CPU 核心數)")
+    args = parser.parse_args()
+
+    df_long, df_panel = build_delta_panel(args.paths)
+    print(resampling_summary(df_long, df_panel, args.target, args.mode, args.n_boot, args.n_perm,
+                             seed=args.seed, max_workers=args.workers))
@@ -0,0 +1,128 @@
+"""
+失敗 URL 的分類、重試佇列與「非創作者」略過清單。
+
+scrape_url 失敗時會在 scraper.last_failure 記錄失敗類型:
+    load_timeout    頁面關鍵元素 (creator_name) 未在時限內出現
+    timeout         其他 Selenium 等待逾時
+    stale_element   元素在操作期間失效
+    webdriver_error 瀏覽器 / 連線層錯誤
+    error           其他未預期錯誤
+    zero_patrons    不是創作者頁面或贊助人數為 0 (非暫時性)
+
+暫時性失敗放入 RetryQueue，在整次執行的最後以指數退避重試；
+zero_patrons 寫入 SkipList (JSON 檔)，在 ttl_days 內的後續執行直接略過。
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+TRANSIENT_FAILURES = {"load_timeout", "timeout", "stale_element", "webdriver_error", "error"}
+PERMANENT_FAILURES = {"zero_patrons"}
+
+
+def classify_exception(exc: BaseException) -> str:
+    """把 scrape_url 捕獲到的例外對應到失敗類型 (以類別名稱判斷，不需要匯入 selenium)"""
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    if "StaleElementReferenceException" in names:
+        return "stale_element"
+    if "TimeoutException" in names or isinstance(exc, TimeoutError):
+        return "timeout"
+    if "WebDriverException" in names or isinstance(exc, ConnectionError):
+        return "webdriver_error"
+    return "error"
+
+
+def backoff_delay(attempt: int, base: float = 30.0, cap: float = 600.0) -> float:
+    """第 attempt 次重試前的等待秒數: base * 2^(attempt-1)，上限 cap，加上 ±20% 抖動"""
+    delay = min(cap, base * (2 ** max(0, attempt - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class RetryQueue:
+    """暫時性失敗的 URL 佇列，記錄每個 URL 的失敗次數與最後一次失敗原因"""
+
+    def __init__(self, max_attempts: int = 3):
+        self.max_attempts = max_attempts
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        self.attempts: Dict[str, int] = {}
+        self.exhausted: Dict[str, Tuple[str, str]] = {}
+
+    def add(self, url: str, kind: str, detail: str = "") -> bool:
+        """
+        記錄一次失敗；非暫時性失敗不會加入佇列。
+
+        Returns:
+            bool: 是否已排入重試 (已達 max_attempts 時改記錄在 exhausted)。
+        """
+        if kind not in TRANSIENT_FAILURES:
+            return False
+        self.attempts[url] = self.attempts.get(url, 0) + 1
+        if self.attempts[url] > self.max_attempts:
+            self.exhausted[url] = (kind, detail)
+            self._pending.pop(url, None)
+            return False
+        self._pending[url] = (kind, detail)
+        return True
+
+    def drain(self) -> List[str]:
+        """取出目前所有待重試的 URL 並清空佇列"""
+        urls = list(self._pending)
+        self._pending.clear()
+        return urls
+
+    def pending(self) -> Dict[str, Tuple[str, str]]:
+        return dict(self._pending)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+class SkipList:
+    """
+    持久化的略過清單 (非創作者 / 0 贊助人)。
+
+    Args:
+        path: JSON 檔路徑；None 表示不使用略過清單。
+        ttl_days: 記錄的有效天數，過期後重新檢查 (創作者可能開始有贊助人)。
+    """
+
+    def __init__(self, path: Optional[str], ttl_days: float = 14):
+        self.path = path
+        self.ttl = timedelta(days=ttl_days)
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+                print(f"已載入略過清單 {path}: {len(self.entries)} 個 URL。")
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"讀取略過清單 {path} 失敗，將重新建立: {e}")
+
+    def should_skip(self, url: str) -> bool:
+        """url 是否在有效期內被標記為非創作者"""
+        entry = self.entries.get(url)
+        if not entry:
+            return False
+        try:
+            marked = datetime.fromisoformat(entry["marked_at"])
+        except (KeyError, ValueError):
+            return False
+        return datetime.now() - marked < self.ttl
+
+    def mark(self, url: str, kind: str, detail: str = "") -> None:
+        self.entries[url] = {"kind": kind, "detail": detail, "marked_at": datetime.now().isoformat(timespec="seconds")}
+
+    def unmark(self, url: str) -> None:
+        self.entries.pop(url, None)
+
+    def save(self) -> None:
+        """寫回 JSON 檔 (原子替換)"""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
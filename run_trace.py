@@ -0,0 +1,65 @@
+"""
+爬蟲執行紀錄 (run trace)。
+
+每次執行產生一個 JSON Lines 檔，一行一個事件，例如:
+    {"ts": "2025-06-01T17:57:44", "elapsed_s": 12.3, "event": "memory_sample", "rss_mb": 812.4, ...}
+事後可用 pandas.read_json(path, lines=True) 分析記憶體、重啟與各種事件。
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+class RunTrace:
+    """把事件逐行附加到 JSONL 檔；path 為 None 時只在記憶體中計數，不寫檔"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.started = time.monotonic()
+        self.counts = {}
+        self.totals = {}
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            print(f"執行紀錄將寫入: {path}")
+
+    @classmethod
+    def in_directory(cls, output_dir: str, prefix: str = "run_trace") -> "RunTrace":
+        """在輸出目錄下建立帶時間戳的紀錄檔"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return cls(os.path.join(output_dir, f"{prefix}_{timestamp}.jsonl"))
+
+    def event(self, name: str, **fields: Any) -> None:
+        """記錄一個事件；寫檔失敗只打印警告，不影響爬蟲"""
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+            "event": name,
+        }
+        record.update(fields)
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+            if self.path:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                except OSError as e:
+                    print(f"寫入執行紀錄失敗: {e}")
+        for listener in self.listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                print(f"執行紀錄監聽器出錯: {e}")
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """註冊事件監聽器 (例如 metrics)；每個事件記錄 (dict) 都會傳給它"""
+        self.listeners.append(listener)
+
+    def add_total(self, name: str, value: float) -> None:
+        """累加整次執行的數值 (例如下載位元組)，供結束時的摘要使用"""
+        with self._lock:
+            self.totals[name] = self.totals.get(name, 0) + value
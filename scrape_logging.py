@@ -0,0 +1,160 @@
+"""
+爬蟲的結構化日誌。
+
+PatreonScraperRefactored 的各個輔助方法依功能使用 "scraper.<模組>" logger
+(driver / element / static / chat / tiers / posts / links / about / run)，
+http_engine 使用 scraper.http，browser_profiles 使用 scraper.driver。
+所有記錄先經 QueueHandler 放進佇列，由背景 QueueListener 寫入:
+    - 輪替的 JSON Lines 日誌檔 (RotatingFileHandler)，每行含時間、等級、logger、目前的 URL 與訊息
+    - 主控台 (預設只顯示 WARNING 以上)
+爬取執行緒只做一次 queue.put，不再等待主控台 I/O (Windows chcp 65001 的主控台寫入特別慢)。
+主控台輸出會先讓開 progress_report 的原地進度行 (STATUS_LINE)，寫完再重畫。
+
+用 creator_context(url) 包住單一創作者的處理，記錄會帶上 url；
+若該 URL 在 debug_urls 中，處理期間所有 scraper.* logger 暫時調成 DEBUG。
+"""
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+from progress_report import STATUS_LINE
+
+ROOT_LOGGER = "scraper"
+MODULES = ("driver", "element", "static", "chat", "tiers", "posts", "links", "about", "run", "http")
+
+_current_url: contextvars.ContextVar[str] = contextvars.ContextVar("current_url", default="")
+
+
+class _UrlFilter(logging.Filter):
+    """在記錄上附加目前處理中的 URL (在呼叫端執行緒執行)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.url = _current_url.get()
+        return True
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """寫入 stdout 前先清掉原地更新的進度行，寫完後重畫"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with STATUS_LINE.suspended():
+            super().emit(record)
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "url": getattr(record, "url", ""),
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def parse_module_levels(specs: Iterable[str]) -> Dict[str, int]:
+    """把 ['chat=DEBUG', 'tiers=info'] 轉成 {'scraper.chat': 10, 'scraper.tiers': 20}"""
+    levels = {}
+    for spec in specs:
+        name, _, level = spec.partition("=")
+        name = name.strip()
+        if not level or (name not in MODULES and name != ROOT_LOGGER):
+            raise ValueError(f"模組日誌等級格式應為 <模組>=<等級>，模組為 {', '.join(MODULES)}，收到 {spec!r}")
+        full_name = name if name == ROOT_LOGGER else f"{ROOT_LOGGER}.{name}"
+        levels[full_name] = logging.getLevelName(level.strip().upper())
+        if not isinstance(levels[full_name], int):
+            raise ValueError(f"未知的日誌等級: {level!r}")
+    return levels
+
+
+class ScrapeLogging:
+    """
+    Args:
+        log_path: 日誌檔路徑 (JSON Lines)；None 表示只輸出到主控台。
+        level: 日誌檔的預設等級 (所有 scraper.* logger)。
+        console_level: 主控台顯示的最低等級。
+        module_levels: 個別模組的等級，例如 {"scraper.chat": logging.DEBUG}。
+        debug_urls: 處理這些 URL 時暫時把所有 scraper.* logger 調成 DEBUG。
+        max_bytes / backup_count: 日誌檔輪替大小與保留份數。
+    """
+
+    def __init__(self, log_path: Optional[str] = None, level: int = logging.INFO,
+                 console_level: int = logging.WARNING, module_levels: Optional[Dict[str, int]] = None,
+                 debug_urls: Iterable[str] = (), max_bytes: int = 20 * 1024 * 1024, backup_count: int = 5):
+        self.level = level
+        self.module_levels = dict(module_levels or {})
+        self.debug_urls = {u.rstrip("/") for u in debug_urls}
+
+        handlers = []
+        console = _ConsoleHandler(sys.stdout)
+        console.setLevel(console_level)
+        console.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+        handlers.append(console)
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=max_bytes,
+                                                                backupCount=backup_count, encoding="utf-8")
+            file_handler.setFormatter(JsonLineFormatter())
+            handlers.append(file_handler)
+        self.log_path = log_path
+
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(self._queue)
+        self.queue_handler.addFilter(_UrlFilter())
+        self.listener = logging.handlers.QueueListener(self._queue, *handlers, respect_handler_level=True)
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.handlers = [self.queue_handler]
+        root.propagate = False
+        self._apply_levels(debug=False)
+        self.listener.start()
+
+    def _apply_levels(self, debug: bool) -> None:
+        logging.getLogger(ROOT_LOGGER).setLevel(logging.DEBUG if debug else self.level)
+        for module in MODULES:
+            name = f"{ROOT_LOGGER}.{module}"
+            logging.getLogger(name).setLevel(logging.DEBUG if debug else self.module_levels.get(name, logging.NOTSET))
+
+    @contextmanager
+    def creator_context(self, url: str) -> Iterator[None]:
+        """處理單一創作者期間的記錄都帶上 url；url 在 debug_urls 中時開啟 DEBUG"""
+        token = _current_url.set(url)
+        debug = url.rstrip("/") in self.debug_urls
+        if debug:
+            self._apply_levels(debug=True)
+        try:
+            yield
+        finally:
+            if debug:
+                self._apply_levels(debug=False)
+            _current_url.reset(token)
+
+    def stop(self) -> None:
+        """送出佇列中剩下的記錄並關閉檔案"""
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+@contextmanager
+def creator_context(url: str, logs: Optional[ScrapeLogging] = None) -> Iterator[None]:
+    """未設定 ScrapeLogging 時只附加 url"""
+    if logs is not None:
+        with logs.creator_context(url):
+            yield
+        return
+    token = _current_url.set(url)
+    try:
+        yield
+    finally:
+        _current_url.reset(token)
@@ -0,0 +1,188 @@
+"""
+長時間爬取的 metrics，輸出為 Prometheus textfile 格式 (node_exporter --collector.textfile)。
+
+ScrapeMetrics 監聽 RunTrace 的事件並維護:
+    patreon_scraper_urls_done_total                    成功的 URL 數
+    patreon_scraper_urls_failed_total{reason}          依失敗類型的 URL 數
+    patreon_scraper_urls_skipped_total{reason}         略過清單 / 預檢丟棄的 URL 數
+    patreon_scraper_url_seconds                        每個 URL 的耗時 (histogram)
+    patreon_scraper_stage_seconds{stage}               各爬取階段的耗時 (histogram)
+    patreon_scraper_bytes_transferred_total            下載位元組 (需 --measure-bytes)
+    patreon_scraper_browser_restarts_total             記憶體監控觸發的瀏覽器重啟
+    patreon_scraper_backoffs_total{kind}               退避等待次數 (重試輪次等)
+    patreon_scraper_chrome_rss_megabytes               最近一次取樣的 Chrome RSS
+    patreon_scraper_last_update_timestamp_seconds      最後寫檔時間
+所有 metric 都帶 shard 標籤；背景執行緒每 interval_s 秒以原子替換寫檔一次，結束時再寫一次。
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+PREFIX = "patreon_scraper"
+
+DEFAULT_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+URL_BUCKETS = (10, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+
+_HELP = {
+    "urls_done_total": ("counter", "URLs scraped successfully"),
+    "urls_failed_total": ("counter", "URLs that failed, by failure kind"),
+    "urls_skipped_total": ("counter", "URLs skipped before browser work, by reason"),
+    "url_seconds": ("histogram", "Wall time per URL"),
+    "stage_seconds": ("histogram", "Wall time per scrape stage"),
+    "bytes_transferred_total": ("counter", "Network bytes transferred by Chrome"),
+    "browser_restarts_total": ("counter", "Browser sessions restarted by the memory watchdog"),
+    "backoffs_total": ("counter", "Backoff waits, by kind"),
+    "chrome_rss_megabytes": ("gauge", "Last sampled RSS of the Chrome process tree"),
+    "last_update_timestamp_seconds": ("gauge", "Unix time of the last metrics write"),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels(base: Dict[str, str], extra: Optional[Dict[str, Any]] = None) -> LabelKey:
+    merged = dict(base)
+    if extra:
+        merged.update({k: str(v) for k, v in extra.items()})
+    return tuple(sorted(merged.items()))
+
+
+def _format_labels(labels: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = [(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in items]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.n += 1
+
+
+class ScrapeMetrics:
+    """
+    Args:
+        path: 輸出的 .prom 檔 (node_exporter textfile 目錄中)。
+        interval_s: 背景寫檔間隔。
+        shard: 分片標記 (例如 combined、shard1of3)，加在所有 metric 上。
+    """
+
+    def __init__(self, path: str, interval_s: float = 30.0, shard: str = "combined"):
+        self.path = path
+        self.interval_s = interval_s
+        self.base_labels = {"shard": shard}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], _Histogram] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    # --- 基本操作 ---
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = (name, _labels(self.base_labels, labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._gauges[(name, _labels(self.base_labels, labels))] = value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels: Any) -> None:
+        key = (name, _labels(self.base_labels, labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(buckets)
+            hist.observe(value)
+
+    # --- RunTrace 監聽器 ---
+    def on_event(self, record: Dict[str, Any]) -> None:
+        """把 RunTrace 事件轉成 metrics"""
+        event = record.get("event")
+        if event == "url_done":
+            self.inc("urls_done_total")
+            self.observe("url_seconds", record.get("seconds", 0), buckets=URL_BUCKETS)
+        elif event == "url_failed":
+            self.inc("urls_failed_total", reason=record.get("kind", "error"))
+            self.observe("url_seconds", record.get("seconds", 0), buckets=URL_BUCKETS)
+        elif event == "url_skipped":
+            self.inc("urls_skipped_total", reason=record.get("reason", "unknown"))
+        elif event == "preflight_dropped":
+            self.inc("urls_skipped_total", reason=f"preflight_{record.get('reason', 'unknown')}")
+        elif event == "stage":
+            self.observe("stage_seconds", record.get("seconds", 0), stage=record.get("stage", "unknown"))
+        elif event == "transfer":
+            self.inc("bytes_transferred_total", record.get("bytes", 0))
+        elif event == "driver_restart":
+            self.inc("browser_restarts_total")
+        elif event == "retry_round":
+            self.inc("backoffs_total", kind="retry_round")
+        elif event == "memory_sample" and record.get("rss_mb") is not None:
+            self.set("chrome_rss_megabytes", record["rss_mb"])
+
+    # --- 輸出 ---
+    def render(self) -> str:
+        """產生 Prometheus text exposition 格式"""
+        self.set("last_update_timestamp_seconds", time.time())
+        lines = []
+        with self._lock:
+            names = sorted({n for n, _ in self._counters} | {n for n, _ in self._gauges} | {n for n, _ in self._histograms})
+            for name in names:
+                full = f"{PREFIX}_{name}"
+                kind, help_text = _HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                for (n, labels), value in sorted(self._counters.items()):
+                    if n == name:
+                        lines.append(f"{full}{_format_labels(labels)} {value:g}")
+                for (n, labels), value in sorted(self._gauges.items()):
+                    if n == name:
+                        lines.append(f"{full}{_format_labels(labels)} {round(value, 3)}")
+                for (n, labels), hist in sorted(self._histograms.items(), key=lambda item: item[0]):
+                    if n != name:
+                        continue
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lines.append(f"{full}_bucket{_format_labels(labels, [('le', f'{bound:g}')])} {count}")
+                    lines.append(f"{full}_bucket{_format_labels(labels, [('le', '+Inf')])} {hist.n}")
+                    lines.append(f"{full}_sum{_format_labels(labels)} {hist.total:.6g}")
+                    lines.append(f"{full}_count{_format_labels(labels)} {hist.n}")
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """原子寫入 textfile (node_exporter 不會讀到寫一半的檔案)"""
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"寫入 metrics 檔失敗: {e}")
+
+    def start(self) -> None:
+        """啟動背景寫檔執行緒"""
+        def _loop() -> None:
+            while not self._stop.wait(self.interval_s):
+                self.write()
+        self._thread = threading.Thread(target=_loop, name="metrics-writer", daemon=True)
+        self._thread.start()
+        print(f"Metrics 將每 {self.interval_s:g} 秒寫入: {self.path}")
+
+    def stop(self) -> None:
+        """停止背景執行緒並寫入最後一次"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.write()
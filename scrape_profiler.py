@@ -0,0 +1,184 @@
+"""
+爬蟲熱點分析 (Ver16.py --cprofile)。
+
+每個 URL 在 cProfile 下執行一次 scrape_url，輸出一個 .prof 檔 (可用 snakeviz / pstats 檢視)，
+並把該 URL 的時間拆成:
+    Python CPU        WebDriver 往返以外的 CPU 時間 (time.process_time，扣掉 _request 內消耗的 CPU)
+    WebDriver 往返    selenium RemoteConnection._request 的累計時間 (與 chromedriver 的 HTTP 往返，
+                      含其中的 CPU，另列於「往返中的 CPU」)
+    閒置等待          time.sleep 的累計時間 (WebDriverWait 輪詢與明確的 sleep)
+    其他              牆鐘時間扣掉以上三項 (HTTP 引擎、磁碟 I/O 等)；四項互不重疊
+另外列出 print() 與 WebDriverWait 建構的次數和時間，以及依自身時間排序的前 N 個函數。
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# pstats 的函數鍵: (檔名, 行號, 函數名)
+_SLEEP_KEY = ("~", 0, "<built-in method time.sleep>")
+_PRINT_KEY = ("~", 0, "<built-in method builtins.print>")
+
+
+def _is_webdriver_request(key: Tuple[str, int, str]) -> bool:
+    filename, _, funcname = key
+    return funcname == "_request" and filename.replace("\\", "/").endswith("webdriver/remote/remote_connection.py")
+
+
+def _is_wait_init(key: Tuple[str, int, str]) -> bool:
+    filename, _, funcname = key
+    return funcname == "__init__" and filename.replace("\\", "/").endswith("webdriver/support/wait.py")
+
+
+def _cumulative(stats: pstats.Stats, match: Callable[[Tuple[str, int, str]], bool]) -> Tuple[int, float]:
+    """符合條件的函數的 (呼叫次數, 累計時間)"""
+    calls, seconds = 0, 0.0
+    for key, (_, nc, _, ct, _) in stats.stats.items():
+        if match(key):
+            calls += nc
+            seconds += ct
+    return calls, seconds
+
+
+@contextmanager
+def track_request_cpu() -> Iterator[List[float]]:
+    """
+    暫時包裝 RemoteConnection._request，累計在 WebDriver 往返中消耗的 CPU 時間 (秒)。
+    沒有安裝 selenium 時累計值維持 0。
+    """
+    spent = [0.0]
+    try:
+        from selenium.webdriver.remote.remote_connection import RemoteConnection
+    except ImportError:
+        yield spent
+        return
+    original = RemoteConnection._request
+
+    def _request(self, *args, **kwargs):
+        start = time.process_time()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            spent[0] += time.process_time() - start
+
+    RemoteConnection._request = _request
+    try:
+        yield spent
+    finally:
+        RemoteConnection._request = original
+
+
+def breakdown(stats: pstats.Stats, wall_s: float, cpu_s: float, request_cpu_s: float = 0.0) -> Dict[str, float]:
+    """
+    把一次執行的時間拆成 CPU / WebDriver 往返 / 閒置等待 / 其他 (互不重疊)。
+
+    Args:
+        request_cpu_s: cpu_s 中花在 WebDriver 往返內的部分 (見 track_request_cpu)，
+            已包含在往返時間裡，因此從 Python CPU 扣除。
+    """
+    _, http_s = _cumulative(stats, _is_webdriver_request)
+    _, sleep_s = _cumulative(stats, lambda k: k == _SLEEP_KEY)
+    print_calls, print_s = _cumulative(stats, lambda k: k == _PRINT_KEY)
+    wait_calls, wait_s = _cumulative(stats, _is_wait_init)
+    return {
+        "wall_s": wall_s,
+        "python_cpu_s": max(0.0, cpu_s - request_cpu_s),
+        "webdriver_http_s": http_s,
+        "webdriver_cpu_s": request_cpu_s,
+        "idle_wait_s": sleep_s,
+        "other_s": max(0.0, wall_s - (cpu_s - request_cpu_s) - http_s - sleep_s),
+        "print_calls": print_calls,
+        "print_s": print_s,
+        "wait_objects": wait_calls,
+        "wait_objects_s": wait_s,
+    }
+
+
+def format_breakdown(parts: Dict[str, float]) -> str:
+    wall = parts["wall_s"] or 1e-9
+    rows = [
+        ("Python CPU (往返外)", parts["python_cpu_s"]),
+        ("WebDriver 往返", parts["webdriver_http_s"]),
+        ("閒置等待 (sleep)", parts["idle_wait_s"]),
+        ("其他", parts["other_s"]),
+    ]
+    lines = [f"  {'類別':<18}{'秒':>9}{'比例':>8}"]
+    lines += [f"  {name:<18}{sec:>9.2f}{sec / wall:>8.1%}" for name, sec in rows]
+    lines.append(f"  {'總計 (牆鐘)':<18}{parts['wall_s']:>9.2f}")
+    lines.append(f"  往返中的 CPU (已計入 WebDriver 往返): {parts.get('webdriver_cpu_s', 0.0):.2f} 秒")
+    lines.append(f"  print(): {int(parts['print_calls'])} 次 / {parts['print_s']:.3f} 秒；"
+                 f"WebDriverWait 建構: {int(parts['wait_objects'])} 次 / {parts['wait_objects_s']:.3f} 秒")
+    return "\n".join(lines)
+
+
+def _slug(url: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", url.split("://", 1)[-1]).strip("_")[:80] or "url"
+
+
+class UrlProfiler:
+    """
+    逐 URL 的 profiler。
+
+    Args:
+        out_dir: .prof 檔輸出目錄。
+        top_n: 每個 URL 顯示的熱點函數數量。
+    """
+
+    def __init__(self, out_dir: str, top_n: int = 20):
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.results: List[Dict[str, Any]] = []
+        self._combined: Optional[pstats.Stats] = None
+        os.makedirs(out_dir, exist_ok=True)
+        print(f"Profiler 已啟用，每個 URL 的 .prof 檔將寫入: {out_dir}")
+
+    def run(self, url: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """在 cProfile 下執行 func(*args, **kwargs)，輸出 .prof 並打印時間拆解"""
+        profiler = cProfile.Profile()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        with track_request_cpu() as request_cpu:
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                wall_s, cpu_s = time.perf_counter() - wall_start, time.process_time() - cpu_start
+                self._record(url, profiler, wall_s, cpu_s, request_cpu[0])
+
+    def _record(self, url: str, profiler: cProfile.Profile, wall_s: float, cpu_s: float, request_cpu_s: float) -> None:
+        """輸出 .prof、累計合併統計並打印時間拆解"""
+        path = os.path.join(self.out_dir, f"{len(self.results) + 1:04d}_{_slug(url)}.prof")
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        parts = breakdown(stats, wall_s, cpu_s, request_cpu_s)
+        self.results.append({"url": url, "path": path, **parts})
+        if self._combined is None:
+            self._combined = pstats.Stats(path, stream=io.StringIO())
+        else:
+            self._combined.add(path)
+        print(f"\n[profile] {url} -> {path}")
+        print(format_breakdown(parts))
+        print(self.top_table(stats))
+
+    def top_table(self, stats: pstats.Stats, n: Optional[int] = None) -> str:
+        """依自身時間 (tottime) 排序的前 n 個函數"""
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats("tottime").print_stats(n or self.top_n)
+        lines = stream.getvalue().splitlines()
+        # 去掉 pstats 開頭的統計行，只保留表格
+        start = next((i for i, line in enumerate(lines) if line.strip().startswith("ncalls")), 0)
+        return "\n".join(lines[start:])
+
+    def summary(self) -> None:
+        """打印所有 URL 合計的時間拆解與熱點"""
+        if not self.results:
+            return
+        totals = {k: sum(r[k] for r in self.results) for k in self.results[0] if k not in ("url", "path")}
+        print("\n" + "=" * 30)
+        print(f"Profile 摘要 ({len(self.results)} 個 URL)")
+        print(format_breakdown(totals))
+        if self._combined is not None:
+            print(self.top_table(self._combined))
@@ -0,0 +1,121 @@
+"""
+保存年齡確認 / cookie 同意等「已回應過的彈窗」狀態，並預先載入到新的瀏覽器工作階段。
+
+第一次點掉年齡驗證 (或同意橫幅) 後，把當時 patreon.com 的 cookies 存成 JSON；
+之後每個新工作階段 (新批次、記憶體重啟、隔天的執行) 啟動時先寫回這些 cookies，
+爬蟲就不必對每位創作者花 3 秒等待一個不會出現的彈窗，只有真的偵測到彈窗時才重新處理。
+"""
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+PATREON_ORIGIN = "https://www.patreon.com/"
+
+
+class SessionState:
+    """
+    Args:
+        path: JSON 檔路徑；None 表示只在本次執行的記憶體中保存。
+        ttl_days: 狀態有效天數，過期後重新偵測彈窗。
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_days: float = 7):
+        self.path = path
+        self.ttl = timedelta(days=ttl_days)
+        self.cookies: List[Dict[str, Any]] = []
+        self.saved_at: Optional[datetime] = None
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.cookies = data.get("cookies", [])
+                self.saved_at = datetime.fromisoformat(data["saved_at"]) if data.get("saved_at") else None
+            except (OSError, ValueError, KeyError) as e:
+                print(f"讀取工作階段狀態 {path} 失敗，將重新偵測彈窗: {e}")
+                self.cookies, self.saved_at = [], None
+
+    def is_valid(self) -> bool:
+        """是否有未過期的已確認狀態"""
+        if not self.cookies or self.saved_at is None:
+            return False
+        return datetime.now() - self.saved_at < self.ttl and bool(self._live_cookies())
+
+    def _live_cookies(self) -> List[Dict[str, Any]]:
+        """去掉已過期的 cookies"""
+        now = time.time()
+        return [c for c in self.cookies if not c.get("expiry") or c["expiry"] > now]
+
+    def capture(self, driver) -> int:
+        """在處理完彈窗後記錄目前網域的 cookies 並寫檔；返回記錄的數量"""
+        try:
+            cookies = driver.get_cookies()
+        except Exception as e:
+            print(f"  讀取 cookies 失敗，無法保存年齡驗證狀態: {e}")
+            return 0
+        self.cookies = [c for c in cookies if "patreon.com" in (c.get("domain") or "")]
+        self.saved_at = datetime.now()
+        self.save()
+        return len(self.cookies)
+
+    def apply(self, driver) -> int:
+        """
+        把已保存的 cookies 寫入新的工作階段。
+        優先用 CDP Network.setCookies (不需要先載入頁面)，失敗時改為先開首頁再 add_cookie。
+        """
+        cookies = self._live_cookies()
+        if not cookies:
+            return 0
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": [self._to_cdp(c) for c in cookies]})
+            return len(cookies)
+        except Exception:
+            pass
+
+        restored = 0
+        try:
+            driver.get(PATREON_ORIGIN)
+            for cookie in cookies:
+                cookie = dict(cookie)
+                if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                    cookie.pop("sameSite", None)
+                try:
+                    driver.add_cookie(cookie)
+                    restored += 1
+                except Exception:
+                    continue
+        except Exception as e:
+            print(f"  預先載入 cookies 失敗: {e}")
+        return restored
+
+    def invalidate(self) -> None:
+        """狀態失效 (例如已載入 cookies 仍出現彈窗)"""
+        self.saved_at = None
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": self.saved_at.isoformat(timespec="seconds") if self.saved_at else None,
+                       "cookies": self.cookies}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _to_cdp(cookie: Dict[str, Any]) -> Dict[str, Any]:
+        """Selenium cookie 格式 -> CDP Network.CookieParam"""
+        param = {
+            "name": cookie["name"],
+            "value": cookie["value"],
+            "domain": cookie.get("domain") or ".patreon.com",
+            "path": cookie.get("path") or "/",
+            "secure": bool(cookie.get("secure")),
+            "httpOnly": bool(cookie.get("httpOnly")),
+        }
+        if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+            param["sameSite"] = cookie["sameSite"]
+        if cookie.get("expiry"):
+            param["expires"] = cookie["expiry"]
+        return param
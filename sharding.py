@@ -0,0 +1,233 @@
+"""
+多台機器分片爬取與輸出合併。
+
+分片以 URL 的 SHA-1 決定 (與機器、Python 版本、URL 清單順序無關)，
+每台機器執行 `python Ver16.py --shard i/n` 只爬屬於第 i 片的 URL (i 從 1 起算)，
+輸出 patreon_data_<時間>_shard<i>of<n>.csv，檔內各列依 urls_for_scrape.txt 的順序排列。
+
+合併時對各分片檔做串流 k-way merge (heapq.merge)，不需要把所有分片讀進記憶體，
+結果依原始 URL 順序寫成單一 combined CSV。
+--preflight 把 URL 換成轉址後的網址時，分片檔旁會另存 <分片檔>.redirects.json
+(最終網址 -> 原始網址)，合併時以原始網址的位置排序。
+
+用法:
+    python sharding.py plan --shards 3                      # 各分片的 URL 數
+    python sharding.py merge shard1.csv shard2.csv shard3.csv --out combined.csv
+    python sharding.py run-local --shards 3 -- 5 --headless # 在本機以 3 個行程各跑一片後合併
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from csv_schema import FIELDNAMES
+from progress_report import aggregate_states, format_progress, read_states
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_URL_FILE = os.path.join(BASE_DIR, "urls_for_scrape.txt")
+DEFAULT_OUTPUT_DIR = os.path.join(BASE_DIR, "Patreon_Scraped_Data")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """解析 'i/n' (1 <= i <= n)"""
+    try:
+        index_text, count_text = spec.split("/")
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"分片格式應為 i/n，例如 1/3，收到 {spec!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"分片編號需滿足 1 <= i <= n，收到 {spec!r}")
+    return index, count
+
+
+def shard_tag(index: int, count: int) -> str:
+    """輸出檔名中的分片標記，例如 shard1of3"""
+    return f"shard{index}of{count}"
+
+
+def shard_of(url: str, count: int) -> int:
+    """URL 所屬的分片編號 (1 起算)；只依 URL 內容決定"""
+    digest = hashlib.sha1(url.strip().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(urls: Sequence[str], index: int, count: int) -> List[str]:
+    """保留原順序，取出第 index 片的 URL"""
+    return [u for u in urls if shard_of(u, count) == index]
+
+
+def url_order(urls: Sequence[str]) -> Dict[str, int]:
+    """URL -> 在清單中第一次出現的位置"""
+    order: Dict[str, int] = {}
+    for i, url in enumerate(urls):
+        order.setdefault(url, i)
+    return order
+
+
+def sort_rows_by_url_order(rows: List[Dict[str, str]], order: Dict[str, int]) -> List[Dict[str, str]]:
+    """依原始 URL 順序排列結果 (重試的 URL 會回到原本的位置)；不在清單中的 URL 排在最後"""
+    missing = len(order)
+    return sorted(rows, key=lambda r: order.get(r.get("URL"), missing))
+
+
+def redirects_path(csv_path: str) -> str:
+    """分片檔旁的轉址對照檔路徑"""
+    return csv_path + ".redirects.json"
+
+
+def write_redirects(csv_path: str, redirects: Dict[str, str]) -> None:
+    """寫出 最終網址 -> 原始網址 的對照 (沒有轉址時不產生檔案)"""
+    if not redirects:
+        return
+    with open(redirects_path(csv_path), "w", encoding="utf-8") as f:
+        json.dump(redirects, f, ensure_ascii=False, indent=2)
+
+
+def load_redirects(csv_path: str) -> Dict[str, str]:
+    """讀取分片檔的轉址對照；沒有對照檔時返回空 dict"""
+    path = redirects_path(csv_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def row_order_key(url: str, order: Dict[str, int], redirects: Dict[str, str]) -> int:
+    """列的排序位置: URL 本身在清單中的位置，轉址後的網址沿用原始網址的位置 (與 Ver16.py 的分片內排序一致)"""
+    missing = len(order)
+    if url in order:
+        return order[url]
+    return order.get(redirects.get(url), missing)
+
+
+def _read_rows(path: str, order: Dict[str, int], source: int) -> Iterator[Tuple[int, int, int, Dict[str, str]]]:
+    """逐列讀取分片檔，產生 (URL 順序, 分片序號, 列號, row)；後兩者讓排序穩定"""
+    redirects = load_redirects(path)
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        for line_no, row in enumerate(csv.DictReader(f)):
+            yield row_order_key(row.get("URL"), order, redirects), source, line_no, row
+
+
+def merge_shard_files(paths: Sequence[str], urls: Sequence[str], out_path: str) -> int:
+    """
+    把各分片輸出以串流 k-way merge 合併成單一 CSV (依 urls 的順序)。
+
+    Returns:
+        int: 寫入的列數。
+    """
+    order = url_order(urls)
+    fieldnames = list(FIELDNAMES)
+    for path in paths: # 保留分片檔中可能多出的欄位
+        with open(path, "r", newline="", encoding="utf-8-sig") as f:
+            header = next(csv.reader(f), [])
+        fieldnames += [c for c in header if c not in fieldnames]
+
+    streams = [_read_rows(p, order, i) for i, p in enumerate(paths)]
+    written = 0
+    seen = set()
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w", newline="", encoding="utf-8-sig") as out:
+        writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for _, _, _, row in heapq.merge(*streams, key=lambda item: item[:3]):
+            url = row.get("URL")
+            if url in seen: # 同一 URL 出現在多個檔案 (例如重跑過的分片) 時只保留第一筆
+                continue
+            seen.add(url)
+            writer.writerow(row)
+            written += 1
+    print(f"已合併 {len(paths)} 個分片檔，共 {written} 列: {out_path}")
+    return written
+
+
+def _load_urls(url_file: str) -> List[str]:
+    """與 Ver16.load_urls_from_txt 相同的讀取規則 (避免匯入 selenium)"""
+    with open(url_file, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+
+def run_local(count: int, scraper_args: Sequence[str],
+              url_file: str = DEFAULT_URL_FILE, output_dir: str = DEFAULT_OUTPUT_DIR,
+              progress_interval: float = 60) -> str:
+    """
+    在本機同時啟動 count 個 Ver16.py --shard 行程，全部結束後合併其輸出。
+    執行期間每 progress_interval 秒彙整各分片的 progress_<分片>.json 並打印合計進度。
+    url_file / output_dir 需與 Ver16.py 使用的路徑一致 (預設即是)。
+    """
+    started = datetime.now().strftime("%Y%m%d_%H%M%S")
+    progress_paths = [os.path.join(output_dir, f"progress_{shard_tag(i, count)}.json") for i in range(1, count + 1)]
+    for path in progress_paths: # 清掉上次執行留下的狀態
+        if os.path.exists(path):
+            os.remove(path)
+    procs = []
+    for index in range(1, count + 1):
+        cmd = [sys.executable, os.path.join(BASE_DIR, "Ver16.py"), "--shard", f"{index}/{count}", *scraper_args]
+        log_path = os.path.join(output_dir, f"run_local_{started}_{shard_tag(index, count)}.log")
+        os.makedirs(output_dir, exist_ok=True)
+        log = open(log_path, "w", encoding="utf-8")
+        print(f"啟動分片 {index}/{count}: {' '.join(cmd)} (輸出: {log_path})")
+        procs.append((index, subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, cwd=BASE_DIR), log))
+
+    while progress_interval > 0 and any(proc.poll() is None for _, proc, _ in procs):
+        time.sleep(progress_interval)
+        states = read_states(progress_paths)
+        if states:
+            print(format_progress(aggregate_states(states, expected_workers=count)), flush=True)
+
+    for index, proc, log in procs:
+        code = proc.wait()
+        log.close()
+        print(f"分片 {index}/{count} 結束，exit code = {code}")
+
+    # 只合併本次啟動後產生的分片檔
+    shard_files = []
+    for index in range(1, count + 1):
+        candidates = sorted(glob.glob(os.path.join(output_dir, f"patreon_data_*_{shard_tag(index, count)}.csv")))
+        candidates = [p for p in candidates if os.path.basename(p)[len("patreon_data_"):][:15] >= started]
+        if candidates:
+            shard_files.append(candidates[-1])
+        else:
+            print(f"警告: 找不到分片 {index}/{count} 的輸出檔。")
+
+    out_path = os.path.join(output_dir, f"patreon_data_{started}_combined.csv")
+    merge_shard_files(shard_files, _load_urls(url_file), out_path)
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="分片爬取的規劃與輸出合併")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_plan = sub.add_parser("plan", help="顯示各分片的 URL 數")
+    p_plan.add_argument("--shards", type=int, required=True)
+    p_plan.add_argument("--urls", default=DEFAULT_URL_FILE)
+
+    p_merge = sub.add_parser("merge", help="依原始 URL 順序合併分片輸出")
+    p_merge.add_argument("paths", nargs="+", help="各分片的 CSV 檔")
+    p_merge.add_argument("--urls", default=DEFAULT_URL_FILE)
+    p_merge.add_argument("--out", required=True)
+
+    p_local = sub.add_parser("run-local", help="在本機以多個行程執行所有分片後合併")
+    p_local.add_argument("--shards", type=int, required=True)
+    p_local.add_argument("--progress-interval", type=float, default=60,
+                         help="seconds between aggregated progress lines (0 disables)")
+    p_local.add_argument("scraper_args", nargs=argparse.REMAINDER, help="傳給 Ver16.py 的其他參數 (放在 -- 之後)")
+
+    args = parser.parse_args()
+    if args.command == "plan":
+        urls = _load_urls(args.urls)
+        for index in range(1, args.shards + 1):
+            print(f"分片 {index}/{args.shards}: {len(select_shard(urls, index, args.shards))} 個 URL")
+    elif args.command == "merge":
+        merge_shard_files(args.paths, _load_urls(args.urls), args.out)
+    else:
+        extra = [a for a in args.scraper_args if a != "--"]
+        run_local(args.shards, extra, progress_interval=args.progress_interval)
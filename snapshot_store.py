@@ -0,0 +1,186 @@
+"""
+把 Patreon_Scraped_Data 內的歷史快照 CSV 壓縮成單一、去重、有索引的 SQLite 資料庫。
+
+- 逐檔串流讀取 (csv.reader + 分批 executemany)，記憶體用量與檔案大小無關。
+- 每個檔案的表頭會對齊到 csv_schema.FIELDNAMES，舊欄位名稱透過
+  LEGACY_COLUMN_ALIASES 轉換，缺少的欄位存為 NULL (代表「未收集」而非 0)。
+- 以 (URL, snapshot_day) 為主鍵去重；同一天多次爬取時保留最晚的一筆。
+
+用法:
+    python snapshot_store.py
+    python snapshot_store.py --data-dir Patreon_Scraped_Data --db Patreon_Scraped_Data/patreon_snapshots.sqlite
+"""
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from csv_schema import FIELDNAMES, LEGACY_COLUMN_ALIASES, TEXT_COLUMNS
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Patreon_Scraped_Data")
+DEFAULT_DB_PATH = os.path.join(DEFAULT_DATA_DIR, "patreon_snapshots.sqlite")
+TABLE_NAME = "snapshots"
+
+# 由檔名取出爬取時間，例如 patreon_data_20250404_163059_refactored.csv
+_FILENAME_TS_RE = re.compile(r'patreon_data_(\d{8})_(\d{6})')
+
+# 資料庫中除 FIELDNAMES 外的附加欄位
+META_COLUMNS = ['snapshot_day', 'scraped_at', 'source_file']
+
+
+def snapshot_time_from_filename(path: str) -> Optional[datetime]:
+    """從快照檔名解析爬取時間，無法解析時返回 None"""
+    m = _FILENAME_TS_RE.search(os.path.basename(path))
+    if not m:
+        return None
+    return datetime.strptime(m.group(1) + m.group(2), "%Y%m%d%H%M%S")
+
+
+def list_snapshot_files(data_dir: str) -> List[str]:
+    """列出目錄中所有可辨識時間的快照 CSV，依爬取時間排序"""
+    files = []
+    for name in os.listdir(data_dir):
+        path = os.path.join(data_dir, name)
+        if name.lower().endswith('.csv') and snapshot_time_from_filename(name):
+            files.append(path)
+    return sorted(files, key=lambda p: snapshot_time_from_filename(p))
+
+
+def map_header(header: List[str]) -> List[Optional[int]]:
+    """
+    將來源 CSV 表頭對齊到 FIELDNAMES。
+
+    Returns:
+        與 FIELDNAMES 等長的列表，每個位置是來源欄位的索引 (找不到時為 None)。
+    """
+    source_index = {}
+    for i, col in enumerate(header):
+        source_index.setdefault(col.strip(), i)
+    # 只有在新欄位名稱不存在時才使用舊名稱 (部分檔案兩者並存)
+    for legacy, current in LEGACY_COLUMN_ALIASES.items():
+        if legacy in source_index and current not in source_index:
+            source_index[current] = source_index[legacy]
+    return [source_index.get(field) for field in FIELDNAMES]
+
+
+def _convert(value: str) -> Optional[str]:
+    """空字串轉為 NULL；數值欄位交給 SQLite 的 NUMERIC affinity 轉型"""
+    value = value.strip()
+    return value if value else None
+
+
+def iter_snapshot_rows(path: str) -> Iterator[Tuple[Any, ...]]:
+    """逐列產生已對齊欄位的資料 (FIELDNAMES 順序 + META_COLUMNS)"""
+    scraped_at = snapshot_time_from_filename(path)
+    snapshot_day = scraped_at.strftime("%Y-%m-%d")
+    scraped_at_str = scraped_at.strftime("%Y-%m-%d %H:%M:%S")
+    source_file = os.path.basename(path)
+
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        mapping = map_header(header)
+        for raw in reader:
+            if not raw:
+                continue
+            row = [
+                _convert(raw[idx]) if idx is not None and idx < len(raw) else None
+                for idx in mapping
+            ]
+            if not row[0]: # 沒有 URL 的列無法去重，略過
+                continue
+            yield tuple(row) + (snapshot_day, scraped_at_str, source_file)
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    columns = []
+    for field in FIELDNAMES:
+        affinity = 'TEXT' if field in TEXT_COLUMNS else 'NUMERIC'
+        columns.append(f'"{field}" {affinity}')
+    columns += ['snapshot_day TEXT NOT NULL', 'scraped_at TEXT NOT NULL', 'source_file TEXT NOT NULL']
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS {TABLE_NAME} ('
+        + ', '.join(columns)
+        + ', PRIMARY KEY ("URL", snapshot_day))'
+    )
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_creator ON {TABLE_NAME} (creator_name)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_day ON {TABLE_NAME} (snapshot_day)')
+
+
+def import_directory(data_dir: str = DEFAULT_DATA_DIR,
+                     db_path: str = DEFAULT_DB_PATH,
+                     chunk_size: int = 1000) -> Dict[str, Any]:
+    """
+    一次匯入整個快照目錄。
+
+    Args:
+        data_dir: 快照 CSV 所在目錄。
+        db_path: 輸出的 SQLite 檔案路徑 (已存在時會增量合併)。
+        chunk_size: 每次 executemany 寫入的列數，決定記憶體上限。
+
+    Returns:
+        匯入統計: files, rows_read, rows_stored, duplicates, seconds, rows_per_second。
+    """
+    files = list_snapshot_files(data_dir)
+    print(f"找到 {len(files)} 個快照檔案，準備匯入至: {db_path}")
+
+    placeholders = ', '.join(['?'] * (len(FIELDNAMES) + len(META_COLUMNS)))
+    quoted_columns = ', '.join(f'"{c}"' for c in FIELDNAMES + META_COLUMNS)
+    # 檔案依時間排序，同一 (URL, 日期) 後寫入者覆蓋先寫入者 => 保留當天最晚的一筆
+    insert_sql = f'INSERT OR REPLACE INTO {TABLE_NAME} ({quoted_columns}) VALUES ({placeholders})'
+
+    start = time.monotonic()
+    rows_read = 0
+    conn = sqlite3.connect(db_path)
+    try:
+        _create_schema(conn)
+        rows_before = conn.execute(f'SELECT COUNT(*) FROM {TABLE_NAME}').fetchone()[0]
+        with conn:
+            for path in files:
+                file_rows = 0
+                batch = []
+                for row in iter_snapshot_rows(path):
+                    batch.append(row)
+                    if len(batch) >= chunk_size:
+                        conn.executemany(insert_sql, batch)
+                        file_rows += len(batch)
+                        batch = []
+                if batch:
+                    conn.executemany(insert_sql, batch)
+                    file_rows += len(batch)
+                rows_read += file_rows
+                print(f"  {os.path.basename(path)}: {file_rows} 列")
+        rows_after = conn.execute(f'SELECT COUNT(*) FROM {TABLE_NAME}').fetchone()[0]
+    finally:
+        conn.close()
+
+    seconds = time.monotonic() - start
+    stats = {
+        'files': len(files),
+        'rows_read': rows_read,
+        'rows_stored': rows_after,
+        'duplicates': rows_read - (rows_after - rows_before),
+        'seconds': seconds,
+        'rows_per_second': rows_read / seconds if seconds > 0 else float('inf'),
+    }
+    print("-" * 30)
+    print(f"匯入完成: 讀取 {stats['rows_read']} 列，重複 {stats['duplicates']} 列，"
+          f"資料庫目前共 {stats['rows_stored']} 列。")
+    print(f"耗時 {seconds:.2f} 秒 ({stats['rows_per_second']:.0f} 列/秒)")
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="將快照 CSV 目錄壓縮為單一去重的 SQLite 資料庫")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="快照 CSV 所在目錄")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="輸出的 SQLite 檔案")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="每批寫入的列數")
+    args = parser.parse_args()
+
+    import_directory(args.data_dir, args.db, args.chunk_size)
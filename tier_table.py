@@ -0,0 +1,136 @@
+"""
+把快照中的 membership_tiers_json 展開成一張會員方案表，並以來源檔案雜湊快取到磁碟。
+
+每個快照只解析一次 JSON；之後的 avg_tier_price / avg_desc_wc 等彙總都是
+對這張表做向量化的 groupby，不再逐列 json.loads。
+
+表格欄位:
+    snapshot, row, URL, creator_name, tier_id, name, price, description_word_count
+其中 row 是該列在來源 CSV 中的位置 (0 起算)，用來對回原始快照。
+
+用法:
+    python tier_table.py Patreon_Scraped_Data/patreon_data_20250601_175744_combined.csv
+"""
+import argparse
+import json
+import os
+from typing import Any, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from analysis_cache import combined_digest, file_digest, load_or_build
+
+# 展開方式或表格欄位改變時調整版本號，讓舊快取失效
+TIER_CACHE_VERSION = "tiers-v1"
+
+TIER_COLUMNS = ["snapshot", "row", "URL", "creator_name", "tier_id", "name", "price", "description_word_count"]
+_SOURCE_COLUMNS = {"URL", "creator_name", "membership_tiers_json"}
+
+
+def parse_tiers_column(raw: pd.Series) -> List[Any]:
+    """
+    解析整欄 membership_tiers_json。
+
+    整欄字串合併後只呼叫一次 json.loads；欄內有損壞的 JSON 時才退回逐列解析，
+    無法解析或空白的值視為沒有方案 ([])。
+    """
+    texts = [s if isinstance(s, str) and s.strip() else "[]" for s in raw.tolist()]
+    try:
+        return json.loads("[" + ",".join(texts) + "]")
+    except json.JSONDecodeError:
+        parsed = []
+        for s in texts:
+            try:
+                parsed.append(json.loads(s))
+            except json.JSONDecodeError:
+                parsed.append([])
+        return parsed
+
+
+def explode_frame(df: pd.DataFrame, snapshot: str) -> pd.DataFrame:
+    """把一個快照 DataFrame 的 membership_tiers_json 展開成方案表 (一個方案一列)"""
+    if "membership_tiers_json" not in df.columns:
+        return pd.DataFrame(columns=TIER_COLUMNS)
+
+    parsed = parse_tiers_column(df["membership_tiers_json"])
+    per_row = [[t for t in tiers if isinstance(t, dict)] if isinstance(tiers, list) else [] for tiers in parsed]
+    lengths = np.fromiter((len(tiers) for tiers in per_row), dtype=np.int64, count=len(per_row))
+    flat = [t for tiers in per_row for t in tiers]
+    rows = np.repeat(np.arange(len(df)), lengths)
+
+    def _column(name: str) -> np.ndarray:
+        if name in df.columns:
+            return df[name].to_numpy()[rows]
+        return np.full(len(rows), None, dtype=object)
+
+    return pd.DataFrame({
+        "snapshot": snapshot,
+        "row": rows,
+        "URL": _column("URL"),
+        "creator_name": _column("creator_name"),
+        "tier_id": [str(t.get("tier_id") or "") for t in flat],
+        "name": [t.get("name") or "" for t in flat],
+        "price": np.fromiter((float(t.get("price") or 0) for t in flat), dtype=np.float64, count=len(flat)),
+        "description_word_count": np.fromiter((int(t.get("description_word_count") or 0) for t in flat),
+                                              dtype=np.int64, count=len(flat)),
+    }, columns=TIER_COLUMNS)
+
+
+def explode_file(path: str) -> pd.DataFrame:
+    """讀取單一快照檔 (只讀需要的欄位) 並展開方案"""
+    df = pd.read_csv(path, encoding="utf-8-sig", usecols=lambda c: c in _SOURCE_COLUMNS)
+    return explode_frame(df, os.path.basename(path))
+
+
+def load_tier_table(path: str, use_cache: bool = True) -> pd.DataFrame:
+    """取得單一快照的方案表；以檔案內容雜湊與版本號為快取鍵，檔案改動後自動重算"""
+    if not use_cache:
+        return explode_file(path)
+    key = combined_digest([file_digest(path), TIER_CACHE_VERSION])
+    return load_or_build("tiers", key, lambda: explode_file(path))
+
+
+def load_tier_tables(paths: Sequence[str], use_cache: bool = True) -> pd.DataFrame:
+    """取得多個快照的方案表並合併"""
+    tables = [load_tier_table(p, use_cache=use_cache) for p in paths]
+    if not tables:
+        return pd.DataFrame(columns=TIER_COLUMNS)
+    return pd.concat(tables, ignore_index=True)
+
+
+def row_aggregates(tiers: pd.DataFrame, keys: Sequence[str] = ("snapshot", "row")) -> pd.DataFrame:
+    """
+    每個快照列的方案平均價格與平均敘述字數 (即 notebook 的 avg_tier_price / avg_desc_wc)。
+    沒有任何方案的列不會出現在結果中，由呼叫端補 0。
+    """
+    return tiers.groupby(list(keys), sort=False).agg(
+        avg_tier_price=("price", "mean"),
+        avg_desc_wc=("description_word_count", "mean"),
+    )
+
+
+def creator_aggregates(tiers: pd.DataFrame) -> pd.DataFrame:
+    """每位創作者在每個快照的方案摘要"""
+    return tiers.groupby(["creator_name", "snapshot"], sort=False).agg(
+        tier_count=("tier_id", "size"),
+        avg_tier_price=("price", "mean"),
+        min_tier_price=("price", "min"),
+        max_tier_price=("price", "max"),
+        avg_desc_wc=("description_word_count", "mean"),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="展開快照中的會員方案並輸出摘要")
+    parser.add_argument("paths", nargs="+", help="快照 CSV 檔案")
+    parser.add_argument("--out", help="將展開後的方案表另存為 CSV")
+    parser.add_argument("--no-cache", action="store_true", help="忽略磁碟快取")
+    args = parser.parse_args()
+
+    table = load_tier_tables(args.paths, use_cache=not args.no_cache)
+    print(f"共展開 {len(table)} 個方案，來自 {table['creator_name'].nunique()} 位創作者。")
+    print(creator_aggregates(table).head(20))
+    if args.out:
+        table.to_csv(args.out, index=False, encoding="utf-8-sig")
+        print(f"方案表已寫入: {args.out}")
@@ -0,0 +1,74 @@
+"""
+以 Chrome performance log (DevTools Network 事件) 量測每位創作者的下載量。
+
+啟用後 (enable_performance_log)，在爬一位創作者之前呼叫 drain_log 清掉舊事件，
+爬完後呼叫 collect_transfer 統計:
+    requests         網路請求數
+    bytes            實際經網路傳輸的位元組 (encodedDataLength 總和)
+    cached_requests  由記憶體 / 磁碟快取提供的請求數
+    bytes_by_type    依資源類型 (Script, Stylesheet, Font, Image, XHR, Document...) 的位元組
+用來比較共用磁碟快取 / 持久化 profile 開啟前後，每位創作者的下載量。
+"""
+import json
+from typing import Any, Dict
+
+
+def enable_performance_log(chrome_options) -> None:
+    """讓 chromedriver 收集 Network 事件 (需在建立 driver 前設定)"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def drain_log(driver) -> None:
+    """清掉目前累積的 performance log"""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+def collect_transfer(driver) -> Dict[str, Any]:
+    """讀取並統計自上次 drain 以來的 Network 事件"""
+    stats: Dict[str, Any] = {"requests": 0, "bytes": 0, "cached_requests": 0, "bytes_by_type": {}}
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        stats["error"] = str(e)
+        return stats
+
+    types: Dict[str, str] = {}
+    cached = set()
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError, TypeError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+            types[request_id] = params.get("type", "Other")
+        elif method == "Network.responseReceived":
+            types[request_id] = params.get("type", types.get(request_id, "Other"))
+            response = params.get("response", {})
+            if response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+                cached.add(request_id)
+        elif method == "Network.requestServedFromCache":
+            cached.add(request_id)
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength") or 0)
+            stats["bytes"] += size
+            kind = types.get(request_id, "Other")
+            stats["bytes_by_type"][kind] = stats["bytes_by_type"].get(kind, 0) + size
+
+    stats["cached_requests"] = len(cached)
+    return stats
+
+
+def format_bytes(n: float) -> str:
+    """把位元組轉成易讀字串"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
@@ -0,0 +1,79 @@
+"""
+元素等待的記帳: 找出整次執行中花在「等待不會出現的元素」上的時間。
+
+_find_element / _find_elements / _click_element 每次等待都記下選擇器、逾時、是否找到與花費的秒數。
+很多探測本來就預期會失敗 (月收入 2 秒、年齡驗證 3 秒、Chats 連結 3 秒、輪播按鈕 2 秒…)，
+結束時依「沒找到時浪費的秒數」排序，看出哪些探測值得移除或縮短逾時。
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+Locator = Tuple[str, str]
+
+
+class WaitLedger:
+    """
+    Args:
+        selector_names: 定位器 -> 名稱 (通常是 SELECTORS 的反查表)，讓報告顯示可讀的名稱。
+    """
+
+    def __init__(self, selector_names: Optional[Dict[Locator, str]] = None):
+        self.selector_names = dict(selector_names or {})
+        # (名稱, 動作, 逾時) -> 統計
+        self.stats: Dict[Tuple[str, str, float], Dict[str, float]] = {}
+
+    def name_of(self, locator: Locator) -> str:
+        name = self.selector_names.get(tuple(locator))
+        return name if name else f"{locator[0]}={locator[1][:60]}"
+
+    def record(self, locator: Locator, timeout: float, matched: bool, seconds: float, action: str = "find") -> None:
+        """記錄一次等待"""
+        key = (self.name_of(locator), action, float(timeout))
+        entry = self.stats.get(key)
+        if entry is None:
+            entry = self.stats[key] = {"calls": 0, "misses": 0, "matched_s": 0.0, "wasted_s": 0.0, "max_s": 0.0}
+        entry["calls"] += 1
+        if matched:
+            entry["matched_s"] += seconds
+        else:
+            entry["misses"] += 1
+            entry["wasted_s"] += seconds
+        entry["max_s"] = max(entry["max_s"], seconds)
+
+    @property
+    def total_wasted_s(self) -> float:
+        return sum(e["wasted_s"] for e in self.stats.values())
+
+    @property
+    def total_wait_s(self) -> float:
+        return sum(e["wasted_s"] + e["matched_s"] for e in self.stats.values())
+
+    def ranking(self, top_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """依浪費秒數排序的選擇器清單"""
+        rows = [{"selector": name, "action": action, "timeout": timeout, **entry,
+                 "miss_rate": entry["misses"] / entry["calls"] if entry["calls"] else 0.0}
+                for (name, action, timeout), entry in self.stats.items()]
+        rows.sort(key=lambda r: r["wasted_s"], reverse=True)
+        return rows[:top_n] if top_n else rows
+
+    def report(self, top_n: int = 15, run_seconds: Optional[float] = None) -> str:
+        """結束時打印的排行表"""
+        wasted = self.total_wasted_s
+        share = f"，占總執行時間 {wasted / run_seconds:.1%}" if run_seconds else ""
+        lines = [f"等待不存在元素共浪費 {wasted:.1f} 秒 (所有元素等待 {self.total_wait_s:.1f} 秒{share})",
+                 f"  {'選擇器':<34}{'動作':<10}{'逾時':>6}{'次數':>7}{'未找到':>8}{'浪費秒數':>10}{'平均':>7}"]
+        for row in self.ranking(top_n):
+            if row["wasted_s"] <= 0:
+                break
+            avg = row["wasted_s"] / row["misses"] if row["misses"] else 0.0
+            lines.append(f"  {row['selector'][:33]:<34}{row['action']:<10}{row['timeout']:>6g}{row['calls']:>7}"
+                         f"{row['misses']:>8}{row['wasted_s']:>10.1f}{avg:>7.2f}")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> None:
+        """把完整排行寫成 JSON (方便跨夜比較)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"total_wasted_s": self.total_wasted_s, "total_wait_s": self.total_wait_s,
+                       "selectors": self.ranking()}, f, ensure_ascii=False, indent=2)